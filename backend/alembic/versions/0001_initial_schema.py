@@ -0,0 +1,150 @@
+"""initial schema
+
+Baseline matching the tables that Base.metadata.create_all produced before
+migrations were introduced. Databases created that way should be marked
+with `alembic stamp 0001` and then upgraded normally.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ENUMS = {
+    "userrole": ("RECRUITER", "VERIFIER", "ADMIN"),
+    "verificationstatus": ("PENDING", "IN_PROGRESS", "COMPLETED"),
+    "claimstatus": ("VERIFIED", "UNCERTAIN", "INCONSISTENT", "PENDING"),
+}
+
+def _enum(name):
+    # Several tables share an enum, so on PostgreSQL the types are created once up front
+    values = ENUMS[name]
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), "postgresql"
+    )
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        for name, values in ENUMS.items():
+            postgresql.ENUM(*values, name=name).create(bind, checkfirst=True)
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("role", _enum("userrole"), nullable=False),
+        sa.Column("company", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "candidate_batches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("batch_name", sa.String(), nullable=False),
+        sa.Column("recruiter_id", sa.Integer(), nullable=False),
+        sa.Column("upload_type", sa.String(), nullable=False),
+        sa.Column("status", _enum("verificationstatus"), nullable=True),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("total_candidates", sa.Integer(), nullable=True),
+        sa.Column("verified_count", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["recruiter_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_candidate_batches_id", "candidate_batches", ["id"])
+
+    op.create_table(
+        "candidates",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("batch_id", sa.Integer(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("linkedin_url", sa.String(), nullable=True),
+        sa.Column("raw_cv_data", sa.JSON(), nullable=True),
+        sa.Column("verifier_id", sa.Integer(), nullable=True),
+        sa.Column("verification_status", _enum("verificationstatus"), nullable=True),
+        sa.Column("verified_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["batch_id"], ["candidate_batches.id"]),
+        sa.ForeignKeyConstraint(["verifier_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_candidates_id", "candidates", ["id"])
+
+    op.create_table(
+        "employment",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("candidate_id", sa.Integer(), nullable=False),
+        sa.Column("company_name", sa.String(), nullable=False),
+        sa.Column("position", sa.String(), nullable=False),
+        sa.Column("start_date", sa.String(), nullable=True),
+        sa.Column("end_date", sa.String(), nullable=True),
+        sa.Column("is_current", sa.Boolean(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("claim_status", _enum("claimstatus"), nullable=True),
+        sa.Column("verification_note", sa.Text(), nullable=True),
+        sa.Column("verification_sources", sa.JSON(), nullable=True),
+        sa.Column("verified_at", sa.DateTime(), nullable=True),
+        sa.Column("order", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["candidate_id"], ["candidates.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_employment_id", "employment", ["id"])
+
+    op.create_table(
+        "education",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("candidate_id", sa.Integer(), nullable=False),
+        sa.Column("institution", sa.String(), nullable=False),
+        sa.Column("degree", sa.String(), nullable=True),
+        sa.Column("field_of_study", sa.String(), nullable=True),
+        sa.Column("start_date", sa.String(), nullable=True),
+        sa.Column("end_date", sa.String(), nullable=True),
+        sa.Column("is_current", sa.Boolean(), nullable=True),
+        sa.Column("claim_status", _enum("claimstatus"), nullable=True),
+        sa.Column("verification_note", sa.Text(), nullable=True),
+        sa.Column("verification_sources", sa.JSON(), nullable=True),
+        sa.Column("verified_at", sa.DateTime(), nullable=True),
+        sa.Column("order", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["candidate_id"], ["candidates.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_education_id", "education", ["id"])
+
+    op.create_table(
+        "reports",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("candidate_id", sa.Integer(), nullable=False),
+        sa.Column("html_content", sa.Text(), nullable=False),
+        sa.Column("generated_at", sa.DateTime(), nullable=True),
+        sa.Column("generated_by", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["candidate_id"], ["candidates.id"]),
+        sa.ForeignKeyConstraint(["generated_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_reports_id", "reports", ["id"])
+
+def downgrade() -> None:
+    for table in ("reports", "education", "employment", "candidates", "candidate_batches", "users"):
+        op.drop_table(table)
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        for name in ENUMS:
+            postgresql.ENUM(name=name).drop(bind, checkfirst=True)
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""report content hashes and version indexes for ETags
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    with op.batch_alter_table("reports") as batch_op:
+        batch_op.add_column(sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+    # Existing reports are immutable, so their hashes can be filled in once here
+    bind = op.get_bind()
+    reports = sa.table(
+        "reports",
+        sa.column("id", sa.Integer),
+        sa.column("html_content", sa.Text),
+        sa.column("content_hash", sa.String),
+    )
+    rows = bind.execute(sa.select(reports.c.id, reports.c.html_content)).fetchall()
+    for report_id, html_content in rows:
+        bind.execute(
+            reports.update()
+            .where(reports.c.id == report_id)
+            .values(content_hash=hashlib.sha256(html_content.encode("utf-8")).hexdigest())
+        )
+
+    op.create_index("ix_reports_candidate_id_generated_at", "reports", ["candidate_id", "generated_at"])
+    op.create_index("ix_candidates_batch_id_updated_at", "candidates", ["batch_id", "updated_at"])
+
+def downgrade() -> None:
+    op.drop_index("ix_candidates_batch_id_updated_at", table_name="candidates")
+    op.drop_index("ix_reports_candidate_id_generated_at", table_name="reports")
+    with op.batch_alter_table("reports") as batch_op:
+        batch_op.drop_column("content_hash")
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""composite indexes for the hot query patterns
+
+Covers the pending queue, per-verifier queue and stats, batch completion
+counts, per-candidate claim status checks and the recruiter batch list.
+reports.candidate_id is already served by ix_reports_candidate_id_generated_at.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_candidates_verification_status_created_at", "candidates", ["verification_status", "created_at"]),
+    ("ix_candidates_verifier_id_verification_status", "candidates", ["verifier_id", "verification_status", "created_at"]),
+    ("ix_candidates_batch_id_verification_status", "candidates", ["batch_id", "verification_status"]),
+    ("ix_employment_candidate_id_claim_status", "employment", ["candidate_id", "claim_status"]),
+    ("ix_education_candidate_id_claim_status", "education", ["candidate_id", "claim_status"]),
+    ("ix_candidate_batches_recruiter_id_uploaded_at", "candidate_batches", ["recruiter_id", "uploaded_at"]),
+)
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
\ No newline at end of file
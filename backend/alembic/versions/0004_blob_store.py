@@ -0,0 +1,91 @@
+"""move raw CV data and original uploads to the blob store
+
+candidates.raw_cv_data is written to the blob store as canonical JSON and
+replaced by its digest in candidates.raw_cv_hash. Batches gain
+source_file_hash / source_filename for the original upload; files uploaded
+before this revision were never kept, so those stay empty.
+
+The blob store configured through BLOB_STORE_BACKEND / BLOB_STORE_PATH must
+be reachable from wherever the migration runs.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.storage import get_blob_store, get_json, put_json
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+PAGE_SIZE = 500
+
+def _pages(bind, table, value_column):
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, value_column)
+            .where(table.c.id > last_id, value_column.isnot(None))
+            .order_by(table.c.id)
+            .limit(PAGE_SIZE)
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+def upgrade() -> None:
+    with op.batch_alter_table("candidate_batches") as batch_op:
+        batch_op.add_column(sa.Column("source_file_hash", sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column("source_filename", sa.String(), nullable=True))
+    with op.batch_alter_table("candidates") as batch_op:
+        batch_op.add_column(sa.Column("raw_cv_hash", sa.String(length=64), nullable=True))
+
+    bind = op.get_bind()
+    store = get_blob_store()
+    candidates = sa.table(
+        "candidates",
+        sa.column("id", sa.Integer),
+        sa.column("raw_cv_data", sa.JSON),
+        sa.column("raw_cv_hash", sa.String),
+    )
+    for rows in _pages(bind, candidates, candidates.c.raw_cv_data):
+        for candidate_id, raw_cv_data in rows:
+            bind.execute(
+                candidates.update()
+                .where(candidates.c.id == candidate_id)
+                .values(raw_cv_hash=put_json(raw_cv_data, store))
+            )
+
+    with op.batch_alter_table("candidates") as batch_op:
+        batch_op.drop_column("raw_cv_data")
+
+def downgrade() -> None:
+    with op.batch_alter_table("candidates") as batch_op:
+        batch_op.add_column(sa.Column("raw_cv_data", sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    store = get_blob_store()
+    candidates = sa.table(
+        "candidates",
+        sa.column("id", sa.Integer),
+        sa.column("raw_cv_data", sa.JSON),
+        sa.column("raw_cv_hash", sa.String),
+    )
+    for rows in _pages(bind, candidates, candidates.c.raw_cv_hash):
+        for candidate_id, raw_cv_hash in rows:
+            bind.execute(
+                candidates.update()
+                .where(candidates.c.id == candidate_id)
+                .values(raw_cv_data=get_json(raw_cv_hash, store))
+            )
+
+    with op.batch_alter_table("candidates") as batch_op:
+        batch_op.drop_column("raw_cv_hash")
+    with op.batch_alter_table("candidate_batches") as batch_op:
+        batch_op.drop_column("source_filename")
+        batch_op.drop_column("source_file_hash")
\ No newline at end of file
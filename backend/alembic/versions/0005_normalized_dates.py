@@ -0,0 +1,83 @@
+"""normalized year / month columns for employment and education dates
+
+Adds start_year, start_month, end_year and end_month next to the free-form
+start_date / end_date strings, backfills them with app.utils.date_normalizer
+and indexes (lower(name), start_year, end_year) for date-range lookups.
+Rows whose end date reads "Present" are also flagged is_current.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.date_normalizer import normalize_dates
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+PAGE_SIZE = 1000
+
+DATE_COLUMNS = ("start_year", "start_month", "end_year", "end_month")
+
+TABLES = (
+    ("employment", "company_name", "ix_employment_company_name_years"),
+    ("education", "institution", "ix_education_institution_years"),
+)
+
+def _backfill(bind, table_name: str) -> None:
+    table = sa.table(
+        table_name,
+        sa.column("id", sa.Integer),
+        sa.column("start_date", sa.String),
+        sa.column("end_date", sa.String),
+        sa.column("is_current", sa.Boolean),
+        *(sa.column(name, sa.Integer) for name in DATE_COLUMNS),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c.start_date, table.c.end_date, table.c.is_current)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(PAGE_SIZE)
+        ).fetchall()
+        if not rows:
+            return
+
+        dates = normalize_dates([row.start_date for row in rows] + [row.end_date for row in rows])
+        for row in rows:
+            start, end = dates[row.start_date], dates[row.end_date]
+            if start.year is None and end.year is None and not end.is_present:
+                continue
+            bind.execute(
+                table.update()
+                .where(table.c.id == row.id)
+                .values(
+                    start_year=start.year,
+                    start_month=start.month,
+                    end_year=end.year,
+                    end_month=end.month,
+                    is_current=bool(row.is_current) or end.is_present,
+                )
+            )
+        last_id = rows[-1].id
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table_name, name_column, index_name in TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            for column in DATE_COLUMNS:
+                batch_op.add_column(sa.Column(column, sa.Integer(), nullable=True))
+        _backfill(bind, table_name)
+        op.create_index(index_name, table_name, [sa.text(f"lower({name_column})"), "start_year", "end_year"])
+
+def downgrade() -> None:
+    for table_name, _, index_name in reversed(TABLES):
+        op.drop_index(index_name, table_name=table_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            for column in reversed(DATE_COLUMNS):
+                batch_op.drop_column(column)
\ No newline at end of file
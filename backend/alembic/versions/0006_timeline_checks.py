@@ -0,0 +1,46 @@
+"""machine notes and priority scores from the timeline pre-checks
+
+Existing batches are not analyzed here; an admin can run
+POST /api/candidates/batch/{id}/timeline-check for the ones that matter.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# Dropping columns rebuilds the table on SQLite, which cannot carry expression indexes over
+EXPRESSION_INDEXES = (
+    ("ix_employment_company_name_years", "employment", "company_name"),
+    ("ix_education_institution_years", "education", "institution"),
+)
+
+def upgrade() -> None:
+    for table_name in ("employment", "education"):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column("machine_notes", sa.Text(), nullable=True))
+            batch_op.add_column(sa.Column("priority_score", sa.Integer(), nullable=True, server_default="0"))
+    with op.batch_alter_table("candidates") as batch_op:
+        batch_op.add_column(sa.Column("priority_score", sa.Integer(), nullable=True, server_default="0"))
+    with op.batch_alter_table("candidate_batches") as batch_op:
+        batch_op.add_column(sa.Column("timeline_checked_at", sa.DateTime(), nullable=True))
+
+def downgrade() -> None:
+    with op.batch_alter_table("candidate_batches") as batch_op:
+        batch_op.drop_column("timeline_checked_at")
+    with op.batch_alter_table("candidates") as batch_op:
+        batch_op.drop_column("priority_score")
+    for index_name, table_name, _ in EXPRESSION_INDEXES:
+        op.drop_index(index_name, table_name=table_name)
+    for table_name in ("education", "employment"):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("priority_score")
+            batch_op.drop_column("machine_notes")
+    for index_name, table_name, name_column in EXPRESSION_INDEXES:
+        op.create_index(index_name, table_name, [sa.text(f"lower({name_column})"), "start_year", "end_year"])
\ No newline at end of file
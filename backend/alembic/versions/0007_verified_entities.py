@@ -0,0 +1,100 @@
+"""verified_entities index of companies and institutions from verified claims
+
+Backfills one row per normalized company / institution name from the claims
+already marked VERIFIED, with their verification count and source usage.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.entity_names import COMPANY, INSTITUTION, normalize_entity_name
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+PAGE_SIZE = 1000
+
+TABLES = (
+    ("employment", "company_name", COMPANY),
+    ("education", "institution", INSTITUTION),
+)
+
+def _collect(bind, table_name: str, name_column: str, kind: str, entities: dict) -> None:
+    table = sa.table(
+        table_name,
+        sa.column("id", sa.Integer),
+        sa.column(name_column, sa.String),
+        sa.column("claim_status", sa.String),
+        sa.column("verification_sources", sa.JSON),
+        sa.column("verified_at", sa.DateTime),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c[name_column], table.c.verification_sources, table.c.verified_at)
+            .where(table.c.id > last_id, table.c.claim_status == "VERIFIED")
+            .order_by(table.c.id)
+            .limit(PAGE_SIZE)
+        ).fetchall()
+        if not rows:
+            return
+        
+        for row in rows:
+            name = row[1]
+            normalized = normalize_entity_name(kind, name)
+            if not normalized:
+                continue
+            entity = entities.setdefault((kind, normalized), {
+                "kind": kind,
+                "normalized_name": normalized,
+                "display_name": name.strip(),
+                "verified_count": 0,
+                "sources": {},
+                "last_verified_at": None,
+            })
+            entity["verified_count"] += 1
+            for source in row.verification_sources or ():
+                source = source.strip()
+                if source:
+                    entity["sources"][source] = entity["sources"].get(source, 0) + 1
+            if row.verified_at is not None and (entity["last_verified_at"] is None or row.verified_at > entity["last_verified_at"]):
+                entity["last_verified_at"] = row.verified_at
+        last_id = rows[-1].id
+
+def upgrade() -> None:
+    verified_entities = op.create_table(
+        "verified_entities",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("normalized_name", sa.String(), nullable=False),
+        sa.Column("display_name", sa.String(), nullable=False),
+        sa.Column("verified_count", sa.Integer(), nullable=False),
+        sa.Column("sources", sa.JSON(), nullable=True),
+        sa.Column("last_verified_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("kind", "normalized_name", name="uq_verified_entities_kind_normalized_name"),
+    )
+    op.create_index("ix_verified_entities_id", "verified_entities", ["id"])
+    op.create_index("ix_verified_entities_updated_at", "verified_entities", ["updated_at"])
+    
+    bind = op.get_bind()
+    entities = {}
+    for table_name, name_column, kind in TABLES:
+        _collect(bind, table_name, name_column, kind, entities)
+    
+    now = datetime.utcnow()
+    rows = [dict(entity, updated_at=now) for entity in entities.values()]
+    for offset in range(0, len(rows), PAGE_SIZE):
+        op.bulk_insert(verified_entities, rows[offset:offset + PAGE_SIZE])
+
+def downgrade() -> None:
+    op.drop_index("ix_verified_entities_updated_at", table_name="verified_entities")
+    op.drop_index("ix_verified_entities_id", table_name="verified_entities")
+    op.drop_table("verified_entities")
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""identity keys and duplicate links for candidates
+
+Backfills the normalized email / phone / LinkedIn / name keys of existing
+candidates and links those sharing an email, LinkedIn slug or phone number
+to the earliest of them. Name-only matches are left to new ingests, which
+can confirm them against employment history.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.identity_keys import identity_keys
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+PAGE_SIZE = 1000
+
+KEY_INDEXES = (
+    ("ix_candidates_email_key", "email_key"),
+    ("ix_candidates_phone_key", "phone_key"),
+    ("ix_candidates_linkedin_key", "linkedin_key"),
+    ("ix_candidates_name_key", "name_key"),
+    ("ix_candidates_duplicate_of_id", "duplicate_of_id"),
+)
+
+def _backfill(bind) -> None:
+    candidates = sa.table(
+        "candidates",
+        sa.column("id", sa.Integer),
+        sa.column("full_name", sa.String),
+        sa.column("email", sa.String),
+        sa.column("phone", sa.String),
+        sa.column("linkedin_url", sa.String),
+        sa.column("email_key", sa.String),
+        sa.column("phone_key", sa.String),
+        sa.column("linkedin_key", sa.String),
+        sa.column("name_key", sa.String),
+        sa.column("duplicate_of_id", sa.Integer),
+        sa.column("duplicate_match", sa.String),
+    )
+    update = (
+        candidates.update()
+        .where(candidates.c.id == sa.bindparam("candidate_id"))
+        .values(
+            email_key=sa.bindparam("email_key"),
+            phone_key=sa.bindparam("phone_key"),
+            linkedin_key=sa.bindparam("linkedin_key"),
+            name_key=sa.bindparam("name_key"),
+            duplicate_of_id=sa.bindparam("duplicate_of_id"),
+            duplicate_match=sa.bindparam("duplicate_match"),
+        )
+    )
+    
+    # Walking in id order means every key is first seen on the candidate that becomes the root
+    roots = {"email": {}, "linkedin": {}, "phone": {}}
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(candidates.c.id, candidates.c.full_name, candidates.c.email, candidates.c.phone, candidates.c.linkedin_url)
+            .where(candidates.c.id > last_id)
+            .order_by(candidates.c.id)
+            .limit(PAGE_SIZE)
+        ).fetchall()
+        if not rows:
+            return
+        
+        params = []
+        for row in rows:
+            keys = identity_keys(row._asdict())
+            root, match = None, None
+            for key_match in ("email", "linkedin", "phone"):
+                key = getattr(keys, key_match)
+                if key is not None and key in roots[key_match]:
+                    root, match = roots[key_match][key], key_match
+                    break
+            for key_match in ("email", "linkedin", "phone"):
+                key = getattr(keys, key_match)
+                if key is not None:
+                    roots[key_match].setdefault(key, root or row.id)
+            params.append({
+                "candidate_id": row.id,
+                "email_key": keys.email,
+                "phone_key": keys.phone,
+                "linkedin_key": keys.linkedin,
+                "name_key": keys.name,
+                "duplicate_of_id": root,
+                "duplicate_match": match,
+            })
+        bind.execute(update, params)
+        last_id = rows[-1].id
+
+def upgrade() -> None:
+    with op.batch_alter_table("candidates") as batch_op:
+        batch_op.add_column(sa.Column("email_key", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("phone_key", sa.String(length=16), nullable=True))
+        batch_op.add_column(sa.Column("linkedin_key", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("name_key", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("duplicate_of_id", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("duplicate_match", sa.String(length=20), nullable=True))
+        batch_op.create_foreign_key("fk_candidates_duplicate_of_id", "candidates", ["duplicate_of_id"], ["id"])
+    with op.batch_alter_table("candidate_batches") as batch_op:
+        batch_op.add_column(sa.Column("duplicate_count", sa.Integer(), nullable=True, server_default="0"))
+    
+    _backfill(op.get_bind())
+    op.execute(
+        "UPDATE candidate_batches SET duplicate_count = ("
+        "SELECT count(*) FROM candidates"
+        " WHERE candidates.batch_id = candidate_batches.id AND candidates.duplicate_of_id IS NOT NULL)"
+    )
+    for index_name, column in KEY_INDEXES:
+        op.create_index(index_name, "candidates", [column])
+
+def downgrade() -> None:
+    for index_name, _ in reversed(KEY_INDEXES):
+        op.drop_index(index_name, table_name="candidates")
+    with op.batch_alter_table("candidate_batches") as batch_op:
+        batch_op.drop_column("duplicate_count")
+    with op.batch_alter_table("candidates") as batch_op:
+        batch_op.drop_constraint("fk_candidates_duplicate_of_id", type_="foreignkey")
+        batch_op.drop_column("duplicate_match")
+        batch_op.drop_column("duplicate_of_id")
+        batch_op.drop_column("name_key")
+        batch_op.drop_column("linkedin_key")
+        batch_op.drop_column("phone_key")
+        batch_op.drop_column("email_key")
\ No newline at end of file
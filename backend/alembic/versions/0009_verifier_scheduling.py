@@ -0,0 +1,60 @@
+"""effort estimates and fair-share scheduling state
+
+Backfills each candidate's effort estimate from its claim counts with the
+current app.scheduler settings, and each batch's served effort from the
+candidates already claimed from it. The batch queue index gains
+effort_estimate so the next candidate of a batch is read from the index,
+and a partial index covers the batches that are not completed yet.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.scheduler import EFFORT_BASE_MINUTES, EFFORT_PER_EDUCATION_MINUTES, EFFORT_PER_EMPLOYMENT_MINUTES
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    with op.batch_alter_table("candidates") as batch_op:
+        batch_op.add_column(sa.Column("effort_estimate", sa.Integer(), nullable=True, server_default="0"))
+    with op.batch_alter_table("candidate_batches") as batch_op:
+        batch_op.add_column(sa.Column("served_effort", sa.Integer(), nullable=True, server_default="0"))
+        batch_op.add_column(sa.Column("scheduling_weight", sa.Float(), nullable=True, server_default="1.0"))
+        batch_op.add_column(sa.Column("sla_deadline", sa.DateTime(), nullable=True))
+    
+    op.execute(
+        f"UPDATE candidates SET effort_estimate = {EFFORT_BASE_MINUTES}"
+        f" + {EFFORT_PER_EMPLOYMENT_MINUTES} * (SELECT count(*) FROM employment WHERE employment.candidate_id = candidates.id)"
+        f" + {EFFORT_PER_EDUCATION_MINUTES} * (SELECT count(*) FROM education WHERE education.candidate_id = candidates.id)"
+    )
+    op.execute(
+        "UPDATE candidate_batches SET served_effort = ("
+        "SELECT coalesce(sum(candidates.effort_estimate), 0) FROM candidates"
+        " WHERE candidates.batch_id = candidate_batches.id AND candidates.verification_status != 'PENDING')"
+    )
+    
+    op.drop_index("ix_candidates_batch_id_verification_status", table_name="candidates")
+    op.create_index(
+        "ix_candidates_batch_id_verification_status_effort", "candidates", ["batch_id", "verification_status", "effort_estimate"]
+    )
+    op.create_index(
+        "ix_candidate_batches_active", "candidate_batches", ["id"],
+        sqlite_where=sa.text("status != 'COMPLETED'"), postgresql_where=sa.text("status != 'COMPLETED'")
+    )
+
+def downgrade() -> None:
+    op.drop_index("ix_candidate_batches_active", table_name="candidate_batches")
+    op.drop_index("ix_candidates_batch_id_verification_status_effort", table_name="candidates")
+    op.create_index("ix_candidates_batch_id_verification_status", "candidates", ["batch_id", "verification_status"])
+    with op.batch_alter_table("candidate_batches") as batch_op:
+        batch_op.drop_column("sla_deadline")
+        batch_op.drop_column("scheduling_weight")
+        batch_op.drop_column("served_effort")
+    with op.batch_alter_table("candidates") as batch_op:
+        batch_op.drop_column("effort_estimate")
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""results of the external verification sources
+
+Existing batches are not checked here; an admin can run
+POST /api/candidates/batch/{id}/source-check once VERIFICATION_SOURCES is set.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+# Dropping columns rebuilds the table on SQLite, which cannot carry expression indexes over
+EXPRESSION_INDEXES = (
+    ("ix_employment_company_name_years", "employment", "company_name"),
+    ("ix_education_institution_years", "education", "institution"),
+)
+
+def upgrade() -> None:
+    for table_name in ("employment", "education"):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.add_column(sa.Column("source_results", sa.JSON(), nullable=True))
+    with op.batch_alter_table("candidate_batches") as batch_op:
+        batch_op.add_column(sa.Column("sources_checked_at", sa.DateTime(), nullable=True))
+
+def downgrade() -> None:
+    # The partial index does not survive the table rebuild either
+    op.drop_index("ix_candidate_batches_active", table_name="candidate_batches")
+    with op.batch_alter_table("candidate_batches") as batch_op:
+        batch_op.drop_column("sources_checked_at")
+    op.create_index(
+        "ix_candidate_batches_active", "candidate_batches", ["id"],
+        sqlite_where=sa.text("status != 'COMPLETED'"), postgresql_where=sa.text("status != 'COMPLETED'")
+    )
+    for index_name, table_name, _ in EXPRESSION_INDEXES:
+        op.drop_index(index_name, table_name=table_name)
+    for table_name in ("education", "employment"):
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("source_results")
+    for index_name, table_name, name_column in EXPRESSION_INDEXES:
+        op.create_index(index_name, table_name, [sa.text(f"lower({name_column})"), "start_year", "end_year"])
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""per-stage ingest timings on candidate_batches
+
+Batches uploaded before this revision have no timings and are left out of
+GET /api/candidates/ingest-stats.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+TIMING_COLUMNS = (
+    "ingest_read_ms",
+    "ingest_parse_ms",
+    "ingest_candidates_ms",
+    "ingest_histories_ms",
+    "ingest_commit_ms",
+    "ingest_total_ms",
+    "ingest_rows_per_second",
+)
+
+def upgrade() -> None:
+    with op.batch_alter_table("candidate_batches") as batch_op:
+        batch_op.add_column(sa.Column("source_size_bytes", sa.Integer(), nullable=True))
+        for column_name in TIMING_COLUMNS:
+            batch_op.add_column(sa.Column(column_name, sa.Float(), nullable=True))
+
+def downgrade() -> None:
+    # Dropping columns rebuilds the table on SQLite, which does not carry the partial index over
+    op.drop_index("ix_candidate_batches_active", table_name="candidate_batches")
+    with op.batch_alter_table("candidate_batches") as batch_op:
+        for column_name in reversed(TIMING_COLUMNS):
+            batch_op.drop_column(column_name)
+        batch_op.drop_column("source_size_bytes")
+    op.create_index(
+        "ix_candidate_batches_active", "candidate_batches", ["id"],
+        sqlite_where=sa.text("status != 'COMPLETED'"), postgresql_where=sa.text("status != 'COMPLETED'")
+    )
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""column_mapping_profiles of how each recruiter's spreadsheet columns map to candidate fields
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        "column_mapping_profiles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("recruiter_id", sa.Integer(), nullable=False),
+        sa.Column("header_fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("headers", sa.JSON(), nullable=False),
+        sa.Column("mapping", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["recruiter_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("recruiter_id", "header_fingerprint", name="uq_column_mapping_profiles_recruiter_id_fingerprint"),
+    )
+    op.create_index("ix_column_mapping_profiles_id", "column_mapping_profiles", ["id"])
+
+def downgrade() -> None:
+    op.drop_index("ix_column_mapping_profiles_id", table_name="column_mapping_profiles")
+    op.drop_table("column_mapping_profiles")
\ No newline at end of file
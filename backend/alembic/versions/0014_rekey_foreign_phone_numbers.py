@@ -0,0 +1,61 @@
+"""recompute phone keys of numbers whose country code lost its "+"
+
+Such numbers ("447700900123") used to get the default country code put in
+front ("+49447700900123"); they now keep their own. Duplicate links made
+through a wrong key are left alone, a wrong key could only ever match
+another wrong key of the same number.
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.identity_keys import normalize_phone
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+PAGE_SIZE = 1000
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    candidates = sa.table(
+        "candidates",
+        sa.column("id", sa.Integer),
+        sa.column("phone", sa.String),
+        sa.column("phone_key", sa.String),
+    )
+    update = (
+        candidates.update()
+        .where(candidates.c.id == sa.bindparam("candidate_id"))
+        .values(phone_key=sa.bindparam("new_phone_key"))
+    )
+    
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(candidates.c.id, candidates.c.phone, candidates.c.phone_key)
+            .where(candidates.c.id > last_id, candidates.c.phone.is_not(None))
+            .order_by(candidates.c.id)
+            .limit(PAGE_SIZE)
+        ).fetchall()
+        if not rows:
+            return
+        
+        params = [
+            {"candidate_id": row.id, "new_phone_key": key}
+            for row in rows
+            for key in (normalize_phone(row.phone),)
+            if key != row.phone_key
+        ]
+        if params:
+            bind.execute(update, params)
+        last_id = rows[-1].id
+
+def downgrade() -> None:
+    # The old keys were wrong; nothing to restore
+    pass
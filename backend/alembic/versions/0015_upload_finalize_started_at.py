@@ -0,0 +1,21 @@
+"""upload_sessions.finalize_started_at, so a finalize that died can be taken over
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    with op.batch_alter_table("upload_sessions") as batch_op:
+        batch_op.add_column(sa.Column("finalize_started_at", sa.DateTime(), nullable=True))
+
+def downgrade() -> None:
+    with op.batch_alter_table("upload_sessions") as batch_op:
+        batch_op.drop_column("finalize_started_at")
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""index the pending queue in the order the scheduler reads it
+
+/api/verification/pending orders pending candidates by effort_estimate and
+id since 0009, so the (verification_status, created_at) index from 0003
+found them but left the sort to the database. Nothing else reads pending
+candidates by created_at, so that index is replaced.
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = "0016"
+down_revision = "0015"
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_candidates_verification_status_effort", "candidates", ["verification_status", "effort_estimate", "id"]
+    )
+    op.drop_index("ix_candidates_verification_status_created_at", table_name="candidates")
+
+def downgrade() -> None:
+    op.create_index("ix_candidates_verification_status_created_at", "candidates", ["verification_status", "created_at"])
+    op.drop_index("ix_candidates_verification_status_effort", table_name="candidates")
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""
+Column mapping profiles: how a recruiter's spreadsheets map to candidate fields.
+
+A CSV or XLSX upload is identified by the fingerprint of its header row
+(app.utils.column_mapping.header_fingerprint). The first upload of a header
+row by a recruiter analyzes its column names and saves the result as a
+column_mapping_profiles row, which the recruiter can correct with
+PUT /api/candidates/column-profiles/{id}; every later upload of the same
+header row by that recruiter is read with the saved mapping.
+
+Compiled mappings are kept in a process-local LRU keyed by recruiter and
+fingerprint, so repeat uploads neither query the table nor look at the
+column names again. An edited profile takes effect at once on the worker
+that saved it and within COLUMN_PROFILE_CACHE_TTL_SECONDS on the others.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import anyio
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from . import models
+from .utils.column_mapping import ColumnMapping, header_fingerprint, normalize_header
+
+logger = logging.getLogger(__name__)
+
+COLUMN_PROFILE_CACHE_TTL_SECONDS = float(os.getenv("COLUMN_PROFILE_CACHE_TTL_SECONDS", "300"))
+COLUMN_PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("COLUMN_PROFILE_CACHE_MAX_ENTRIES", "1000"))
+
+ProfileKey = Tuple[int, str]  # recruiter id, header fingerprint
+
+class ColumnProfileCache:
+    """Thread-safe TTL + LRU map of (recruiter id, header fingerprint) -> compiled ColumnMapping"""
+    
+    def __init__(self, max_entries: int = COLUMN_PROFILE_CACHE_MAX_ENTRIES, ttl_seconds: float = COLUMN_PROFILE_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[ProfileKey, Tuple[float, ColumnMapping]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+    
+    def get(self, key: ProfileKey) -> Optional[ColumnMapping]:
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry[0]:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key: ProfileKey, mapping: ColumnMapping) -> None:
+        if not self.enabled:
+            return
+        
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, mapping)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+column_profile_cache = ColumnProfileCache()
+
+def load_profile_mapping(db, recruiter_id: int, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """
+    The saved mapping of a recruiter's header row, if there is one.
+
+    Takes a synchronous Session, so async callers go through run_sync.
+    """
+    Profile = models.ColumnMappingProfile
+    return db.scalars(
+        select(Profile.mapping).where(Profile.recruiter_id == recruiter_id, Profile.header_fingerprint == fingerprint)
+    ).first()
+
+class ColumnResolver:
+    """
+    The `columns` callable of one CSV or XLSX upload, see parse_csv_candidates.
+
+    The parsers run in the threadpool, so a profile that is not cached is looked up on the event
+    loop with the upload's own session, which waits for the parser in the meantime. A header row
+    without a profile is analyzed and kept in new_profile for save_column_profile().
+    """
+    
+    def __init__(self, db, recruiter_id: int):
+        self.db = db
+        self.recruiter_id = recruiter_id
+        self.new_profile: Optional[Tuple[ProfileKey, List[str], ColumnMapping]] = None
+    
+    def __call__(self, headers: Sequence[Any]) -> ColumnMapping:
+        key = (self.recruiter_id, header_fingerprint(headers))
+        mapping = column_profile_cache.get(key)
+        if mapping is not None:
+            return mapping
+        
+        names = anyio.from_thread.run(self.db.run_sync, load_profile_mapping, *key)
+        if names is None:
+            mapping = ColumnMapping(headers)
+            self.new_profile = (key, [normalize_header(header) for header in headers], mapping)
+            return mapping
+        
+        mapping = ColumnMapping(headers, names)
+        column_profile_cache.put(key, mapping)
+        return mapping
+
+async def save_column_profile(db, resolver: ColumnResolver) -> None:
+    """
+    Save the profile of a header row uploaded for the first time, after the upload was committed.
+
+    Never raises, since the upload has already succeeded. A failed save is logged and its rollback
+    expires the committed batch too, which is why ingest_upload builds its response first.
+    """
+    if resolver.new_profile is None:
+        return
+    
+    (recruiter_id, fingerprint), headers, mapping = resolver.new_profile
+    db.add(models.ColumnMappingProfile(
+        recruiter_id=recruiter_id, header_fingerprint=fingerprint, headers=headers, mapping=mapping.names
+    ))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Saved by a concurrent upload of the same header row; the next upload loads that one
+        await db.rollback()
+        return
+    except Exception:
+        logger.warning("Could not save the column mapping profile of recruiter %s", recruiter_id, exc_info=True)
+        await db.rollback()
+        return
+    column_profile_cache.put((recruiter_id, fingerprint), mapping)
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""
+Connectors to external verification sources (company registers, employment
+records, degree registries) that check claims automatically after ingest.
+Verifiers see the outcome in each claim's source_results.
+"""
+
+from .base import (
+    CONFIRMED,
+    CONTRADICTED,
+    NOT_FOUND,
+    TIMEOUT,
+    ERROR,
+    UNAVAILABLE,
+    Claim,
+    CircuitBreaker,
+    HttpSourceConnector,
+    ResponseCache,
+    SourceRequest,
+    response_cache,
+)
+from .sources import CONNECTOR_TYPES, check_sources, create_connectors, sources_enabled
+from .runner import check_claims, run_source_checks, run_source_checks_in_background
\ No newline at end of file
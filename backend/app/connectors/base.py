@@ -0,0 +1,363 @@
+"""
+Building blocks shared by the verification source connectors.
+
+A connector turns a claim into one HTTP request against its source and the
+response into a result. HttpSourceConnector wraps that request with
+
+- a pooled httpx.AsyncClient per source, open for the duration of a run;
+- a per-source timeout on the whole request, not only on each phase;
+- a circuit breaker per source that stops sending requests after
+  SOURCE_BREAKER_FAILURES consecutive failures and lets a single probe
+  through once SOURCE_BREAKER_RESET_SECONDS have passed;
+- a TTL + LRU cache of definitive responses keyed by request, shared by
+  every run in the process; identical requests in flight are coalesced.
+
+Breakers and the cache are process-local like app.rate_limit, so every
+worker finds out about a failing source on its own. httpx is imported when
+the first connector opens.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+SOURCE_TIMEOUT_SECONDS = float(os.getenv("SOURCE_TIMEOUT_SECONDS", "5"))
+SOURCE_MAX_CONNECTIONS = int(os.getenv("SOURCE_MAX_CONNECTIONS", "20"))
+SOURCE_BREAKER_FAILURES = int(os.getenv("SOURCE_BREAKER_FAILURES", "5"))
+SOURCE_BREAKER_RESET_SECONDS = float(os.getenv("SOURCE_BREAKER_RESET_SECONDS", "30"))
+SOURCE_CACHE_TTL_SECONDS = float(os.getenv("SOURCE_CACHE_TTL_SECONDS", "21600"))
+SOURCE_CACHE_MAX_ENTRIES = int(os.getenv("SOURCE_CACHE_MAX_ENTRIES", "100000"))
+
+EMPLOYMENT = "employment"
+EDUCATION = "education"
+
+# Result statuses; only the first three say something about the claim
+CONFIRMED = "confirmed"
+CONTRADICTED = "contradicted"
+NOT_FOUND = "not_found"
+TIMEOUT = "timeout"
+ERROR = "error"
+UNAVAILABLE = "unavailable"
+DEFINITIVE_STATUSES = frozenset((CONFIRMED, CONTRADICTED, NOT_FOUND))
+
+def source_timeout(name: str) -> float:
+    """SOURCE_<NAME>_TIMEOUT_SECONDS if set, otherwise SOURCE_TIMEOUT_SECONDS"""
+    raw = os.getenv(f"SOURCE_{name.upper()}_TIMEOUT_SECONDS")
+    return float(raw) if raw is not None else SOURCE_TIMEOUT_SECONDS
+
+def make_result(
+    status: str,
+    reference: Optional[str] = None,
+    details: Optional[Dict[str, Any]] = None,
+    latency_ms: Optional[float] = None,
+    cached: bool = False
+) -> Dict[str, Any]:
+    """One source's result as stored in a claim's source_results"""
+    return {
+        "status": status,
+        "reference": reference,
+        "details": details or None,
+        "checked_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "latency_ms": round(latency_ms, 1) if latency_ms is not None else None,
+        "cached": cached,
+    }
+
+class Claim:
+    """What the connectors need to know about one employment or education row"""
+    
+    __slots__ = ("kind", "claim_id", "candidate_name", "organization", "title", "start_year", "end_year", "is_current", "previous")
+    
+    def __init__(
+        self,
+        kind: str,
+        claim_id: int,
+        candidate_name: str,
+        organization: str,
+        title: Optional[str] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        is_current: bool = False,
+        previous: Optional[Dict[str, Any]] = None
+    ):
+        self.kind = kind
+        self.claim_id = claim_id
+        self.candidate_name = candidate_name
+        self.organization = organization
+        self.title = title
+        self.start_year = start_year
+        self.end_year = end_year
+        self.is_current = is_current
+        self.previous = previous
+
+class SourceRequest:
+    __slots__ = ("method", "path", "params", "json", "cache_key")
+    
+    def __init__(self, method: str, path: str, cache_key: Hashable, params: Optional[Dict[str, Any]] = None, json: Any = None):
+        self.method = method
+        self.path = path
+        self.params = params
+        self.json = json
+        self.cache_key = cache_key
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed, open for `reset_seconds`, then half-open for a single probe"""
+    
+    def __init__(self, failure_threshold: int = SOURCE_BREAKER_FAILURES, reset_seconds: float = SOURCE_BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self._probing = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() >= self.opened_at + self.reset_seconds else "open"
+    
+    def allow(self) -> bool:
+        if self.failure_threshold <= 0:
+            return True
+        
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._probing or time.monotonic() < self.opened_at + self.reset_seconds:
+                return False
+            self._probing = True
+            return True
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or (self.opened_at is None and 0 < self.failure_threshold <= self.failures):
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+            self._probing = False
+    
+    def release(self) -> None:
+        """Give a probe back without an outcome, so the next request may probe instead"""
+        with self._lock:
+            self._probing = False
+    
+    def reset(self) -> None:
+        self.record_success()
+
+class ResponseCache:
+    """Thread-safe TTL + LRU map of request key -> (status code, parsed body)"""
+    
+    def __init__(self, max_entries: int = SOURCE_CACHE_MAX_ENTRIES, ttl_seconds: float = SOURCE_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+    
+    def get(self, key: Hashable) -> Optional[Tuple[int, Any]]:
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry[0]:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+    
+    def put(self, key: Hashable, status_code: int, payload: Any) -> None:
+        if not self.enabled:
+            return
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, status_code, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+response_cache = ResponseCache()
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Process-wide breaker of a source, created on first use"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker()
+        return breaker
+
+class HttpSourceConnector:
+    """
+    Base class of the HTTP sources. Subclasses set `name` and `claim_kind` and
+    implement build_request() and interpret(); check() never raises.
+    """
+    
+    name = ""
+    claim_kind = ""
+    
+    def __init__(self, base_url: str, timeout: Optional[float] = None, max_connections: int = SOURCE_MAX_CONNECTIONS):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout if timeout is not None else source_timeout(self.name)
+        self.max_connections = max_connections
+        self.breaker = get_breaker(self.name)
+        self._client = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+    
+    def build_request(self, claim: Claim) -> Optional[SourceRequest]:
+        """The request for a claim, or None when the claim lacks what the source needs"""
+        raise NotImplementedError
+    
+    def interpret(self, claim: Claim, status_code: int, payload: Any) -> Tuple[str, Optional[str], Optional[Dict[str, Any]]]:
+        """(status, reference, details) for a 200 or 404 response"""
+        raise NotImplementedError
+    
+    def applies_to(self, claim: Claim) -> bool:
+        return claim.kind == self.claim_kind
+    
+    async def open(self) -> None:
+        import httpx
+        
+        # Clients are bound to the event loop they were created on, so each run opens its own
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+        )
+        # httpcore rescans its whole wait queue whenever a connection frees up, so requests
+        # beyond the pool size wait here instead; that wait does not count against the timeout
+        self._slots = asyncio.Semaphore(self.max_connections)
+    
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def check(self, claim: Claim) -> Optional[Dict[str, Any]]:
+        request = self.build_request(claim)
+        if request is None:
+            return None
+        
+        started = time.perf_counter()
+        key = (self.name, request.cache_key)
+        outcome = response_cache.get(key)
+        cached = outcome is not None
+        if outcome is None:
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                outcome = await asyncio.shield(inflight)
+            else:
+                future = self._inflight[key] = asyncio.get_running_loop().create_future()
+                outcome = ERROR
+                try:
+                    outcome = await self._fetch(request, key)
+                finally:
+                    del self._inflight[key]
+                    future.set_result(outcome)
+        
+        latency_ms = (time.perf_counter() - started) * 1000
+        if isinstance(outcome, str):
+            return make_result(outcome, latency_ms=latency_ms)
+        try:
+            status, reference, details = self.interpret(claim, *outcome)
+        except (KeyError, TypeError, ValueError):
+            status, reference, details = ERROR, None, {"error": "Unexpected response from the source"}
+        return make_result(status, reference, details, latency_ms, cached)
+    
+    async def _fetch(self, request: SourceRequest, key: Hashable):
+        """(status code, body) of a usable response, otherwise the failure status"""
+        import httpx
+        
+        async with self._slots:
+            if not self.breaker.allow():
+                return UNAVAILABLE
+            
+            try:
+                response = await asyncio.wait_for(
+                    self._client.request(request.method, request.path, params=request.params, json=request.json),
+                    self.timeout
+                )
+            except (asyncio.TimeoutError, httpx.TimeoutException):
+                self.breaker.record_failure()
+                return TIMEOUT
+            except httpx.HTTPError:
+                self.breaker.record_failure()
+                return ERROR
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            except Exception:
+                # Anything else the request raises (an invalid URL, a broken transport) is still a failure,
+                # and must not leave a half-open breaker waiting forever for its probe to report back
+                self.breaker.record_failure()
+                return ERROR
+        
+        if response.status_code >= 500 or response.status_code == 429:
+            self.breaker.record_failure()
+            return ERROR
+        self.breaker.record_success()
+        if response.status_code not in (200, 404):
+            return ERROR
+        
+        try:
+            payload = response.json() if response.content else None
+        except ValueError:
+            return ERROR
+        response_cache.put(key, response.status_code, payload)
+        return response.status_code, payload
+    
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "claim_kind": self.claim_kind,
+            "base_url": self.base_url,
+            "timeout_seconds": self.timeout,
+            "max_connections": self.max_connections,
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "times_opened": self.breaker.times_opened,
+        }
\ No newline at end of file
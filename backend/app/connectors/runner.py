@@ -0,0 +1,171 @@
+"""
+Fan-out of a batch's claims to the configured verification sources.
+
+run_source_checks() loads every employment and education claim of a batch
+and queries all sources that apply to a claim at the same time, with up to
+SOURCE_CONCURRENCY claims in flight. What comes back is stored per source
+name in the claim's source_results, written in chunks of
+SOURCE_WRITE_CHUNK as results arrive. A failed lookup (timeout, error,
+open circuit) never replaces an earlier definitive result of that source.
+"""
+
+import asyncio
+import logging
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, union, update
+
+from .. import models
+from ..database import SessionLocal
+from ..metrics import SOURCE_RESULTS
+from .base import DEFINITIVE_STATUSES, EDUCATION, EMPLOYMENT, Claim, HttpSourceConnector, response_cache
+from .sources import create_connectors
+
+logger = logging.getLogger(__name__)
+
+SOURCE_CONCURRENCY = int(os.getenv("SOURCE_CONCURRENCY", "100"))
+SOURCE_WRITE_CHUNK = int(os.getenv("SOURCE_WRITE_CHUNK", "500"))
+
+def merge_results(previous: Optional[Dict[str, Any]], results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    merged = dict(previous or {})
+    for name, result in results.items():
+        earlier = merged.get(name)
+        if result["status"] in DEFINITIVE_STATUSES or not earlier or earlier.get("status") not in DEFINITIVE_STATUSES:
+            merged[name] = result
+    return merged
+
+async def check_claim(claim: Claim, connectors: Sequence[HttpSourceConnector]) -> Dict[str, Dict[str, Any]]:
+    """Results of every applicable source for one claim, queried concurrently"""
+    applicable = [connector for connector in connectors if connector.applies_to(claim)]
+    results = await asyncio.gather(*(connector.check(claim) for connector in applicable))
+    return {connector.name: result for connector, result in zip(applicable, results) if result is not None}
+
+async def check_claims(
+    claims: Iterable[Claim],
+    connectors: Sequence[HttpSourceConnector],
+    write,
+    concurrency: int = SOURCE_CONCURRENCY,
+    chunk_size: int = SOURCE_WRITE_CHUNK
+) -> Dict[str, Counter]:
+    """
+    Check `claims` with `concurrency` workers and hand (claim, merged results)
+    pairs to the blocking `write` callable in chunks, off the event loop.
+    Returns status counts per source. Connectors must be open.
+    """
+    claims = iter(claims)
+    counts: Dict[str, Counter] = {connector.name: Counter() for connector in connectors}
+    buffer: List[Tuple[Claim, Dict[str, Any]]] = []
+    write_lock = asyncio.Lock()
+    
+    async def flush() -> None:
+        rows = buffer[:]
+        buffer.clear()
+        if rows:
+            async with write_lock:
+                await asyncio.to_thread(write, rows)
+    
+    async def worker() -> None:
+        # Only this coroutine advances the shared iterator between awaits, so no claim is taken twice
+        for claim in claims:
+            results = await check_claim(claim, connectors)
+            for name, result in results.items():
+                counts[name][result["status"]] += 1
+            buffer.append((claim, merge_results(claim.previous, results)))
+            if len(buffer) >= chunk_size:
+                await flush()
+    
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    await flush()
+    return counts
+
+def _load_claims(db, batch_id: int) -> List[Claim]:
+    Candidate, Employment, Education = models.Candidate, models.Employment, models.Education
+    employment = db.connection().execute(
+        select(
+            Employment.id, Candidate.full_name, Employment.company_name, Employment.position,
+            Employment.start_year, Employment.end_year, Employment.is_current, Employment.source_results
+        )
+        .join(Candidate, Candidate.id == Employment.candidate_id)
+        .where(Candidate.batch_id == batch_id)
+    ).fetchall()
+    education = db.connection().execute(
+        select(
+            Education.id, Candidate.full_name, Education.institution, Education.degree,
+            Education.start_year, Education.end_year, Education.is_current, Education.source_results
+        )
+        .join(Candidate, Candidate.id == Education.candidate_id)
+        .where(Candidate.batch_id == batch_id)
+    ).fetchall()
+    return (
+        [Claim(EMPLOYMENT, *row[:6], bool(row[6]), row[7]) for row in employment]
+        + [Claim(EDUCATION, *row[:6], bool(row[6]), row[7]) for row in education]
+    )
+
+def _write_results(rows: List[Tuple[Claim, Dict[str, Any]]]) -> None:
+    with SessionLocal() as db:
+        changed = []
+        for kind, model in ((EMPLOYMENT, models.Employment), (EDUCATION, models.Education)):
+            values = [{"id": claim.claim_id, "source_results": results} for claim, results in rows if claim.kind == kind]
+            if values:
+                db.execute(update(model), values)
+                changed.append(select(model.candidate_id).where(model.id.in_([value["id"] for value in values])))
+        if changed:
+            # source_results are part of the candidate representation, so bump its version for ETag revalidation
+            db.execute(
+                update(models.Candidate)
+                .where(models.Candidate.id.in_(union(*changed)))
+                .values(updated_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+
+async def _check_batch(claims: List[Claim], connectors: Sequence[HttpSourceConnector], concurrency: int) -> Dict[str, Counter]:
+    for connector in connectors:
+        await connector.open()
+    try:
+        return await check_claims(claims, connectors, _write_results, concurrency)
+    finally:
+        for connector in connectors:
+            await connector.aclose()
+
+def run_source_checks(
+    batch_id: int,
+    connectors: Optional[Sequence[HttpSourceConnector]] = None,
+    concurrency: int = SOURCE_CONCURRENCY
+) -> Optional[Dict[str, Any]]:
+    """Query the verification sources for every claim of a batch. Safe to re-run; None if the batch does not exist."""
+    connectors = create_connectors() if connectors is None else connectors
+    with SessionLocal() as db:
+        if db.get(models.CandidateBatch, batch_id) is None:
+            return None
+        claims = _load_claims(db, batch_id)
+    
+    cache_hits = response_cache.hits
+    counts = asyncio.run(_check_batch(claims, connectors, concurrency)) if claims and connectors else {}
+    for name, statuses in counts.items():
+        for status, count in statuses.items():
+            SOURCE_RESULTS.labels(name, status).inc(count)
+    
+    with SessionLocal() as db:
+        db.execute(
+            update(models.CandidateBatch)
+            .where(models.CandidateBatch.id == batch_id)
+            .values(sources_checked_at=datetime.utcnow())
+        )
+        db.commit()
+    
+    return {
+        "claims_checked": len(claims),
+        "sources": {name: dict(statuses) for name, statuses in counts.items()},
+        "cache_hits": response_cache.hits - cache_hits,
+    }
+
+def run_source_checks_in_background(batch_id: int) -> None:
+    # Runs after the upload response was sent, so a failure can only be logged
+    try:
+        run_source_checks(batch_id)
+    except Exception:
+        logger.exception("Source checks failed for batch %s", batch_id)
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+The verification sources and how they are configured.
+
+VERIFICATION_SOURCES lists the enabled sources as comma-separated
+`type=base_url` pairs, e.g.
+
+    company_registry=https://registry.example.com,employment_records=http://localhost:8102
+
+where type is a key of CONNECTOR_TYPES or a "package.module:Class" path to
+an HttpSourceConnector subclass. Without any, source checks are disabled.
+app.connectors.standins serves all three built-in types locally.
+"""
+
+import importlib
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from ..utils.entity_names import COMPANY, INSTITUTION, fold_ascii, normalize_entity_name
+from .base import CONFIRMED, CONTRADICTED, EDUCATION, EMPLOYMENT, NOT_FOUND, Claim, HttpSourceConnector, SourceRequest
+
+VERIFICATION_SOURCES = os.getenv("VERIFICATION_SOURCES", "")
+
+# Years reported by a source may differ by this much from the claim (CVs round to the year)
+YEAR_TOLERANCE = 1
+
+def _person_key(name: str) -> str:
+    return " ".join(fold_ascii(name).lower().split())
+
+def _year_mismatches(pairs: List[Tuple[str, Optional[int], Optional[int]]]) -> Dict[str, Any]:
+    return {
+        field: {"claimed": claimed, "reported": reported}
+        for field, claimed, reported in pairs
+        if claimed is not None and reported is not None and abs(claimed - reported) > YEAR_TOLERANCE
+    }
+
+class CompanyRegistryConnector(HttpSourceConnector):
+    """Commercial register: does the employer exist, and did it exist during the claimed years"""
+    
+    name = "company_registry"
+    claim_kind = EMPLOYMENT
+    
+    def build_request(self, claim: Claim) -> Optional[SourceRequest]:
+        normalized = normalize_entity_name(COMPANY, claim.organization)
+        if not normalized:
+            return None
+        # The register search ignores case and legal forms, so equivalent spellings share a cache entry
+        return SourceRequest("GET", "/companies", cache_key=normalized, params={"name": claim.organization})
+    
+    def interpret(self, claim: Claim, status_code: int, payload: Any):
+        normalized = normalize_entity_name(COMPANY, claim.organization)
+        results = (payload or {}).get("results", []) if status_code == 200 else []
+        matches = [company for company in results if normalize_entity_name(COMPANY, company["name"]) == normalized]
+        if not matches:
+            return NOT_FOUND, None, None
+        
+        company = matches[0]
+        details = {}
+        incorporated, dissolved = company.get("incorporated_year"), company.get("dissolved_year")
+        end_year = datetime.utcnow().year if claim.is_current else claim.end_year
+        if incorporated is not None and claim.start_year is not None and claim.start_year < incorporated:
+            details["incorporated_year"] = {"claimed_start": claim.start_year, "reported": incorporated}
+        if dissolved is not None and end_year is not None and end_year > dissolved:
+            details["dissolved_year"] = {"claimed_end": end_year, "reported": dissolved}
+        return CONTRADICTED if details else CONFIRMED, company.get("registry_id"), details
+
+class EmploymentRecordsConnector(HttpSourceConnector):
+    """Employer-reported employment records of a person"""
+    
+    name = "employment_records"
+    claim_kind = EMPLOYMENT
+    
+    def build_request(self, claim: Claim) -> Optional[SourceRequest]:
+        if not claim.candidate_name or not claim.organization:
+            return None
+        body = {
+            "employer": claim.organization,
+            "person": claim.candidate_name,
+            "start_year": claim.start_year,
+            "end_year": claim.end_year,
+        }
+        cache_key = (
+            normalize_entity_name(COMPANY, claim.organization), _person_key(claim.candidate_name),
+            claim.start_year, claim.end_year
+        )
+        return SourceRequest("POST", "/employment/verify", cache_key=cache_key, json=body)
+    
+    def interpret(self, claim: Claim, status_code: int, payload: Any):
+        if status_code == 404 or not payload:
+            return NOT_FOUND, None, None
+        
+        details = _year_mismatches([
+            ("start_year", claim.start_year, payload.get("start_year")),
+            ("end_year", None if claim.is_current else claim.end_year, payload.get("end_year")),
+        ])
+        if claim.is_current and payload.get("end_year") is not None:
+            details["end_year"] = {"claimed": None, "reported": payload["end_year"]}
+        return CONTRADICTED if details else CONFIRMED, payload.get("record_id"), details
+
+class DegreeRegistryConnector(HttpSourceConnector):
+    """Registrar records of degrees awarded by an institution"""
+    
+    name = "degree_registry"
+    claim_kind = EDUCATION
+    
+    def build_request(self, claim: Claim) -> Optional[SourceRequest]:
+        if not claim.candidate_name or not claim.organization:
+            return None
+        body = {
+            "institution": claim.organization,
+            "person": claim.candidate_name,
+            "degree": claim.title,
+            "graduation_year": claim.end_year,
+        }
+        cache_key = (
+            normalize_entity_name(INSTITUTION, claim.organization), _person_key(claim.candidate_name),
+            (claim.title or "").lower(), claim.end_year
+        )
+        return SourceRequest("POST", "/degrees/verify", cache_key=cache_key, json=body)
+    
+    def interpret(self, claim: Claim, status_code: int, payload: Any):
+        if status_code == 404 or not payload:
+            return NOT_FOUND, None, None
+        
+        details = _year_mismatches([("graduation_year", claim.end_year, payload.get("graduation_year"))])
+        claimed, reported = (claim.title or "").lower().strip(), (payload.get("degree") or "").lower().strip()
+        if claimed and reported and claimed not in reported and reported not in claimed:
+            details["degree"] = {"claimed": claim.title, "reported": payload.get("degree")}
+        return CONTRADICTED if details else CONFIRMED, payload.get("record_id"), details
+
+CONNECTOR_TYPES: Dict[str, Type[HttpSourceConnector]] = {
+    connector.name: connector
+    for connector in (CompanyRegistryConnector, EmploymentRecordsConnector, DegreeRegistryConnector)
+}
+
+def parse_sources(spec: str) -> List[Tuple[str, str]]:
+    """(type, base_url) pairs of a VERIFICATION_SOURCES value"""
+    sources = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        if "=" not in entry:
+            raise ValueError(f"Invalid VERIFICATION_SOURCES entry '{entry}', expected type=base_url")
+        kind, base_url = entry.split("=", 1)
+        sources.append((kind.strip(), base_url.strip()))
+    return sources
+
+def resolve_sources(spec: str = VERIFICATION_SOURCES) -> List[Tuple[Type[HttpSourceConnector], str]]:
+    """(connector class, base_url) pairs of a VERIFICATION_SOURCES value; raises ValueError for an invalid one"""
+    sources = []
+    for kind, base_url in parse_sources(spec):
+        if kind in CONNECTOR_TYPES:
+            connector_class = CONNECTOR_TYPES[kind]
+        elif ":" in kind:
+            module_name, class_name = kind.split(":", 1)
+            try:
+                connector_class = getattr(importlib.import_module(module_name), class_name)
+            except (ImportError, AttributeError) as e:
+                raise ValueError(f"Cannot load verification source '{kind}': {e}") from e
+        else:
+            raise ValueError(f"Unknown verification source '{kind}', expected one of {sorted(CONNECTOR_TYPES)} or 'module:Class'")
+        sources.append((connector_class, base_url))
+    return sources
+
+def create_connectors(spec: str = VERIFICATION_SOURCES) -> List[HttpSourceConnector]:
+    return [connector_class(base_url) for connector_class, base_url in resolve_sources(spec)]
+
+def check_sources() -> None:
+    """Validate VERIFICATION_SOURCES; the app runs this at startup so a typo stops it instead of failing uploads"""
+    resolve_sources(VERIFICATION_SOURCES)
+
+def sources_enabled() -> bool:
+    # Never raises, it decides whether to schedule checks after an upload was committed
+    return any(entry.strip() for entry in VERIFICATION_SOURCES.split(","))
\ No newline at end of file
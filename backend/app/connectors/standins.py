@@ -0,0 +1,150 @@
+"""
+Local stand-ins for the verification sources, for development and tests
+without network access.
+
+Each stand-in answers like the real source would, with records derived
+deterministically from a hash of the query: most companies exist, most
+employment and degree claims are on file, and a share of those disagree on
+the years. Latency, the share of 503 responses and the share of requests
+that hang past any sensible timeout are configurable, so timeouts and the
+circuit breaker can be exercised too.
+
+    python -m app.connectors.standins --port 8101 --latency-ms 20
+
+serves company_registry on 8101, employment_records on 8102 and
+degree_registry on 8103; point VERIFICATION_SOURCES at them with
+
+    company_registry=http://127.0.0.1:8101,employment_records=http://127.0.0.1:8102,degree_registry=http://127.0.0.1:8103
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from ..utils.entity_names import COMPANY, INSTITUTION, fold_ascii, normalize_entity_name
+
+STANDIN_SOURCES = ("company_registry", "employment_records", "degree_registry")
+
+def _bucket(*parts: Any) -> int:
+    """Stable 0-99 bucket of the query, so the same question always gets the same answer"""
+    text = "|".join("" if part is None else str(part) for part in parts)
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=4).digest(), "big") % 100
+
+def _person(name: Optional[str]) -> str:
+    return " ".join(fold_ascii(name or "").lower().split())
+
+def create_standin_app(source: str, latency_ms: float = 20, error_rate: float = 0.0, hang_rate: float = 0.0, seed: int = 0):
+    """ASGI app of one stand-in source"""
+    if source not in STANDIN_SOURCES:
+        raise ValueError(f"Unknown stand-in source '{source}', expected one of {STANDIN_SOURCES}")
+    
+    app = FastAPI(title=f"{source} stand-in")
+    unavailable = JSONResponse({"detail": "Service unavailable"}, status_code=503)
+    rng = random.Random(seed)
+    
+    async def simulate_network(scope, receive, send):
+        # Plain ASGI rather than @app.middleware, which costs more CPU than the stand-in itself
+        if scope["type"] == "http":
+            roll = rng.random()
+            if roll < hang_rate:
+                await asyncio.sleep(3600)
+            await asyncio.sleep(max(0.0, rng.gauss(latency_ms, latency_ms / 4)) / 1000)
+            if roll < hang_rate + error_rate:
+                return await unavailable(scope, receive, send)
+        await app(scope, receive, send)
+    
+    @app.get("/health")
+    async def health():
+        return {"source": source, "status": "ok"}
+    
+    if source == "company_registry":
+        @app.get("/companies")
+        async def search_companies(name: str):
+            normalized = normalize_entity_name(COMPANY, name)
+            bucket = _bucket(normalized)
+            if not normalized or bucket < 10:
+                return {"results": []}
+            return {"results": [{
+                "registry_id": f"HRB {100000 + bucket * 997 + len(normalized)}",
+                "name": name.strip(),
+                "incorporated_year": 1960 + bucket % 50 if bucket % 7 else 2022,
+                "dissolved_year": 2015 + bucket % 8 if bucket % 13 == 0 else None,
+            }]}
+    
+    elif source == "employment_records":
+        @app.post("/employment/verify")
+        async def verify_employment(body: Dict[str, Any]):
+            key = (normalize_entity_name(COMPANY, body.get("employer")), _person(body.get("person")))
+            bucket = _bucket(*key)
+            if bucket < 25:
+                return JSONResponse({"detail": "No record"}, status_code=404)
+            start_year, end_year = body.get("start_year"), body.get("end_year")
+            if bucket % 9 == 0 and start_year is not None:
+                start_year -= 2
+            return {
+                "record_id": f"EMP-{bucket:02d}-{_bucket(*key, 'id'):02d}",
+                "employer": body.get("employer"),
+                "start_year": start_year,
+                "end_year": end_year,
+            }
+    
+    else:
+        @app.post("/degrees/verify")
+        async def verify_degree(body: Dict[str, Any]):
+            key = (normalize_entity_name(INSTITUTION, body.get("institution")), _person(body.get("person")))
+            bucket = _bucket(*key)
+            if bucket < 20:
+                return JSONResponse({"detail": "No record"}, status_code=404)
+            graduation_year = body.get("graduation_year")
+            if bucket % 11 == 0 and graduation_year is not None:
+                graduation_year += 3
+            return {
+                "record_id": f"DEG-{bucket:02d}-{_bucket(*key, 'id'):02d}",
+                "degree": body.get("degree"),
+                "graduation_year": graduation_year,
+            }
+    
+    return simulate_network
+
+async def serve(host: str, port: int, **options) -> None:
+    import signal
+    
+    import uvicorn
+    
+    servers = [
+        uvicorn.Server(uvicorn.Config(create_standin_app(source, **options), host=host, port=port + offset, log_level="warning"))
+        for offset, source in enumerate(STANDIN_SOURCES)
+    ]
+    # Each server would take over the signal handlers and only the last one would stop
+    loop = asyncio.get_running_loop()
+    for server in servers:
+        server.install_signal_handlers = lambda: None
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, lambda: [setattr(server, "should_exit", True) for server in servers])
+    await asyncio.gather(*(server.serve() for server in servers))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8101, help="port of the first source, the others follow")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    print("VERIFICATION_SOURCES=" + ",".join(
+        f"{source}=http://{args.host}:{args.port + offset}" for offset, source in enumerate(STANDIN_SOURCES)
+    ))
+    asyncio.run(serve(
+        args.host, args.port,
+        latency_ms=args.latency_ms, error_rate=args.error_rate, hang_rate=args.hang_rate, seed=args.seed
+    ))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
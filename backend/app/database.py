@@ -1,27 +1,365 @@
-from sqlalchemy import create_engine
+import asyncio
+import itertools
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from typing import Any, Dict, List, Optional, Union
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./cv_verification.db")
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+DB_ENGINE_PROFILE = os.getenv("DB_ENGINE_PROFILE", "default")
 
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL, connect_args={"check_same_thread": False}
-    )
-else:
-    engine = create_engine(DATABASE_URL)
+# Comma-separated read replicas of DATABASE_URL used by read-only endpoints
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# After a user commits a write their reads stay on the primary for this long, to cover replication lag
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+# A replica that failed to connect is skipped for this long before it is tried again
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+# Engine tuning profiles selected with DB_ENGINE_PROFILE. Pool settings apply to
+# server databases, sqlite_* settings become PRAGMAs on every new SQLite connection.
+# Any setting can be overridden on its own through DB_<SETTING>, e.g. DB_POOL_SIZE=30.
+ENGINE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "development": {
+        "sqlite_journal_mode": "WAL",
+        "sqlite_synchronous": "NORMAL",
+        "sqlite_busy_timeout_ms": 5000,
+    },
+    "production": {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_timeout": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "statement_timeout_ms": 30000,
+        "sqlite_journal_mode": "WAL",
+        "sqlite_synchronous": "NORMAL",
+        "sqlite_busy_timeout_ms": 15000,
+    },
+}
+
+ENGINE_SETTING_TYPES = {
+    "pool_size": int,
+    "max_overflow": int,
+    "pool_timeout": float,
+    "pool_pre_ping": bool,
+    "pool_recycle": int,
+    "statement_timeout_ms": int,
+    "sqlite_journal_mode": str,
+    "sqlite_synchronous": str,
+    "sqlite_busy_timeout_ms": int,
+}
+
+POOL_SETTINGS = ("pool_size", "max_overflow", "pool_timeout", "pool_pre_ping", "pool_recycle")
+
+def resolve_engine_profile(name: str) -> Dict[str, Any]:
+    if name not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown DB_ENGINE_PROFILE '{name}', expected one of {sorted(ENGINE_PROFILES)}")
+    
+    settings = dict(ENGINE_PROFILES[name])
+    for key, cast in ENGINE_SETTING_TYPES.items():
+        raw = os.getenv(f"DB_{key.upper()}")
+        if raw is not None:
+            settings[key] = raw.lower() in ("1", "true", "yes") if cast is bool else cast(raw)
+    return settings
+
+def _url_backend(url: str) -> str:
+    return url.split("://", 1)[0].split("+", 1)[0]
+
+def _install_sqlite_pragmas(sync_engine, settings: Dict[str, Any]) -> None:
+    pragmas = []
+    if settings.get("sqlite_journal_mode"):
+        pragmas.append(f"PRAGMA journal_mode={settings['sqlite_journal_mode']}")
+    if settings.get("sqlite_synchronous"):
+        pragmas.append(f"PRAGMA synchronous={settings['sqlite_synchronous']}")
+    if settings.get("sqlite_busy_timeout_ms") is not None:
+        pragmas.append(f"PRAGMA busy_timeout={int(settings['sqlite_busy_timeout_ms'])}")
+    if not pragmas:
+        return
+    
+    @event.listens_for(sync_engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+def build_engine(url: str, settings: Dict[str, Any], is_async: bool = False):
+    """Create a sync or async engine configured from a resolved engine profile"""
+    backend = _url_backend(url)
+    kwargs: Dict[str, Any] = {}
+    connect_args: Dict[str, Any] = {}
+    
+    if backend == "sqlite":
+        if not is_async:
+            connect_args["check_same_thread"] = False
+    else:
+        kwargs = {key: settings[key] for key in POOL_SETTINGS if key in settings}
+    
+    if backend in ("postgresql", "postgres") and settings.get("statement_timeout_ms"):
+        timeout = str(int(settings["statement_timeout_ms"]))
+        if is_async:
+            connect_args["server_settings"] = {"statement_timeout": timeout}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+    
+    if is_async:
+        db_engine = create_async_engine(url, connect_args=connect_args, **kwargs)
+    else:
+        db_engine = create_engine(url, connect_args=connect_args, **kwargs)
+    
+    if backend == "sqlite":
+        _install_sqlite_pragmas(db_engine.sync_engine if is_async else db_engine, settings)
+    
+    return db_engine
+
+engine_settings = resolve_engine_profile(DB_ENGINE_PROFILE)
+engine = build_engine(DATABASE_URL, engine_settings)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _pool_capacity(pool) -> int:
+    if isinstance(pool, QueuePool):
+        return pool.size() + max(pool._max_overflow, 0)
+    return int(os.getenv("DB_MAX_SESSIONS", "40"))
+
+# A sync-mode session keeps its connection between threadpool hops. Admitting more
+# sessions than the pool can serve lets every worker thread block on checkout while
+# the sessions holding connections wait for a thread, so excess requests wait here instead.
+_sync_session_slots = weakref.WeakKeyDictionary()
+
+def _session_slots(pool) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots_by_pool = _sync_session_slots.setdefault(loop, {})
+    slots = slots_by_pool.get(pool)
+    if slots is None:
+        slots = slots_by_pool[pool] = asyncio.Semaphore(_pool_capacity(pool))
+    return slots
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+def to_async_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its asyncio counterpart"""
+    scheme, rest = url.split("://", 1)
+    backend = _url_backend(url)
+    if backend == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if backend in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    raise ValueError(f"No async driver configured for database URL scheme '{scheme}'")
+
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_ASYNC:
+    async_engine = build_engine(to_async_url(DATABASE_URL), engine_settings, is_async=True)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+class ThreadedSession:
+    """
+    AsyncSession-compatible facade over a synchronous Session.
+
+    Every call that can reach the database runs in the threadpool, so routers
+    can be written once against the AsyncSession API and work in both modes.
+    """
+
+    def __init__(self, sync_session):
+        self.sync_session = sync_session
+
+    @property
+    def info(self):
+        return self.sync_session.info
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, params, **kwargs)
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, params, **kwargs)
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, statement, params, **kwargs)
+
+    async def connection(self, **kwargs):
+        return await run_in_threadpool(self.sync_session.connection, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def merge(self, instance, load: bool = True):
+        if not load:
+            return self.sync_session.merge(instance, load=False)
+        return await run_in_threadpool(self.sync_session.merge, instance)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def refresh(self, instance, attribute_names=None):
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
+
+    async def flush(self, objects=None):
+        await run_in_threadpool(self.sync_session.flush, objects)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+# What get_db yields: an AsyncSession in async mode, a ThreadedSession otherwise
+DbSession = Union[AsyncSession, ThreadedSession]
+
+@asynccontextmanager
+async def _open_session(sync_factory, async_factory, sync_engine):
+    if async_factory is not None:
+        async with async_factory() as db:
+            yield db
+        return
+
+    async with _session_slots(sync_engine.pool):
+        # Objects stay readable after commit without a blocking refresh on the event loop
+        db = ThreadedSession(sync_factory(expire_on_commit=False))
+        try:
+            yield db
+        finally:
+            await db.close()
+
+async def get_db():
+    async with _open_session(SessionLocal, AsyncSessionLocal, engine) as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+class Replica:
+    """A read replica with its own engines and a connect-failure cooldown"""
+    
+    def __init__(self, url: str, settings: Dict[str, Any]):
+        self.url = url
+        self.engine = build_engine(url, settings)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.async_engine = None
+        self.async_session_factory = None
+        if DB_ASYNC:
+            self.async_engine = build_engine(to_async_url(url), settings, is_async=True)
+            self.async_session_factory = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+        self.unavailable_until = 0.0
+        
+        event.listen(self.engine, "handle_error", self._on_error)
+        if self.async_engine is not None:
+            event.listen(self.async_engine.sync_engine, "handle_error", self._on_error)
+    
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unavailable_until
+    
+    def mark_unhealthy(self) -> None:
+        self.unavailable_until = time.monotonic() + REPLICA_RETRY_SECONDS
+    
+    def _on_error(self, context) -> None:
+        if context.is_disconnect:
+            self.mark_unhealthy()
+
+class ReplicaRouter:
+    """
+    Picks the replica for a read, round-robin over the healthy ones.
+
+    Principals that committed a write within the sticky window read from the
+    primary so they see their own changes. Write times are process-local, so
+    with several workers a request may land on a worker that has not seen
+    the write; keep REPLICA_STICKY_SECONDS above the typical replication lag.
+    """
+    
+    def __init__(self, replicas: List[Replica], sticky_seconds: float = REPLICA_STICKY_SECONDS, max_tracked: int = 100000):
+        self.replicas = replicas
+        self.sticky_seconds = sticky_seconds
+        self.max_tracked = max_tracked
+        self._turn = itertools.count()
+        self._last_write: Dict[Any, float] = {}
+        self._lock = threading.Lock()
+    
+    def record_write(self, principal_id) -> None:
+        if not self.replicas:
+            return
+        
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[principal_id] = now
+            if len(self._last_write) > self.max_tracked:
+                cutoff = now - self.sticky_seconds
+                self._last_write = {key: at for key, at in self._last_write.items() if at >= cutoff}
+    
+    def choose(self, principal_id) -> Optional[Replica]:
+        """Replica to serve a read for `principal_id`, or None to use the primary"""
+        if not self.replicas or principal_id is None:
+            return None
+        
+        with self._lock:
+            last_write = self._last_write.get(principal_id)
+        if last_write is not None and time.monotonic() - last_write < self.sticky_seconds:
+            return None
+        
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+replica_router = ReplicaRouter([Replica(url, engine_settings) for url in DATABASE_REPLICA_URLS])
+
+# auth.get_current_user tags request sessions with session.info["principal_id"]
+@event.listens_for(Session, "after_flush")
+def _note_pending_write(session, flush_context):
+    session.info["has_writes"] = True
+
+@event.listens_for(Session, "after_commit")
+def _record_principal_write(session):
+    if session.info.pop("has_writes", False) and session.info.get("principal_id") is not None:
+        replica_router.record_write(session.info["principal_id"])
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_write(session):
+    session.info.pop("has_writes", None)
+
+async def get_read_db(request: Request):
+    """
+    Session for read-only endpoints.
+
+    Serves from a replica when one is configured and healthy and the caller
+    has not written recently, otherwise from the primary. Declare it after
+    the current-user dependency so the principal is known when routing.
+    """
+    replica = replica_router.choose(getattr(request.state, "principal_id", None))
+    if replica is not None:
+        async with _open_session(replica.session_factory, replica.async_session_factory, replica.engine) as db:
+            try:
+                await db.connection()
+            except (DBAPIError, OSError):
+                replica.mark_unhealthy()
+            else:
+                yield db
+                return
+    
+    async with _open_session(SessionLocal, AsyncSessionLocal, engine) as db:
+        yield db
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+Link newly ingested candidates to the same person in earlier batches.
+
+Each upload is matched with a handful of index-backed IN queries rather than
+pairwise comparisons: one per identity key (email, LinkedIn slug, phone),
+chunked, plus two for the name blocks. A match on any identity key is
+enough; a match on the name key alone also needs the two candidates to share
+an employer, either with the same start year or twice. Duplicates point at
+the root of their cluster, the earliest candidate, so following
+duplicate_of_id never takes more than one step.
+"""
+
+import os
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+
+from . import models
+
+DEDUP_LOOKUP_CHUNK = int(os.getenv("DEDUP_LOOKUP_CHUNK", "500"))
+
+# Strongest evidence first; the first key that matches decides the link
+IDENTITY_KEYS = (
+    ("email", "email_key"),
+    ("linkedin", "linkedin_key"),
+    ("phone", "phone_key"),
+)
+
+def _chunks(values: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def _root(candidate_id: int, duplicate_of_id: Optional[int]) -> int:
+    return duplicate_of_id or candidate_id
+
+def _remember(roots: Dict[str, int], key: str, root: int) -> None:
+    # Several clusters can share a key when they were ingested before it was known; prefer the oldest
+    if key not in roots or root < roots[key]:
+        roots[key] = root
+
+def _existing_identity_roots(db, batch_id: int, candidates: Sequence[models.Candidate]) -> Dict[str, Dict[str, int]]:
+    Candidate = models.Candidate
+    roots = {}
+    for match, attribute in IDENTITY_KEYS:
+        column = getattr(Candidate, attribute)
+        keys = sorted({getattr(candidate, attribute) for candidate in candidates} - {None})
+        found = roots[match] = {}
+        for chunk in _chunks(keys, DEDUP_LOOKUP_CHUNK):
+            rows = db.execute(
+                select(Candidate.id, Candidate.duplicate_of_id, column)
+                .where(column.in_(chunk), Candidate.batch_id != batch_id)
+            )
+            for candidate_id, duplicate_of_id, key in rows:
+                _remember(found, key, _root(candidate_id, duplicate_of_id))
+    return roots
+
+def _employers(candidate: models.Candidate) -> Set[Tuple[str, Optional[int]]]:
+    return {
+        (employment.company_name.strip().lower(), employment.start_year)
+        for employment in candidate.employment_history
+        if employment.company_name
+    }
+
+def _same_person_by_employers(ours: Set[Tuple[str, Optional[int]]], theirs: Set[Tuple[str, Optional[int]]]) -> bool:
+    if any(start_year is not None and (company, start_year) in theirs for company, start_year in ours):
+        return True
+    return len({company for company, _ in ours} & {company for company, _ in theirs}) >= 2
+
+def _existing_name_blocks(db, batch_id: int, candidates: Sequence[models.Candidate]) -> Dict[str, Dict[int, Set[Tuple[str, Optional[int]]]]]:
+    """Employers of the earlier candidates sharing a name key with one of the new candidates"""
+    Candidate, Employment = models.Candidate, models.Employment
+    name_keys = sorted({candidate.name_key for candidate in candidates if candidate.name_key and candidate.employment_history})
+    
+    # Two lookups driven by name_key and then candidate_id; joining in SQL lets the planner start
+    # from the company name instead, which reads every employee of every company in the upload
+    members = {}
+    for name_chunk in _chunks(name_keys, DEDUP_LOOKUP_CHUNK):
+        rows = db.execute(
+            select(Candidate.id, Candidate.duplicate_of_id, Candidate.name_key)
+            .where(Candidate.name_key.in_(name_chunk), Candidate.batch_id != batch_id)
+        )
+        for candidate_id, duplicate_of_id, name_key in rows:
+            members[candidate_id] = (name_key, _root(candidate_id, duplicate_of_id))
+    
+    blocks = {}
+    for id_chunk in _chunks(sorted(members), DEDUP_LOOKUP_CHUNK):
+        rows = db.execute(
+            select(Employment.candidate_id, Employment.company_name, Employment.start_year)
+            .where(Employment.candidate_id.in_(id_chunk))
+        )
+        for candidate_id, company_name, start_year in rows:
+            if company_name:
+                name_key, root = members[candidate_id]
+                blocks.setdefault(name_key, {}).setdefault(root, set()).add((company_name.strip().lower(), start_year))
+    return blocks
+
+def new_upload_keys() -> Dict[str, Dict[str, int]]:
+    """Identity keys seen so far in an upload that is linked in several chunks"""
+    return {match: {} for match, _ in IDENTITY_KEYS}
+
+def link_duplicates(
+    db,
+    batch_id: int,
+    candidates: Sequence[models.Candidate],
+    uploaded: Optional[Dict[str, Dict[str, int]]] = None
+) -> int:
+    """
+    Set duplicate_of_id / duplicate_match on flushed candidates of a new batch. Returns how many were linked.
+
+    Takes a synchronous Session, so async callers go through run_sync.
+    Candidates repeated within the upload are linked to their first occurrence; when the upload is
+    linked in chunks, pass the same new_upload_keys() with every chunk so this holds across chunks.
+    """
+    existing = _existing_identity_roots(db, batch_id, candidates)
+    name_blocks = _existing_name_blocks(db, batch_id, candidates)
+    if uploaded is None:
+        uploaded = new_upload_keys()
+    
+    linked = 0
+    for candidate in candidates:
+        root, match = None, None
+        for key_match, attribute in IDENTITY_KEYS:
+            key = getattr(candidate, attribute)
+            if key is None:
+                continue
+            root = existing[key_match].get(key) or uploaded[key_match].get(key)
+            if root is not None:
+                match = key_match
+                break
+        
+        if root is None and candidate.name_key in name_blocks:
+            ours = _employers(candidate)
+            matches = [
+                block_root for block_root, theirs in name_blocks[candidate.name_key].items()
+                if _same_person_by_employers(ours, theirs)
+            ]
+            if matches:
+                root, match = min(matches), "name"
+        
+        if root is not None and root != candidate.id:
+            candidate.duplicate_of_id = root
+            candidate.duplicate_match = match
+            linked += 1
+        
+        own_root = root or candidate.id
+        for key_match, attribute in IDENTITY_KEYS:
+            key = getattr(candidate, attribute)
+            if key is not None:
+                _remember(uploaded[key_match], key, own_root)
+    return linked
\ No newline at end of file
@@ -0,0 +1,253 @@
+"""
+Index of companies and institutions from previously verified claims.
+
+Every claim marked VERIFIED is folded into a verified_entities row keyed by
+its normalized name, together with how often it was verified and which
+sources were used; a claim that stops being VERIFIED is taken out again.
+Entities left without verified claims stay in the table but are not
+suggested. Each process keeps an in-memory trigram index over those
+rows for fuzzy lookups and refreshes it incrementally from the table using
+an updated_at watermark, so entities verified by other workers show up
+within ENTITY_INDEX_REFRESH_SECONDS.
+"""
+
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, select, update
+from sqlalchemy.exc import IntegrityError
+
+from . import models
+from .utils.entity_names import normalize_entity_name, trigrams
+
+ENTITY_INDEX_REFRESH_SECONDS = float(os.getenv("ENTITY_INDEX_REFRESH_SECONDS", "2"))
+ENTITY_INDEX_LOOKBACK_SECONDS = float(os.getenv("ENTITY_INDEX_LOOKBACK_SECONDS", "30"))
+ENTITY_MIN_SIMILARITY = float(os.getenv("ENTITY_MIN_SIMILARITY", "0.3"))
+
+def _locked_entity(kind: str, normalized: str):
+    """
+    Select an entity locked until the end of the transaction: sources is read, changed and written back
+    whole, so two verifiers folding claims into it at once would otherwise lose one of the changes.
+    """
+    Entity = models.VerifiedEntity
+    return (
+        select(Entity)
+        .where(Entity.kind == kind, Entity.normalized_name == normalized)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+
+def record_verified_claim(db, kind: str, name: str, sources: Optional[Sequence[str]], verified_at: datetime) -> None:
+    """
+    Fold a verified claim into verified_entities inside the caller's transaction.
+
+    Takes a synchronous Session, so async callers go through run_sync.
+    """
+    normalized = normalize_entity_name(kind, name)
+    if not normalized:
+        return
+    
+    Entity = models.VerifiedEntity
+    entity = db.scalars(_locked_entity(kind, normalized)).first()
+    if entity is None:
+        try:
+            # Another verifier may insert the same entity concurrently; the savepoint keeps our transaction usable
+            with db.begin_nested():
+                entity = Entity(kind=kind, normalized_name=normalized, display_name=name.strip(), verified_count=0, sources={})
+                db.add(entity)
+        except IntegrityError:
+            entity = db.scalars(_locked_entity(kind, normalized)).one()
+    
+    source_counts = dict(entity.sources or {})
+    for source in sources or ():
+        source = source.strip()
+        if source:
+            source_counts[source] = source_counts.get(source, 0) + 1
+    
+    entity.sources = source_counts
+    entity.last_verified_at = verified_at
+    db.flush()
+    # Increment in SQL so concurrent verifications of the same entity are not lost
+    db.execute(
+        update(Entity)
+        .where(Entity.id == entity.id)
+        .values(verified_count=Entity.verified_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+def unrecord_verified_claim(db, kind: str, name: str, sources: Optional[Sequence[str]]) -> None:
+    """
+    Take a claim recorded by record_verified_claim out of verified_entities again, when it leaves
+    VERIFIED or is saved again with other sources, inside the caller's transaction.
+
+    Takes a synchronous Session, so async callers go through run_sync.
+    """
+    normalized = normalize_entity_name(kind, name)
+    if not normalized:
+        return
+    
+    Entity = models.VerifiedEntity
+    entity = db.scalars(_locked_entity(kind, normalized)).first()
+    if entity is None:
+        return
+    
+    source_counts = dict(entity.sources or {})
+    for source in sources or ():
+        source = source.strip()
+        if source in source_counts:
+            if source_counts[source] > 1:
+                source_counts[source] -= 1
+            else:
+                del source_counts[source]
+    
+    entity.sources = source_counts
+    db.flush()
+    # Decrement in SQL like record_verified_claim increments; updated_at moves so every index refreshes the entity
+    db.execute(
+        update(Entity)
+        .where(Entity.id == entity.id)
+        .values(verified_count=case((Entity.verified_count > 0, Entity.verified_count - 1), else_=0))
+        .execution_options(synchronize_session=False)
+    )
+
+class IndexedEntity:
+    __slots__ = ("id", "kind", "display_name", "verified_count", "last_verified_at", "sources")
+    
+    def __init__(self, entity_id, kind, display_name, verified_count, last_verified_at, sources):
+        self.id = entity_id
+        self.kind = kind
+        self.display_name = display_name
+        self.verified_count = verified_count or 0
+        self.last_verified_at = last_verified_at
+        # Most used sources first
+        self.sources = [source for source, _ in sorted((sources or {}).items(), key=lambda item: (-item[1], item[0]))]
+
+class EntityIndex:
+    """
+    Process-local trigram index over verified_entities.
+
+    Entities live in dense slots; each (kind, trigram) posting list holds slot
+    numbers and is turned into a numpy array the first time a search needs it,
+    so scoring a query is one bincount over its postings rather than a Python
+    loop over every entity sharing a gram.
+    """
+    
+    def __init__(self, refresh_seconds: float = ENTITY_INDEX_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._entities: List[IndexedEntity] = []
+        self._slots: Dict[int, int] = {}
+        self._gram_counts: List[int] = []
+        self._verified_counts: List[int] = []
+        self._postings: Dict[Tuple[str, str], List[int]] = {}
+        self._arrays: Dict[Tuple[str, str], object] = {}
+        self._gram_counts_array = None
+        self._verified_counts_array = None
+        self._watermark: Optional[datetime] = None
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+    
+    def mark_stale(self) -> None:
+        self._next_refresh = 0.0
+    
+    def refresh_due(self) -> bool:
+        return time.monotonic() >= self._next_refresh
+    
+    def refresh(self, db) -> int:
+        """Load entities changed since the last refresh from a synchronous Session. Returns how many were applied."""
+        Entity = models.VerifiedEntity
+        query = select(
+            Entity.id, Entity.kind, Entity.normalized_name, Entity.display_name,
+            Entity.verified_count, Entity.last_verified_at, Entity.sources
+        )
+        started_at = datetime.utcnow()
+        if self._watermark is not None:
+            # updated_at is stamped before commit and by other workers' clocks, so look back a little; re-applying is harmless
+            query = query.where(Entity.updated_at >= self._watermark - timedelta(seconds=ENTITY_INDEX_LOOKBACK_SECONDS))
+        rows = db.connection().execute(query).all()
+        
+        with self._lock:
+            for entity_id, kind, normalized_name, *values in rows:
+                entity = IndexedEntity(entity_id, kind, *values)
+                slot = self._slots.get(entity_id)
+                if slot is not None:
+                    # Names are the entity's key and never change, only counts and sources do
+                    self._entities[slot] = entity
+                    self._verified_counts[slot] = entity.verified_count
+                    self._verified_counts_array = None
+                    continue
+                
+                slot = self._slots[entity_id] = len(self._entities)
+                self._entities.append(entity)
+                self._verified_counts.append(entity.verified_count)
+                self._verified_counts_array = None
+                grams = trigrams(normalized_name)
+                self._gram_counts.append(len(grams))
+                for gram in grams:
+                    key = (kind, gram)
+                    postings = self._postings.get(key)
+                    if postings is None:
+                        self._postings[key] = [slot]
+                    else:
+                        postings.append(slot)
+                        self._arrays.pop(key, None)
+                self._gram_counts_array = None
+            self._watermark = started_at
+            self._next_refresh = time.monotonic() + self.refresh_seconds
+        return len(rows)
+    
+    def search(self, kind: str, name: str, limit: int = 5, min_similarity: float = ENTITY_MIN_SIMILARITY) -> List[Tuple[IndexedEntity, float]]:
+        """Closest entities by trigram (Jaccard) similarity, ties broken by how often they were verified"""
+        import numpy as np
+        
+        grams = trigrams(normalize_entity_name(kind, name))
+        if not grams:
+            return []
+        
+        with self._lock:
+            arrays = [self._posting_array(np, (kind, gram)) for gram in grams if (kind, gram) in self._postings]
+            if not arrays:
+                return []
+            if self._gram_counts_array is None:
+                self._gram_counts_array = np.array(self._gram_counts, dtype=np.int32)
+            if self._verified_counts_array is None:
+                self._verified_counts_array = np.array(self._verified_counts, dtype=np.int64)
+            
+            common = np.bincount(np.concatenate(arrays), minlength=len(self._entities))
+            # Jaccard >= min_similarity needs at least that share of the query's grams in common
+            slots = np.flatnonzero(common >= max(1, math.ceil(min_similarity * len(grams))))
+            shared = common[slots]
+            similarity = shared / (len(grams) + self._gram_counts_array[slots] - shared)
+            # Entities left without verified claims are dropped before the cut below, so they never crowd out others
+            keep = (similarity >= min_similarity) & (self._verified_counts_array[slots] > 0)
+            slots, similarity = slots[keep], similarity[keep]
+            if len(slots) > limit * 4:
+                top = np.argpartition(-similarity, limit * 4)[:limit * 4]
+                slots, similarity = slots[top], similarity[top]
+            
+            ranked = sorted(
+                (
+                    (float(score), self._entities[slot]) for slot, score in zip(slots.tolist(), similarity.tolist())
+                ),
+                key=lambda item: (-item[0], -item[1].verified_count, item[1].id)
+            )
+            return [(entity, score) for score, entity in ranked[:limit]]
+    
+    def _posting_array(self, np, key):
+        array = self._arrays.get(key)
+        if array is None:
+            array = self._arrays[key] = np.array(self._postings[key], dtype=np.int32)
+        return array
+    
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "entities": len(self._entities),
+                "grams": len(self._postings),
+                "watermark": self._watermark.isoformat() if self._watermark else None,
+            }
+
+entity_index = EntityIndex()
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""
+Where the time of an upload goes.
+
+upload_csv and upload_pdf time each stage of an upload with an IngestTimings:
+
+- read: reading the uploaded file back. Starlette has already received and
+  spooled the multipart body when the endpoint runs, so this is the spool,
+  not the network;
+- parse: the CSV or PDF parser;
+- persist_candidates: the blob store, the batch and candidate rows and
+  duplicate linking (app.dedup);
+- persist_histories: the employment and education rows;
+- commit.
+
+The timings, the size of the upload and the rows written per second over
+the whole upload are stored on its CandidateBatch after the commit, in a
+second short transaction, so the commit can time itself. ingest_stats()
+aggregates them by upload type and file size for
+GET /api/candidates/ingest-stats.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import case, func, select, update
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("read", "parse", "persist_candidates", "persist_histories", "commit")
+
+# Upper bound in bytes and label of each file size bucket, smallest first
+SIZE_BUCKETS = (
+    (10 * 1024, "<10KB"),
+    (100 * 1024, "10KB-100KB"),
+    (1024 * 1024, "100KB-1MB"),
+    (10 * 1024 * 1024, "1MB-10MB"),
+)
+LARGEST_SIZE_BUCKET = ">=10MB"
+SIZE_BUCKET_LABELS = [label for _, label in SIZE_BUCKETS] + [LARGEST_SIZE_BUCKET]
+
+STAGE_COLUMNS = {
+    "read": models.CandidateBatch.ingest_read_ms,
+    "parse": models.CandidateBatch.ingest_parse_ms,
+    "persist_candidates": models.CandidateBatch.ingest_candidates_ms,
+    "persist_histories": models.CandidateBatch.ingest_histories_ms,
+    "commit": models.CandidateBatch.ingest_commit_ms,
+}
+
+class IngestTimings:
+    """Milliseconds spent in each stage of one upload"""
+    
+    def __init__(self, size_bytes: Optional[int] = None):
+        self.size_bytes = size_bytes
+        self.rows = 0
+        self.ms: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+    
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the time spent in the block to stage `name`; a stage may be entered more than once"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ms[name] += (time.perf_counter() - started) * 1000
+    
+    @property
+    def total_ms(self) -> float:
+        return sum(self.ms.values())
+    
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        return round(self.rows / (self.total_ms / 1000), 1) if self.total_ms > 0 else None
+    
+    def values(self) -> Dict[str, Any]:
+        """Column values of the timings on CandidateBatch"""
+        values = {column.key: round(self.ms[stage], 3) for stage, column in STAGE_COLUMNS.items()}
+        values.update(
+            source_size_bytes=self.size_bytes,
+            ingest_total_ms=round(self.total_ms, 3),
+            ingest_rows_per_second=self.rows_per_second
+        )
+        return values
+
+async def record_ingest_timings(db, batch_id: int, timings: IngestTimings) -> None:
+    """
+    Store the timings of a committed upload; the upload has succeeded even if this fails.
+
+    A failure rolls the session back, which expires every object in it, so callers read what they
+    still need from the batch before calling this.
+    """
+    try:
+        await db.execute(update(models.CandidateBatch).where(models.CandidateBatch.id == batch_id).values(**timings.values()))
+        await db.commit()
+    except Exception:
+        logger.warning("Could not store the ingest timings of batch %s", batch_id, exc_info=True)
+        await db.rollback()
+
+def size_bucket(size_bytes):
+    """SQL expression for the label of the size bucket of `size_bytes`"""
+    return case(*((size_bytes < limit, label) for limit, label in SIZE_BUCKETS), else_=LARGEST_SIZE_BUCKET)
+
+def ingest_stats(db, since: datetime, slowest: int = 10) -> Dict[str, Any]:
+    """
+    Average stage timings per upload type and size bucket of the batches uploaded since `since`,
+    and the `slowest` uploads by rows per second.
+
+    Takes a synchronous Session, so async callers go through run_sync.
+    """
+    batch = models.CandidateBatch
+    timed = (batch.uploaded_at >= since, batch.ingest_total_ms.is_not(None))
+    bucket = size_bucket(batch.source_size_bytes).label("size_bucket")
+    rows = db.execute(
+        select(
+            batch.upload_type,
+            bucket,
+            func.count(batch.id),
+            func.coalesce(func.sum(batch.total_candidates), 0),
+            func.avg(batch.source_size_bytes),
+            *(func.avg(column) for column in STAGE_COLUMNS.values()),
+            func.avg(batch.ingest_total_ms),
+            func.max(batch.ingest_total_ms),
+            func.avg(batch.ingest_rows_per_second),
+        )
+        .where(*timed)
+        .group_by(batch.upload_type, bucket)
+    ).all()
+    
+    groups: List[Dict[str, Any]] = []
+    for upload_type, size_label, count, candidates, avg_size, *averages, avg_total, max_total, avg_rate in rows:
+        groups.append({
+            "upload_type": upload_type,
+            "size_bucket": size_label,
+            "batches": count,
+            "candidates": int(candidates),
+            "avg_size_bytes": round(float(avg_size or 0)),
+            "avg_ms": {stage: round(float(value or 0), 2) for stage, value in zip(STAGE_COLUMNS, averages)},
+            "avg_total_ms": round(float(avg_total or 0), 2),
+            "max_total_ms": round(float(max_total or 0), 2),
+            "avg_rows_per_second": round(float(avg_rate), 1) if avg_rate is not None else None,
+        })
+    groups.sort(key=lambda group: (group["upload_type"], SIZE_BUCKET_LABELS.index(group["size_bucket"])))
+    
+    outliers = db.execute(
+        select(batch)
+        .where(*timed, batch.ingest_rows_per_second.is_not(None))
+        .order_by(batch.ingest_rows_per_second, batch.id)
+        .limit(slowest)
+    ).scalars().all() if slowest else []
+    
+    return {
+        "since": since,
+        "groups": groups,
+        "slowest": [
+            {
+                "batch_id": outlier.id,
+                "upload_type": outlier.upload_type,
+                "source_filename": outlier.source_filename,
+                "source_size_bytes": outlier.source_size_bytes,
+                "total_candidates": outlier.total_candidates,
+                "uploaded_at": outlier.uploaded_at,
+                "ms": {stage: getattr(outlier, column.key) for stage, column in STAGE_COLUMNS.items()},
+                "total_ms": outlier.ingest_total_ms,
+                "rows_per_second": outlier.ingest_rows_per_second,
+            }
+            for outlier in outliers
+        ],
+    }
\ No newline at end of file
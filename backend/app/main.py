@@ -1,9 +1,8 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
+import os
 from .routers import auth, candidates, verification, reports
-
-Base.metadata.create_all(bind=engine)
+from . import metrics, sql_profiling
 
 app = FastAPI(
     title="CV Verification Service",
@@ -18,11 +17,31 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Added last so it wraps CORS too and times everything the client waits for
+app.add_middleware(metrics.MetricsMiddleware)
+# Opt-in: query counts, DB time and N+1 warnings per request, see app.sql_profiling
+if sql_profiling.SQL_PROFILE:
+    app.add_middleware(sql_profiling.SqlProfilingMiddleware)
+
+# Schema changes are applied with `alembic upgrade head` (or init_db.py) before deploying.
+# Single-process setups can opt into applying them at startup instead.
+if os.getenv("DB_AUTO_MIGRATE", "false").lower() in ("1", "true", "yes"):
+    @app.on_event("startup")
+    def apply_migrations():
+        from .migrations import upgrade_database
+        upgrade_database()
 
-app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
-app.include_router(candidates.router, prefix="/api/candidates", tags=["Candidates"])
-app.include_router(verification.router, prefix="/api/verification", tags=["Verification"])
-app.include_router(reports.router, prefix="/api/reports", tags=["Reports"])
+@app.on_event("startup")
+def check_verification_sources():
+    # A malformed VERIFICATION_SOURCES stops the app here rather than failing every upload
+    from .connectors import check_sources
+    check_sources()
+
+# Like app.include_router, without building every route twice (see app.routers)
+auth.router.include_in(app, prefix="/api/auth", tags=["Authentication"])
+candidates.router.include_in(app, prefix="/api/candidates", tags=["Candidates"])
+verification.router.include_in(app, prefix="/api/verification", tags=["Verification"])
+reports.router.include_in(app, prefix="/api/reports", tags=["Reports"])
 
 @app.get("/")
 def read_root():
@@ -34,4 +53,8 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
\ No newline at end of file
@@ -0,0 +1,271 @@
+"""
+Request and domain metrics in the Prometheus text exposition format.
+
+MetricsMiddleware records, per method and route template (never the raw
+path, so ids do not create new series), the number of requests by status,
+their latency, the response size and the requests in flight. The domain
+counters below are updated where the work happens. GET /metrics renders
+everything with render().
+
+Values are process-local like app.rate_limit: with several workers every
+worker reports its own series and Prometheus sums them per instance.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ContextDecorator
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Starlette appends the charset to text/* media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+PARSE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Requests that match no route share one series instead of one per probed path
+UNMATCHED_ROUTE = "<unmatched>"
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)) + "}"
+
+class _Value:
+    """A counter or gauge series"""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+class _Timer(ContextDecorator):
+    """Observes the seconds spent in a `with` block or a decorated function"""
+
+    def __init__(self, series: "_HistogramValue"):
+        self.series = series
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.series.observe(time.perf_counter() - self._started)
+        return False
+
+    def _recreate_cm(self):
+        # A decorated function gets a fresh timer per call, so concurrent calls do not share a start time
+        return _Timer(self.series)
+
+class _HistogramValue:
+    """One histogram series; counts are kept per bucket and made cumulative when rendered"""
+
+    __slots__ = ("upper_bounds", "counts", "sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        # Buckets are "less than or equal", which is what bisect_left finds
+        index = bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return self.counts[:], self.sum
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Optional["Registry"] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            # Unlabelled metrics are exported as zero before their first update
+            self.labels()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """The series of these label values, created on first use"""
+        series = self._series.get(values)
+        if series is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            values = tuple(str(value) for value in values)
+            with self._lock:
+                series = self._series.get(values)
+                if series is None:
+                    series = self._series[values] = self._new_series()
+        return series
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_series(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_label_text(self.labelnames, values)} {_format_value(series.value)}"
+            for values, series in list(self._series.items())
+        ]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS, registry: Optional["Registry"] = None):
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_series(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+    def _samples(self) -> List[str]:
+        names = self.labelnames + ("le",)
+        lines = []
+        for values, series in list(self._series.items()):
+            counts, total = series.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_label_text(names, values + (_format_value(bound),))} {cumulative}")
+            labels = _label_text(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+REGISTRY = Registry()
+
+def render() -> str:
+    return REGISTRY.render()
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by method, route template and status code.", ("method", "route", "status"))
+HTTP_REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Time until the response was sent, by method and route template.", ("method", "route"))
+HTTP_RESPONSE_BYTES = Histogram("http_response_size_bytes", "Response body size by method and route template.", ("method", "route"), buckets=SIZE_BUCKETS)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+
+CANDIDATES_INGESTED = Counter("candidates_ingested_total", "Candidates stored from uploads, by upload type.", ("upload_type",))
+CLAIMS_VERIFIED = Counter("claims_verified_total", "Claim reviews saved by verifiers, by claim kind and status.", ("kind", "status"))
+SOURCE_RESULTS = Counter("source_check_results_total", "External source lookups, by source and result status.", ("source", "status"))
+REPORTS_GENERATED = Counter("reports_generated_total", "Verification reports generated.")
+PARSE_SECONDS = Histogram("parse_duration_seconds", "Time spent parsing an upload, by parser.", ("parser",), buckets=PARSE_BUCKETS)
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware; BaseHTTPMiddleware would add a task and a stream
+    per request, which costs far more than the bookkeeping itself.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        response = [500, 0]
+
+        async def send_with_metrics(message):
+            if message["type"] == "http.response.start":
+                response[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                response[1] += len(message.get("body", b""))
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels()
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            in_flight.dec()
+            # The router stores the matched route in the scope, which is shared with this middleware
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route is not None else UNMATCHED_ROUTE)
+            HTTP_REQUEST_SECONDS.labels(*labels).observe(time.perf_counter() - started)
+            HTTP_RESPONSE_BYTES.labels(*labels).observe(response[1])
+            HTTP_REQUESTS.labels(*labels, str(response[0])).inc()
\ No newline at end of file
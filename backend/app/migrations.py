@@ -0,0 +1,15 @@
+import os
+
+from alembic import command
+from alembic.config import Config
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def alembic_config() -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    return config
+
+def upgrade_database(revision: str = "head") -> None:
+    """Apply Alembic migrations up to `revision`"""
+    command.upgrade(alembic_config(), revision)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text, Boolean, JSON
+from sqlalchemy import BigInteger, Column, Integer, Float, String, DateTime, ForeignKey, Enum, Text, Boolean, JSON, Index, UniqueConstraint, func, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -47,9 +47,38 @@ class CandidateBatch(Base):
     completed_at = Column(DateTime, nullable=True)
     total_candidates = Column(Integer, default=0)
     verified_count = Column(Integer, default=0)
+    # Original upload, kept in the blob store (app.storage) under its SHA-256 digest
+    source_file_hash = Column(String(64), nullable=True)
+    source_filename = Column(String, nullable=True)
+    timeline_checked_at = Column(DateTime, nullable=True)
+    sources_checked_at = Column(DateTime, nullable=True)
+    # Candidates of this batch already known from earlier batches, see app.dedup
+    duplicate_count = Column(Integer, default=0)
+    # Scheduling state, see app.scheduler
+    served_effort = Column(Integer, default=0)
+    scheduling_weight = Column(Float, default=1.0)
+    sla_deadline = Column(DateTime, nullable=True)
+    # Size of the upload and milliseconds per ingest stage, see app.ingest_timing
+    source_size_bytes = Column(Integer, nullable=True)
+    ingest_read_ms = Column(Float, nullable=True)
+    ingest_parse_ms = Column(Float, nullable=True)
+    ingest_candidates_ms = Column(Float, nullable=True)
+    ingest_histories_ms = Column(Float, nullable=True)
+    ingest_commit_ms = Column(Float, nullable=True)
+    ingest_total_ms = Column(Float, nullable=True)
+    ingest_rows_per_second = Column(Float, nullable=True)
     
     recruiter = relationship("User", back_populates="uploaded_batches", foreign_keys=[recruiter_id])
     candidates = relationship("Candidate", back_populates="batch", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("ix_candidate_batches_recruiter_id_uploaded_at", "recruiter_id", "uploaded_at"),
+        # Partial, so finding the batches still in the verifier queue never walks finished ones
+        Index(
+            "ix_candidate_batches_active", "id",
+            sqlite_where=text("status != 'COMPLETED'"), postgresql_where=text("status != 'COMPLETED'")
+        ),
+    )
 
 class Candidate(Base):
     __tablename__ = "candidates"
@@ -60,10 +89,22 @@ class Candidate(Base):
     email = Column(String, nullable=True)
     phone = Column(String, nullable=True)
     linkedin_url = Column(String, nullable=True)
-    raw_cv_data = Column(JSON, nullable=True)
+    # Raw parser output, kept in the blob store (app.storage) under its SHA-256 digest
+    raw_cv_hash = Column(String(64), nullable=True)
     verifier_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     verification_status = Column(Enum(VerificationStatus), default=VerificationStatus.PENDING)
     verified_at = Column(DateTime, nullable=True)
+    # Sum of the claim scores from app.timeline_checks, capped at 100
+    priority_score = Column(Integer, default=0)
+    # Expected verification minutes from app.scheduler.estimate_effort
+    effort_estimate = Column(Integer, default=0)
+    # Identity keys from app.utils.identity_keys; the first candidate seen with a matching key is the original
+    email_key = Column(String, nullable=True)
+    phone_key = Column(String(16), nullable=True)
+    linkedin_key = Column(String, nullable=True)
+    name_key = Column(String, nullable=True)
+    duplicate_of_id = Column(Integer, ForeignKey("candidates.id", name="fk_candidates_duplicate_of_id"), nullable=True)
+    duplicate_match = Column(String(20), nullable=True)  # email, linkedin, phone or name
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -71,6 +112,18 @@ class Candidate(Base):
     verifier = relationship("User", back_populates="verified_candidates", foreign_keys=[verifier_id])
     employment_history = relationship("Employment", back_populates="candidate", cascade="all, delete-orphan")
     education_history = relationship("Education", back_populates="candidate", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("ix_candidates_batch_id_updated_at", "batch_id", "updated_at"),
+        Index("ix_candidates_verification_status_effort", "verification_status", "effort_estimate", "id"),
+        Index("ix_candidates_verifier_id_verification_status", "verifier_id", "verification_status", "created_at"),
+        Index("ix_candidates_batch_id_verification_status_effort", "batch_id", "verification_status", "effort_estimate"),
+        Index("ix_candidates_email_key", "email_key"),
+        Index("ix_candidates_phone_key", "phone_key"),
+        Index("ix_candidates_linkedin_key", "linkedin_key"),
+        Index("ix_candidates_name_key", "name_key"),
+        Index("ix_candidates_duplicate_of_id", "duplicate_of_id"),
+    )
 
 class Employment(Base):
     __tablename__ = "employment"
@@ -81,15 +134,30 @@ class Employment(Base):
     position = Column(String, nullable=False)
     start_date = Column(String, nullable=True)
     end_date = Column(String, nullable=True)
+    # Normalized from start_date / end_date by app.utils.date_normalizer
+    start_year = Column(Integer, nullable=True)
+    start_month = Column(Integer, nullable=True)
+    end_year = Column(Integer, nullable=True)
+    end_month = Column(Integer, nullable=True)
     is_current = Column(Boolean, default=False)
     description = Column(Text, nullable=True)
     claim_status = Column(Enum(ClaimStatus), default=ClaimStatus.PENDING)
     verification_note = Column(Text, nullable=True)
     verification_sources = Column(JSON, nullable=True)
     verified_at = Column(DateTime, nullable=True)
+    # Findings from app.timeline_checks, filled in after ingest
+    machine_notes = Column(Text, nullable=True)
+    priority_score = Column(Integer, default=0)
+    # Latest result per external source, see app.connectors
+    source_results = Column(JSON, nullable=True)
     order = Column(Integer, default=0)
     
     candidate = relationship("Candidate", back_populates="employment_history")
+    
+    __table_args__ = (
+        Index("ix_employment_candidate_id_claim_status", "candidate_id", "claim_status"),
+        Index("ix_employment_company_name_years", func.lower(company_name), start_year, end_year),
+    )
 
 class Education(Base):
     __tablename__ = "education"
@@ -101,14 +169,29 @@ class Education(Base):
     field_of_study = Column(String, nullable=True)
     start_date = Column(String, nullable=True)
     end_date = Column(String, nullable=True)
+    # Normalized from start_date / end_date by app.utils.date_normalizer
+    start_year = Column(Integer, nullable=True)
+    start_month = Column(Integer, nullable=True)
+    end_year = Column(Integer, nullable=True)
+    end_month = Column(Integer, nullable=True)
     is_current = Column(Boolean, default=False)
     claim_status = Column(Enum(ClaimStatus), default=ClaimStatus.PENDING)
     verification_note = Column(Text, nullable=True)
     verification_sources = Column(JSON, nullable=True)
     verified_at = Column(DateTime, nullable=True)
+    # Findings from app.timeline_checks, filled in after ingest
+    machine_notes = Column(Text, nullable=True)
+    priority_score = Column(Integer, default=0)
+    # Latest result per external source, see app.connectors
+    source_results = Column(JSON, nullable=True)
     order = Column(Integer, default=0)
     
     candidate = relationship("Candidate", back_populates="education_history")
+    
+    __table_args__ = (
+        Index("ix_education_candidate_id_claim_status", "candidate_id", "claim_status"),
+        Index("ix_education_institution_years", func.lower(institution), start_year, end_year),
+    )
 
 class Report(Base):
     __tablename__ = "reports"
@@ -116,8 +199,69 @@ class Report(Base):
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
     html_content = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=True)
     generated_at = Column(DateTime, default=datetime.utcnow)
     generated_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     
     candidate = relationship("Candidate")
-    generator = relationship("User")
\ No newline at end of file
+    generator = relationship("User")
+    
+    __table_args__ = (
+        Index("ix_reports_candidate_id_generated_at", "candidate_id", "generated_at"),
+    )
+
+class VerifiedEntity(Base):
+    """A company or institution that verifiers have confirmed at least once, see app.entity_index"""
+    __tablename__ = "verified_entities"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(20), nullable=False)  # company or institution
+    normalized_name = Column(String, nullable=False)
+    display_name = Column(String, nullable=False)
+    verified_count = Column(Integer, default=0, nullable=False)
+    sources = Column(JSON, nullable=True)  # source -> times it was used to verify
+    last_verified_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint("kind", "normalized_name", name="uq_verified_entities_kind_normalized_name"),
+        Index("ix_verified_entities_updated_at", "updated_at"),
+    )
+
+class UploadSession(Base):
+    """A resumable upload in progress, see app.uploads"""
+    __tablename__ = "upload_sessions"
+    
+    id = Column(String(32), primary_key=True)  # uuid4 hex, also names the spool file
+    recruiter_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    batch_name = Column(String, nullable=False)
+    upload_type = Column(String, nullable=False)
+    filename = Column(String, nullable=True)
+    total_size = Column(BigInteger, nullable=False)
+    received_bytes = Column(BigInteger, default=0, nullable=False)
+    sha256 = Column(String(64), nullable=True)  # of the whole file, checked on finalize when given
+    status = Column(String(20), default="open", nullable=False)  # open, finalizing or completed
+    finalize_started_at = Column(DateTime, nullable=True)  # while finalizing; also identifies the finalize
+    batch_id = Column(Integer, ForeignKey("candidate_batches.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_upload_sessions_expires_at", "expires_at"),
+    )
+
+class ColumnMappingProfile(Base):
+    """How a recruiter's files with one header row map to candidate fields, see app.column_profiles"""
+    __tablename__ = "column_mapping_profiles"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    recruiter_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    header_fingerprint = Column(String(64), nullable=False)  # app.utils.column_mapping.header_fingerprint
+    headers = Column(JSON, nullable=False)  # the normalized column names, in order
+    mapping = Column(JSON, nullable=False)  # field -> column name, as analyze_headers() returns it
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint("recruiter_id", "header_fingerprint", name="uq_column_mapping_profiles_recruiter_id_fingerprint"),
+    )
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""
+Process-local cache of authenticated principals.
+
+Maps a bearer token that has already passed signature verification to a
+snapshot of the user it resolved to, so repeat requests with the same token
+skip both the JWT decode and the users lookup. Entries live until the token
+expires or the TTL runs out, whichever comes first, and are dropped as soon
+as a change of the user's role, active flag or email through the ORM is
+committed. Dropping them at flush would let a request that reads the user
+before the commit cache the old values again. Other workers only see such
+changes once their own TTL expires, so keep the TTL short.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from . import models
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+# Attributes whose change must take effect on the next request
+INVALIDATING_ATTRIBUTES = ("is_active", "role", "email")
+
+class CachedPrincipal:
+    __slots__ = ("subject", "token_expires_at", "cached_until", "user_values")
+
+    def __init__(self, subject: str, token_expires_at: Optional[float], cached_until: float, user_values: Dict[str, Any]):
+        self.subject = subject
+        self.token_expires_at = token_expires_at
+        self.cached_until = cached_until
+        self.user_values = user_values
+
+class PrincipalCache:
+    """Thread-safe TTL + LRU map of token -> CachedPrincipal, indexed by subject for invalidation"""
+
+    def __init__(self, max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES, ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedPrincipal]" = OrderedDict()
+        self._tokens_by_subject: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, token: str) -> Optional[CachedPrincipal]:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if time.monotonic() >= entry.cached_until or (
+                entry.token_expires_at is not None and time.time() >= entry.token_expires_at
+            ):
+                self._remove(token)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry
+
+    def put(self, token: str, subject: str, token_expires_at: Optional[float], user: models.User) -> None:
+        if not self.enabled:
+            return
+
+        user_values = {
+            column.key: getattr(user, column.key)
+            for column in inspect(models.User).column_attrs
+        }
+        entry = CachedPrincipal(subject, token_expires_at, time.monotonic() + self.ttl_seconds, user_values)
+
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = entry
+            self._tokens_by_subject.setdefault(subject, set()).add(token)
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_subject(self, subject: str) -> None:
+        with self._lock:
+            for token in list(self._tokens_by_subject.get(subject, ())):
+                self._remove(token)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_subject.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._tokens_by_subject.get(entry.subject)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_subject[entry.subject]
+
+principal_cache = PrincipalCache()
+
+def _note_changed_subjects(target, subjects) -> None:
+    session = inspect(target).session
+    if session is None:
+        principal_cache.invalidate_subject(target.email)
+        return
+    session.info.setdefault("changed_principals", set()).update(subject for subject in subjects if subject)
+
+@event.listens_for(models.User, "after_update")
+def _note_changed_user(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[name].history.has_changes() for name in INVALIDATING_ATTRIBUTES):
+        return
+
+    email_history = state.attrs.email.history
+    _note_changed_subjects(target, set(email_history.deleted or ()) | {target.email})
+
+@event.listens_for(models.User, "after_delete")
+def _note_deleted_user(mapper, connection, target):
+    _note_changed_subjects(target, {target.email})
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_principals(session):
+    for subject in session.info.pop("changed_principals", ()):
+        principal_cache.invalidate_subject(subject)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_principals(session):
+    session.info.pop("changed_principals", None)
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+In-memory token-bucket rate limiting.
+
+Buckets are process-local, so with several workers the effective limit is
+the configured rate times the worker count.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List
+
+class TokenBucketLimiter:
+    """Per-key token buckets refilled at `rate` tokens per second up to `burst`"""
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0 and self.burst > 0
+
+    def acquire(self, key: str) -> float:
+        """Take one token for `key`. Returns 0 when allowed, otherwise the seconds until a token is available."""
+        if not self.enabled:
+            return 0.0
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now)
+                bucket = self._buckets[key] = [self.burst, now]
+
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return 0.0
+
+            bucket[0] = tokens
+            return (1 - tokens) / self.rate
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def _prune(self, now: float) -> None:
+        # Buckets that have refilled completely carry no state worth keeping
+        full = [
+            key for key, (tokens, last) in self._buckets.items()
+            if tokens + (now - last) * self.rate >= self.burst
+        ]
+        for key in full:
+            del self._buckets[key]
+
+login_ip_limiter = TokenBucketLimiter(
+    rate=float(os.getenv("LOGIN_RATE_PER_IP", "10")),
+    burst=float(os.getenv("LOGIN_BURST_PER_IP", "200"))
+)
+login_account_limiter = TokenBucketLimiter(
+    rate=float(os.getenv("LOGIN_RATE_PER_ACCOUNT", "0.2")),
+    burst=float(os.getenv("LOGIN_BURST_PER_ACCOUNT", "5"))
+)
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""
+The API routers.
+
+Each module declares its path operations on a DeferredRouter, which main.py
+includes into the app with include_in(). FastAPI's include_router() builds
+every route of the included router a second time, with its prefix, tags and
+the app's dependency overrides. Building a route, with its dependencies and
+response model, is most of what importing app.main costs. A DeferredRouter
+only records its path operations, so each route is built once, on the app.
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi import APIRouter, FastAPI
+
+class DeferredRouter(APIRouter):
+    """An APIRouter that records its path operations until include_in() builds them on an app"""
+    
+    def __init__(self) -> None:
+        super().__init__()
+        self.operations: List[Tuple[str, Callable[..., Any], Dict[str, Any]]] = []
+    
+    def add_api_route(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        self.operations.append((path, endpoint, kwargs))
+    
+    def include_in(self, app: FastAPI, prefix: str, tags: List[str]) -> None:
+        """What app.include_router(self, prefix=prefix, tags=tags) does for a router without settings of its own"""
+        for path, endpoint, kwargs in self.operations:
+            app.router.add_api_route(prefix + path, endpoint, **{**kwargs, "tags": tags + (kwargs.get("tags") or [])})
\ No newline at end of file
@@ -1,41 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 from datetime import timedelta
+import math
 
-from ..database import get_db
+from ..database import get_db, DbSession
 from .. import models, schemas, auth
+from ..principal_cache import principal_cache
+from ..rate_limit import login_ip_limiter, login_account_limiter
+from . import DeferredRouter
 
-router = APIRouter()
+router = DeferredRouter()
+
+def _enforce_login_rate_limits(request: Request, email: str):
+    client_ip = request.client.host if request.client else "unknown"
+    for limiter, key in ((login_ip_limiter, client_ip), (login_account_limiter, email.lower())):
+        retry_after = limiter.acquire(key)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please retry later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
 
 @router.post("/register", response_model=schemas.User, status_code=status.HTTP_201_CREATED)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
+async def register(user: schemas.UserCreate, db: DbSession = Depends(get_db)):
+    db_user = await auth.get_user_by_email(db, user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    hashed_password = auth.get_password_hash(user.password)
+    hashed_password = await auth.get_password_hash_async(user.password)
     db_user = models.User(
         email=user.email,
         hashed_password=hashed_password,
         full_name=user.full_name,
-        role=user.role,
+        role=models.UserRole(user.role.value),
         company=user.company
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @router.post("/login", response_model=schemas.Token)
-def login(
+async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
-    user = auth.authenticate_user(db, form_data.username, form_data.password)
+    _enforce_login_rate_limits(request, form_data.username)
+    user = await auth.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -50,11 +66,13 @@ def login(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/login/json", response_model=schemas.Token)
-def login_json(
+async def login_json(
+    request: Request,
     user_credentials: schemas.UserLogin,
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
-    user = auth.authenticate_user(db, user_credentials.email, user_credentials.password)
+    _enforce_login_rate_limits(request, user_credentials.email)
+    user = await auth.authenticate_user(db, user_credentials.email, user_credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -69,4 +87,10 @@ def login_json(
 
 @router.get("/me", response_model=schemas.User)
 async def read_users_me(current_user: models.User = Depends(auth.get_current_active_user)):
-    return current_user
\ No newline at end of file
+    return current_user
+
+@router.get("/cache-stats")
+def get_principal_cache_stats(
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    return principal_cache.stats()
\ No newline at end of file
@@ -1,202 +1,906 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from typing import List
+import logging
 
-from ..database import get_db
-from .. import models, schemas, auth
+from fastapi import BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, func, or_, select, update as sql_update
+from sqlalchemy.orm import selectinload
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
+
+from ..database import get_db, get_read_db, DbSession
+from .. import models, schemas, auth, uploads
 from ..utils.csv_parser import parse_csv_candidates
 from ..utils.pdf_parser import parse_pdf_cv
+from ..utils.xlsx_parser import iter_xlsx_candidates
+from ..utils.http_cache import strong_etag, weak_etag, etag_matches, not_modified
+from ..utils.date_normalizer import NormalizedDate, normalize_dates, parse_date
+from ..storage import BlobNotFound, get_blob_store, put_json
+from ..timeline_checks import run_timeline_checks, run_timeline_checks_in_background
+from ..connectors import run_source_checks, run_source_checks_in_background, sources_enabled
+from ..dedup import link_duplicates, new_upload_keys
+from ..scheduler import estimate_effort
+from ..utils.identity_keys import identity_keys
+from ..metrics import CANDIDATES_INGESTED
+from ..ingest_timing import IngestTimings, ingest_stats, record_ingest_timings
+from ..column_profiles import ColumnResolver, column_profile_cache, save_column_profile
+from ..utils.column_mapping import ColumnMapping
+from . import DeferredRouter
+
+logger = logging.getLogger(__name__)
+
+router = DeferredRouter()
+
+SOURCE_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "pdf": "application/pdf",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+def store_upload_blobs(
+    candidates_data: List[Dict[str, Any]], source: Optional[bytes], created: Optional[List[str]] = None
+) -> Tuple[List[str], Optional[str]]:
+    """Write each parsed CV and the original upload to the blob store, returning their digests"""
+    store = get_blob_store()
+    source_hash = store.put(source, created) if source is not None else None
+    return [put_json(candidate_data, store, created) for candidate_data in candidates_data], source_hash
+
+def discard_upload_blobs(created: List[str]) -> None:
+    """
+    Delete the blobs a failed upload wrote; blobs it found stored already belong to other rows.
 
-router = APIRouter()
+    Blobs are shared by content, so an identical upload in flight at the same time can find one of
+    these stored and lose it here, after which its downloads answer 404.
+    """
+    store = get_blob_store()
+    for digest in created:
+        try:
+            store.delete(digest)
+        except Exception:
+            logger.warning("Could not delete blob %s of a failed upload", digest, exc_info=True)
+
+def normalize_upload_dates(candidates_data: List[Dict[str, Any]]) -> Dict[Optional[str], NormalizedDate]:
+    """Normalize every employment and education date of an upload in one pass over its distinct values"""
+    return normalize_dates(
+        entry.get(key)
+        for candidate_data in candidates_data
+        for section in ("employment", "education")
+        for entry in candidate_data.get(section, [])
+        for key in ("start_date", "end_date")
+    )
+
+def _date_columns(entry: Dict[str, Any], dates: Dict[Optional[str], NormalizedDate]) -> Dict[str, Any]:
+    start = dates.get(entry.get("start_date")) or parse_date(entry.get("start_date"))
+    end = dates.get(entry.get("end_date")) or parse_date(entry.get("end_date"))
+    return {
+        "start_year": start.year,
+        "start_month": start.month,
+        "end_year": end.year,
+        "end_month": end.month,
+        "is_current": bool(entry.get("is_current")) or end.is_present,
+    }
+
+def build_history(
+    candidate_data: Dict[str, Any],
+    dates: Dict[Optional[str], NormalizedDate]
+) -> Tuple[List[models.Employment], List[models.Education]]:
+    employment = [
+        models.Employment(
+            company_name=emp["company"],
+            position=emp["position"],
+            start_date=emp.get("start_date"),
+            end_date=emp.get("end_date"),
+            description=emp.get("description"),
+            order=i,
+            **_date_columns(emp, dates)
+        )
+        for i, emp in enumerate(candidate_data.get("employment", []))
+    ]
+    education = [
+        models.Education(
+            institution=edu["institution"],
+            degree=edu.get("degree"),
+            field_of_study=edu.get("field"),
+            start_date=edu.get("start_date"),
+            end_date=edu.get("end_date"),
+            order=i,
+            **_date_columns(edu, dates)
+        )
+        for i, edu in enumerate(candidate_data.get("education", []))
+    ]
+    return employment, education
+
+def build_candidate(
+    batch_id: int,
+    candidate_data: Dict[str, Any],
+    raw_cv_hash: Optional[str] = None,
+    dates: Optional[Dict[Optional[str], NormalizedDate]] = None,
+    with_history: bool = True
+) -> models.Candidate:
+    """A new Candidate; without its history the collections are empty but loaded, so they can be filled after a flush"""
+    if dates is None:
+        dates = normalize_upload_dates([candidate_data])
+    keys = identity_keys(candidate_data)
+    employment, education = build_history(candidate_data, dates) if with_history else ([], [])
+    
+    return models.Candidate(
+        batch_id=batch_id,
+        full_name=candidate_data["full_name"],
+        email=candidate_data.get("email"),
+        phone=candidate_data.get("phone"),
+        linkedin_url=candidate_data.get("linkedin_url"),
+        raw_cv_hash=raw_cv_hash,
+        email_key=keys.email,
+        phone_key=keys.phone,
+        linkedin_key=keys.linkedin,
+        name_key=keys.name,
+        effort_estimate=estimate_effort(len(candidate_data.get("employment", [])), len(candidate_data.get("education", []))),
+        employment_history=employment,
+        education_history=education
+    )
+
+async def ingest_candidate_chunks(
+    db: DbSession,
+    recruiter: models.User,
+    batch_name: str,
+    upload_type: str,
+    chunks: AsyncIterator[List[Dict[str, Any]]],
+    source: Optional[bytes] = None,
+    source_filename: Optional[str] = None,
+    timings: Optional[IngestTimings] = None,
+    before_commit: Optional[Callable[[int], Awaitable[None]]] = None
+) -> models.CandidateBatch:
+    """
+    Persist a parsed upload as a new batch in a single transaction, one chunk of candidates at a time.
+
+    Every chunk is flushed and linked to its duplicates before the next one is taken, so a streaming
+    parser never has more than one chunk of rows and ORM objects in memory. The candidate rows are
+    flushed before their histories so the two are timed apart; `timings` carries the read and parse
+    times of the caller, which stores them with record_ingest_timings() after the commit.
+    `before_commit` is awaited with the batch id for writes that must be committed with the batch.
+    When the upload fails, the blobs it wrote are deleted again.
+    """
+    if timings is None:
+        timings = IngestTimings(len(source) if source is not None else None)
+    
+    created: List[str] = []
+    try:
+        with timings.stage("persist_candidates"):
+            _, source_hash = await run_in_threadpool(store_upload_blobs, [], source, created)
+            batch = models.CandidateBatch(
+                batch_name=batch_name,
+                recruiter_id=recruiter.id,
+                upload_type=upload_type,
+                source_file_hash=source_hash,
+                source_filename=source_filename
+            )
+            db.add(batch)
+            await db.flush()
+        
+        uploaded_keys = new_upload_keys()
+        total = duplicates = 0
+        async for candidates_data in chunks:
+            with timings.stage("persist_candidates"):
+                raw_cv_hashes, _ = await run_in_threadpool(store_upload_blobs, candidates_data, None, created)
+                dates = normalize_upload_dates(candidates_data)
+                candidates = [
+                    build_candidate(batch.id, candidate_data, raw_cv_hash, dates, with_history=False)
+                    for candidate_data, raw_cv_hash in zip(candidates_data, raw_cv_hashes)
+                ]
+                db.add_all(candidates)
+                await db.flush()
+            
+            with timings.stage("persist_histories"):
+                for candidate, candidate_data in zip(candidates, candidates_data):
+                    candidate.employment_history, candidate.education_history = build_history(candidate_data, dates)
+                    timings.rows += 1 + len(candidate.employment_history) + len(candidate.education_history)
+                await db.flush()
+            
+            with timings.stage("persist_candidates"):
+                duplicates += await db.run_sync(link_duplicates, batch.id, candidates, uploaded_keys)
+            total += len(candidates)
+        
+        batch.total_candidates = total
+        batch.duplicate_count = duplicates
+        if before_commit is not None:
+            await before_commit(batch.id)
+        with timings.stage("commit"):
+            await db.commit()
+    except uploads.FinalizeTakenOver:
+        # The finalize that took the upload over stores the same blobs
+        raise
+    except Exception:
+        await run_in_threadpool(discard_upload_blobs, created)
+        raise
+    
+    CANDIDATES_INGESTED.labels(upload_type).inc(total)
+    
+    return batch
+
+async def _single_chunk(candidates_data: List[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+    yield candidates_data
+
+async def _parsed_chunks(chunks: Iterator[List[Dict[str, Any]]], timings: IngestTimings) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Advance a streaming parser in the threadpool, timing it as parsing"""
+    while True:
+        with timings.stage("parse"):
+            candidates_data = await run_in_threadpool(next, chunks, None)
+        if candidates_data is None:
+            return
+        yield candidates_data
+
+async def ingest_candidates(
+    db: DbSession,
+    recruiter: models.User,
+    batch_name: str,
+    upload_type: str,
+    candidates_data: List[Dict[str, Any]],
+    source: Optional[bytes] = None,
+    source_filename: Optional[str] = None,
+    timings: Optional[IngestTimings] = None
+) -> models.CandidateBatch:
+    """Persist a parsed upload as a new batch in a single transaction"""
+    return await ingest_candidate_chunks(
+        db, recruiter, batch_name, upload_type, _single_chunk(candidates_data),
+        source=source, source_filename=source_filename, timings=timings
+    )
+
+async def ingest_upload(
+    db: DbSession,
+    background_tasks: BackgroundTasks,
+    recruiter: models.User,
+    batch_name: str,
+    upload_type: str,
+    contents: bytes,
+    filename: Optional[str],
+    timings: IngestTimings,
+    before_commit: Optional[Callable[[int], Awaitable[None]]] = None
+) -> Dict[str, Any]:
+    """Parse an uploaded CSV, XLSX or PDF, ingest it, schedule the checks of the new batch and return the upload response"""
+    # Spreadsheet columns are mapped by the recruiter's profile for their header row
+    columns = ColumnResolver(db, recruiter.id)
+    if upload_type == "xlsx":
+        # Parsed and persisted chunk by chunk, so a large workbook is never held in memory as a whole
+        chunks = _parsed_chunks(iter_xlsx_candidates(contents, columns=columns), timings)
+    else:
+        with timings.stage("parse"):
+            if upload_type == "pdf":
+                candidates_data = [await run_in_threadpool(parse_pdf_cv, contents)]
+            else:
+                candidates_data = await run_in_threadpool(parse_csv_candidates, contents, columns)
+        chunks = _single_chunk(candidates_data)
+    batch = await ingest_candidate_chunks(
+        db, recruiter, batch_name, upload_type, chunks, source=contents, source_filename=filename,
+        timings=timings, before_commit=before_commit
+    )
+    # Read before the writes that follow the commit: a failed one rolls back, which expires the batch
+    response = upload_response(batch)
+    await record_ingest_timings(db, response["batch_id"], timings)
+    await save_column_profile(db, columns)
+    background_tasks.add_task(run_timeline_checks_in_background, response["batch_id"])
+    if sources_enabled():
+        background_tasks.add_task(run_source_checks_in_background, response["batch_id"])
+    
+    return response
+
+def upload_response(batch: models.CandidateBatch) -> Dict[str, Any]:
+    if batch.upload_type == "pdf":
+        message = "Successfully uploaded PDF CV"
+    else:
+        message = f"Successfully uploaded {batch.total_candidates} candidates"
+    return {
+        "batch_id": batch.id,
+        "batch_name": batch.batch_name,
+        "total_candidates": batch.total_candidates,
+        "duplicate_count": batch.duplicate_count,
+        "message": message
+    }
 
 @router.post("/upload/csv", response_model=schemas.CSVUploadResponse)
 async def upload_csv(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     batch_name: str = Form(...),
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     if current_user.role != models.UserRole.RECRUITER:
         raise HTTPException(status_code=403, detail="Only recruiters can upload candidates")
     
-    contents = await file.read()
+    timings = IngestTimings()
+    with timings.stage("read"):
+        contents = await file.read()
+    timings.size_bytes = len(contents)
     
     try:
-        candidates_data = parse_csv_candidates(contents)
-        
-        batch = models.CandidateBatch(
-            batch_name=batch_name,
-            recruiter_id=current_user.id,
-            upload_type="csv",
-            total_candidates=len(candidates_data)
-        )
-        db.add(batch)
-        db.commit()
-        db.refresh(batch)
-        
-        for candidate_data in candidates_data:
-            candidate = models.Candidate(
-                batch_id=batch.id,
-                full_name=candidate_data["full_name"],
-                email=candidate_data.get("email"),
-                phone=candidate_data.get("phone"),
-                linkedin_url=candidate_data.get("linkedin_url"),
-                raw_cv_data=candidate_data
-            )
-            db.add(candidate)
-            db.flush()
-            
-            for i, emp in enumerate(candidate_data.get("employment", [])):
-                employment = models.Employment(
-                    candidate_id=candidate.id,
-                    company_name=emp["company"],
-                    position=emp["position"],
-                    start_date=emp.get("start_date"),
-                    end_date=emp.get("end_date"),
-                    is_current=emp.get("is_current", False),
-                    description=emp.get("description"),
-                    order=i
-                )
-                db.add(employment)
-            
-            for i, edu in enumerate(candidate_data.get("education", [])):
-                education = models.Education(
-                    candidate_id=candidate.id,
-                    institution=edu["institution"],
-                    degree=edu.get("degree"),
-                    field_of_study=edu.get("field"),
-                    start_date=edu.get("start_date"),
-                    end_date=edu.get("end_date"),
-                    order=i
-                )
-                db.add(education)
-        
-        db.commit()
-        
-        return {
-            "batch_id": batch.id,
-            "batch_name": batch.batch_name,
-            "total_candidates": batch.total_candidates,
-            "message": f"Successfully uploaded {batch.total_candidates} candidates"
-        }
+        return await ingest_upload(db, background_tasks, current_user, batch_name, "csv", contents, file.filename, timings)
     
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=f"Error processing CSV: {str(e)}")
 
 @router.post("/upload/pdf", response_model=schemas.CSVUploadResponse)
 async def upload_pdf(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    batch_name: str = Form(...),
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: DbSession = Depends(get_db)
+):
+    if current_user.role != models.UserRole.RECRUITER:
+        raise HTTPException(status_code=403, detail="Only recruiters can upload candidates")
+    
+    timings = IngestTimings()
+    with timings.stage("read"):
+        contents = await file.read()
+    timings.size_bytes = len(contents)
+    
+    try:
+        return await ingest_upload(db, background_tasks, current_user, batch_name, "pdf", contents, file.filename, timings)
+    
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"Error processing PDF: {str(e)}")
+
+@router.post("/upload/xlsx", response_model=schemas.CSVUploadResponse)
+async def upload_xlsx(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     batch_name: str = Form(...),
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
+    """Candidates from the first worksheet of an Excel export, with the same columns as a CSV upload"""
     if current_user.role != models.UserRole.RECRUITER:
         raise HTTPException(status_code=403, detail="Only recruiters can upload candidates")
     
-    contents = await file.read()
+    timings = IngestTimings()
+    with timings.stage("read"):
+        contents = await file.read()
+    timings.size_bytes = len(contents)
     
     try:
-        candidate_data = parse_pdf_cv(contents)
+        return await ingest_upload(db, background_tasks, current_user, batch_name, "xlsx", contents, file.filename, timings)
+    
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"Error processing XLSX: {str(e)}")
+
+def _upload_state(upload: models.UploadSession) -> Dict[str, Any]:
+    return {
+        "id": upload.id,
+        "batch_name": upload.batch_name,
+        "upload_type": upload.upload_type,
+        "filename": upload.filename,
+        "total_size": upload.total_size,
+        "received_bytes": upload.received_bytes,
+        "chunk_size": uploads.UPLOAD_CHUNK_SIZE,
+        "status": upload.status,
+        "batch_id": upload.batch_id,
+        "expires_at": upload.expires_at
+    }
+
+def _offset_conflict(received_bytes: int, detail: str) -> HTTPException:
+    return HTTPException(status_code=409, detail=detail, headers={"Upload-Offset": str(received_bytes)})
+
+async def _get_upload(db: DbSession, upload_id: str, current_user: models.User) -> models.UploadSession:
+    upload = await db.get(models.UploadSession, upload_id)
+    # Uploads of other recruiters are not revealed
+    if upload is None or upload.recruiter_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+@router.post("/uploads", response_model=schemas.UploadSession, status_code=201)
+async def create_upload(
+    upload_request: schemas.UploadSessionCreate,
+    background_tasks: BackgroundTasks,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: DbSession = Depends(get_db)
+):
+    """Open a resumable upload; send the file with PUT /uploads/{id}/chunks, then POST /uploads/{id}/finalize"""
+    if current_user.role != models.UserRole.RECRUITER:
+        raise HTTPException(status_code=403, detail="Only recruiters can upload candidates")
+    if upload_request.total_size > uploads.UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Uploads may be at most {uploads.UPLOAD_MAX_BYTES} bytes")
+    
+    upload = models.UploadSession(
+        id=uploads.new_upload_id(),
+        recruiter_id=current_user.id,
+        batch_name=upload_request.batch_name,
+        upload_type=upload_request.upload_type,
+        filename=upload_request.filename,
+        total_size=upload_request.total_size,
+        received_bytes=0,
+        sha256=upload_request.sha256.lower() if upload_request.sha256 else None,
+        status=uploads.OPEN,
+        expires_at=uploads.expires_at()
+    )
+    db.add(upload)
+    await db.commit()
+    background_tasks.add_task(uploads.purge_expired_uploads_in_background)
+    
+    return _upload_state(upload)
+
+@router.get("/uploads/{upload_id}", response_model=schemas.UploadSession)
+async def get_upload(
+    upload_id: str,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: DbSession = Depends(get_db)
+):
+    """State of an upload; received_bytes is the offset to continue from"""
+    return _upload_state(await _get_upload(db, upload_id, current_user))
+
+@router.put("/uploads/{upload_id}/chunks", response_model=schemas.UploadSession)
+async def put_upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    x_chunk_sha256: str = Header(...),
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: DbSession = Depends(get_db)
+):
+    """
+    Write the request body to the upload at `offset`. received_bytes only advances when the body matches
+    X-Chunk-SHA256; a chunk that was already received can be sent again and changes nothing.
+    """
+    upload = await _get_upload(db, upload_id, current_user)
+    if upload.status != uploads.OPEN:
+        raise HTTPException(status_code=409, detail=f"Upload is {upload.status}")
+    if offset > upload.received_bytes:
+        raise _offset_conflict(upload.received_bytes, f"Expected the chunk at offset {upload.received_bytes}")
+    # Do not hold the connection while the chunk streams in
+    await db.commit()
+    
+    # The chunk goes to a file of this request's own; the spool file only changes once it is accepted
+    path, chunk = uploads.spool_path(upload.id), uploads.chunk_path(upload.id)
+    try:
+        try:
+            size, digest = await uploads.receive_chunk(request.stream(), chunk)
+        except uploads.ChunkTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Chunk is empty")
+        if digest != x_chunk_sha256.strip().lower():
+            raise HTTPException(status_code=400, detail="Chunk does not match X-Chunk-SHA256, send it again")
+        if offset + size > upload.total_size:
+            raise HTTPException(status_code=400, detail=f"Chunk ends past the upload size of {upload.total_size} bytes")
         
-        batch = models.CandidateBatch(
-            batch_name=batch_name,
-            recruiter_id=current_user.id,
-            upload_type="pdf",
-            total_candidates=1
+        async with uploads.spool_lock(path):
+            # Other requests may have accepted chunks while this one streamed in
+            await db.refresh(upload)
+            received = upload.received_bytes
+            if upload.status != uploads.OPEN:
+                raise HTTPException(status_code=409, detail=f"Upload is {upload.status}")
+            if offset + size <= received:
+                if await run_in_threadpool(uploads.spool_digest, path, offset, size) != digest:
+                    raise HTTPException(status_code=409, detail="Chunk differs from the bytes already received at this offset")
+                await db.commit()
+                return _upload_state(upload)
+            if offset < received:
+                raise _offset_conflict(received, f"Chunk overlaps the end of the received bytes at {received}")
+            if offset > received:
+                raise _offset_conflict(received, f"Expected the chunk at offset {received}")
+            
+            await run_in_threadpool(uploads.write_chunk, path, chunk, offset)
+            Upload = models.UploadSession
+            # Guards against a worker whose spool lock is not shared, e.g. on another host without a shared volume
+            accepted = await db.execute(
+                sql_update(Upload)
+                .where(Upload.id == upload.id, Upload.status == uploads.OPEN, Upload.received_bytes == offset)
+                .values(received_bytes=offset + size, expires_at=uploads.expires_at())
+            )
+            if accepted.rowcount != 1:
+                await db.rollback()
+                raise HTTPException(status_code=409, detail="Upload changed while the chunk was sent, ask for its state and continue")
+            await db.commit()
+    finally:
+        await run_in_threadpool(uploads.remove_spool, chunk)
+    
+    return _upload_state(upload)
+
+@router.post("/uploads/{upload_id}/finalize", response_model=schemas.CSVUploadResponse)
+async def finalize_upload(
+    upload_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: DbSession = Depends(get_db)
+):
+    """Ingest a completely received upload like POST /upload/csv, /upload/xlsx or /upload/pdf; finalizing it again returns the same batch"""
+    upload = await _get_upload(db, upload_id, current_user)
+    if upload.status == uploads.COMPLETED:
+        return upload_response(await db.get(models.CandidateBatch, upload.batch_id))
+    now = datetime.utcnow()
+    stale_before = uploads.finalize_stale_before(now)
+    # A finalize whose worker died leaves the upload finalizing until another one takes it over
+    started_at = upload.finalize_started_at
+    stale = upload.status == uploads.FINALIZING and (started_at is None or started_at < stale_before)
+    if upload.status != uploads.OPEN and not stale:
+        raise HTTPException(status_code=409, detail=f"Upload is {upload.status}")
+    if upload.received_bytes != upload.total_size:
+        raise _offset_conflict(upload.received_bytes, f"Only {upload.received_bytes} of {upload.total_size} bytes were received")
+    
+    Upload = models.UploadSession
+    claimable = or_(
+        Upload.status == uploads.OPEN,
+        and_(
+            Upload.status == uploads.FINALIZING,
+            or_(Upload.finalize_started_at.is_(None), Upload.finalize_started_at < stale_before)
         )
-        db.add(batch)
-        db.commit()
-        db.refresh(batch)
-        
-        candidate = models.Candidate(
-            batch_id=batch.id,
-            full_name=candidate_data["full_name"],
-            email=candidate_data.get("email"),
-            phone=candidate_data.get("phone"),
-            linkedin_url=candidate_data.get("linkedin_url"),
-            raw_cv_data=candidate_data
+    )
+    claimed = await db.execute(
+        sql_update(Upload).where(Upload.id == upload.id, claimable).values(status=uploads.FINALIZING, finalize_started_at=now)
+    )
+    if claimed.rowcount != 1:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Upload is already being finalized")
+    await db.commit()
+    # Still this finalize's upload unless a later one took it over
+    ours = and_(Upload.id == upload_id, Upload.status == uploads.FINALIZING, Upload.finalize_started_at == now)
+    
+    async def complete_upload(batch_id: int) -> None:
+        completed = await db.execute(
+            sql_update(Upload).where(ours)
+            .values(status=uploads.COMPLETED, finalize_started_at=None, batch_id=batch_id, expires_at=uploads.expires_at())
         )
-        db.add(candidate)
-        db.flush()
-        
-        for i, emp in enumerate(candidate_data.get("employment", [])):
-            employment = models.Employment(
-                candidate_id=candidate.id,
-                company_name=emp["company"],
-                position=emp["position"],
-                start_date=emp.get("start_date"),
-                end_date=emp.get("end_date"),
-                is_current=emp.get("is_current", False),
-                description=emp.get("description"),
-                order=i
-            )
-            db.add(employment)
-        
-        for i, edu in enumerate(candidate_data.get("education", [])):
-            education = models.Education(
-                candidate_id=candidate.id,
-                institution=edu["institution"],
-                degree=edu.get("degree"),
-                field_of_study=edu.get("field"),
-                start_date=edu.get("start_date"),
-                end_date=edu.get("end_date"),
-                order=i
-            )
-            db.add(education)
-        
-        db.commit()
-        
-        return {
-            "batch_id": batch.id,
-            "batch_name": batch.batch_name,
-            "total_candidates": 1,
-            "message": "Successfully uploaded PDF CV"
-        }
+        if completed.rowcount != 1:
+            raise uploads.FinalizeTakenOver()
     
+    # A rollback expires the session object, so keep what the error handling needs
+    upload_type, path = upload.upload_type, uploads.spool_path(upload.id)
+    timings = IngestTimings(upload.total_size)
+    try:
+        with timings.stage("read"):
+            contents = await run_in_threadpool(uploads.read_spool, path, upload.total_size, upload.sha256)
+        response = await ingest_upload(
+            db, background_tasks, current_user, upload.batch_name, upload_type, contents, upload.filename, timings,
+            before_commit=complete_upload
+        )
+    
+    except uploads.FinalizeTakenOver:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Upload was taken over by another finalize after this one timed out")
     except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail=f"Error processing PDF: {str(e)}")
+        await db.rollback()
+        # Reopened so finalizing can be retried, unless the batch was already committed with the upload
+        # completed; an upload that never succeeds expires like an abandoned one
+        await db.execute(sql_update(Upload).where(ours).values(status=uploads.OPEN, finalize_started_at=None))
+        await db.commit()
+        raise HTTPException(status_code=400, detail=f"Error processing {upload_type.upper()}: {str(e)}")
+    
+    await run_in_threadpool(uploads.remove_upload_files, upload_id)
+    
+    return response
 
 @router.get("/batches", response_model=List[schemas.CandidateBatch])
-def get_batches(
+async def get_batches(
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_read_db)
 ):
+    query = select(models.CandidateBatch).order_by(models.CandidateBatch.uploaded_at.desc())
     if current_user.role == models.UserRole.RECRUITER:
-        batches = db.query(models.CandidateBatch).filter(
-            models.CandidateBatch.recruiter_id == current_user.id
-        ).order_by(models.CandidateBatch.uploaded_at.desc()).all()
-    else:
-        batches = db.query(models.CandidateBatch).order_by(
-            models.CandidateBatch.uploaded_at.desc()
-        ).all()
+        query = query.where(models.CandidateBatch.recruiter_id == current_user.id)
+    
+    result = await db.execute(query)
+    return result.scalars().all()
+
+@router.get("/column-profiles", response_model=List[schemas.ColumnMappingProfile])
+async def get_column_profiles(
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: DbSession = Depends(get_read_db)
+):
+    """The recruiter's column mapping profiles, one per header row uploaded, most recently changed first"""
+    if current_user.role != models.UserRole.RECRUITER:
+        raise HTTPException(status_code=403, detail="Only recruiters have column mapping profiles")
     
-    return batches
+    Profile = models.ColumnMappingProfile
+    result = await db.execute(
+        select(Profile).where(Profile.recruiter_id == current_user.id).order_by(Profile.updated_at.desc(), Profile.id.desc())
+    )
+    return result.scalars().all()
+
+@router.put("/column-profiles/{profile_id}", response_model=schemas.ColumnMappingProfile)
+async def update_column_profile(
+    profile_id: int,
+    update: schemas.ColumnMappingProfileUpdate,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: DbSession = Depends(get_db)
+):
+    """Replace how the columns of a header row map to candidate fields; applies to the next upload of it"""
+    profile = await db.get(models.ColumnMappingProfile, profile_id)
+    if profile is None or profile.recruiter_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Column mapping profile not found")
+    
+    names = update.mapping.model_dump()
+    try:
+        mapping = ColumnMapping(profile.headers, names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    profile.mapping = names
+    await db.commit()
+    await db.refresh(profile)
+    column_profile_cache.put((profile.recruiter_id, profile.header_fingerprint), mapping)
+    
+    return profile
+
+@router.get("/ingest-stats", response_model=schemas.IngestStats)
+async def get_ingest_stats(
+    days: int = Query(30, ge=1, le=365),
+    slowest: int = Query(10, ge=0, le=100),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN])),
+    db: DbSession = Depends(get_read_db)
+):
+    """Upload performance of the last `days` days by upload type and file size, with the slowest uploads by rows per second"""
+    since = datetime.utcnow() - timedelta(days=days)
+    return await db.run_sync(ingest_stats, since, slowest)
+
+@router.get("/search/employment", response_model=List[schemas.CandidateDetail])
+async def search_by_employment(
+    company: str,
+    year: int,
+    to_year: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=500),
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: DbSession = Depends(get_read_db)
+):
+    """Candidates employed at `company` (case-insensitive) at any point between `year` and `to_year`"""
+    last_year = to_year if to_year is not None else year
+    if last_year < year:
+        raise HTTPException(status_code=400, detail="to_year must not be before year")
+    
+    # Served by ix_employment_company_name_years; open-ended current roles have no end_year
+    employed = select(models.Employment.candidate_id).where(
+        func.lower(models.Employment.company_name) == company.strip().lower(),
+        models.Employment.start_year <= last_year,
+        or_(
+            models.Employment.end_year >= year,
+            and_(models.Employment.end_year.is_(None), models.Employment.is_current.is_(True))
+        )
+    )
+    query = (
+        select(models.Candidate)
+        .where(models.Candidate.id.in_(employed))
+        .order_by(models.Candidate.id)
+        .limit(limit)
+        .options(
+            selectinload(models.Candidate.employment_history),
+            selectinload(models.Candidate.education_history)
+        )
+    )
+    if current_user.role == models.UserRole.RECRUITER:
+        query = query.join(models.CandidateBatch).where(models.CandidateBatch.recruiter_id == current_user.id)
+    
+    result = await db.execute(query)
+    return result.scalars().all()
 
 @router.get("/batch/{batch_id}", response_model=schemas.CandidateBatchDetail)
-def get_batch(
+async def get_batch(
     batch_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_read_db)
+):
+    last_candidate_update = select(func.max(models.Candidate.updated_at)).where(
+        models.Candidate.batch_id == models.CandidateBatch.id
+    ).scalar_subquery()
+    
+    result = await db.execute(
+        select(
+            models.CandidateBatch.recruiter_id,
+            models.CandidateBatch.status,
+            models.CandidateBatch.total_candidates,
+            models.CandidateBatch.verified_count,
+            last_candidate_update.label("last_candidate_update")
+        ).where(models.CandidateBatch.id == batch_id)
+    )
+    version = result.first()
+    if not version:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    if current_user.role == models.UserRole.RECRUITER and version.recruiter_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this batch")
+    
+    etag = weak_etag(
+        "batch", batch_id, version.status.value, version.total_candidates, version.verified_count,
+        version.last_candidate_update.isoformat() if version.last_candidate_update else None
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    result = await db.execute(
+        select(models.CandidateBatch)
+        .where(models.CandidateBatch.id == batch_id)
+        .options(
+            selectinload(models.CandidateBatch.candidates).selectinload(models.Candidate.employment_history),
+            selectinload(models.CandidateBatch.candidates).selectinload(models.Candidate.education_history)
+        )
+    )
+    batch = result.scalars().first()
+    
+    response.headers["ETag"] = etag
+    return batch
+
+@router.post("/batch/{batch_id}/timeline-check")
+async def rerun_timeline_checks(
+    batch_id: int,
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
+):
+    """Re-run the timeline pre-checks for a batch, e.g. after the thresholds changed"""
+    summary = await run_in_threadpool(run_timeline_checks, batch_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return summary
+
+@router.post("/batch/{batch_id}/source-check")
+async def rerun_source_checks(
+    batch_id: int,
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN]))
 ):
-    batch = db.query(models.CandidateBatch).filter(models.CandidateBatch.id == batch_id).first()
+    """Query the external verification sources again for every claim of a batch"""
+    if not sources_enabled():
+        raise HTTPException(status_code=409, detail="No verification sources are configured")
+    summary = await run_in_threadpool(run_source_checks, batch_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return summary
+
+@router.put("/batch/{batch_id}/schedule", response_model=schemas.CandidateBatch)
+async def update_batch_schedule(
+    batch_id: int,
+    update: schemas.BatchScheduleUpdate,
+    current_user: models.User = Depends(auth.require_role([models.UserRole.ADMIN])),
+    db: DbSession = Depends(get_db)
+):
+    """Change a batch's share of verifier time or its SLA deadline; sending sla_deadline as null clears it"""
+    batch = await db.get(models.CandidateBatch, batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    if update.scheduling_weight is not None:
+        batch.scheduling_weight = update.scheduling_weight
+    if "sla_deadline" in update.model_fields_set:
+        deadline = update.sla_deadline
+        # Stored naive in UTC like every other timestamp
+        if deadline is not None and deadline.tzinfo is not None:
+            deadline = deadline.astimezone(timezone.utc).replace(tzinfo=None)
+        batch.sla_deadline = deadline
+    
+    await db.commit()
+    await db.refresh(batch)
+    
+    return batch
+
+@router.get("/batch/{batch_id}/source")
+async def get_batch_source(
+    batch_id: int,
+    if_none_match: Optional[str] = Header(None),
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: DbSession = Depends(get_read_db)
+):
+    """Download the file the batch was uploaded from"""
+    result = await db.execute(
+        select(
+            models.CandidateBatch.recruiter_id,
+            models.CandidateBatch.upload_type,
+            models.CandidateBatch.source_file_hash,
+            models.CandidateBatch.source_filename
+        ).where(models.CandidateBatch.id == batch_id)
+    )
+    batch = result.first()
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
     
     if current_user.role == models.UserRole.RECRUITER and batch.recruiter_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to view this batch")
     
-    return batch
+    if not batch.source_file_hash:
+        raise HTTPException(status_code=404, detail="Original upload was not stored for this batch")
+    
+    # Blobs are content-addressed, so the digest is a strong validator
+    etag = strong_etag(batch.source_file_hash)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    try:
+        content = await run_in_threadpool(get_blob_store().get, batch.source_file_hash)
+    except BlobNotFound:
+        raise HTTPException(status_code=404, detail="Original upload is missing from the blob store")
+    
+    filename = (batch.source_filename or f"batch-{batch_id}.{batch.upload_type}").replace('"', "")
+    return Response(
+        content=content,
+        media_type=SOURCE_MEDIA_TYPES.get(batch.upload_type, "application/octet-stream"),
+        headers={"ETag": etag, "Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
-@router.get("/{candidate_id}", response_model=schemas.CandidateDetail)
-def get_candidate(
+@router.get("/{candidate_id}/duplicates", response_model=List[schemas.CandidateDetail])
+async def get_candidate_duplicates(
+    candidate_id: int,
+    current_user: models.User = Depends(auth.require_role([models.UserRole.VERIFIER, models.UserRole.ADMIN])),
+    db: DbSession = Depends(get_read_db)
+):
+    """Other copies of the same person from any batch, oldest first, with their claim outcomes"""
+    candidate = await db.get(models.Candidate, candidate_id)
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    root = candidate.duplicate_of_id or candidate.id
+    result = await db.execute(
+        select(models.Candidate)
+        .where(
+            or_(models.Candidate.id == root, models.Candidate.duplicate_of_id == root),
+            models.Candidate.id != candidate_id
+        )
+        .order_by(models.Candidate.id)
+        .options(
+            selectinload(models.Candidate.employment_history),
+            selectinload(models.Candidate.education_history)
+        )
+    )
+    
+    return result.scalars().all()
+
+@router.get("/{candidate_id}/raw")
+async def get_candidate_raw_data(
     candidate_id: int,
+    if_none_match: Optional[str] = Header(None),
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_read_db)
 ):
-    candidate = db.query(models.Candidate).filter(models.Candidate.id == candidate_id).first()
+    """Raw parser output for a candidate, as stored at upload time"""
+    result = await db.execute(
+        select(models.Candidate.raw_cv_hash, models.CandidateBatch.recruiter_id)
+        .join(models.CandidateBatch, models.CandidateBatch.id == models.Candidate.batch_id)
+        .where(models.Candidate.id == candidate_id)
+    )
+    candidate = result.first()
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
+    if current_user.role == models.UserRole.RECRUITER and candidate.recruiter_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this candidate")
+    
+    if not candidate.raw_cv_hash:
+        raise HTTPException(status_code=404, detail="No raw CV data stored for this candidate")
+    
+    etag = strong_etag(candidate.raw_cv_hash)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    try:
+        content = await run_in_threadpool(get_blob_store().get, candidate.raw_cv_hash)
+    except BlobNotFound:
+        raise HTTPException(status_code=404, detail="Raw CV data is missing from the blob store")
+    
+    # Stored as canonical JSON, so the bytes are returned as-is without decoding
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
+
+@router.get("/{candidate_id}", response_model=schemas.CandidateDetail)
+async def get_candidate(
+    candidate_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: DbSession = Depends(get_read_db)
+):
+    result = await db.execute(select(models.Candidate.updated_at).where(models.Candidate.id == candidate_id))
+    updated_at = result.first()
+    if not updated_at:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    etag = weak_etag("candidate", candidate_id, updated_at[0].isoformat() if updated_at[0] else None)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    result = await db.execute(
+        select(models.Candidate)
+        .where(models.Candidate.id == candidate_id)
+        .options(
+            selectinload(models.Candidate.employment_history),
+            selectinload(models.Candidate.education_history)
+        )
+    )
+    candidate = result.scalars().first()
+    
+    response.headers["ETag"] = etag
     return candidate
\ No newline at end of file
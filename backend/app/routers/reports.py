@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import Depends, HTTPException, Header
 from fastapi.responses import HTMLResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import List, Optional
 from datetime import datetime
 
-from ..database import get_db
+from ..database import get_db, get_read_db, DbSession
 from .. import models, schemas, auth
+from ..utils.http_cache import content_hash, strong_etag, etag_matches, not_modified
+from ..metrics import REPORTS_GENERATED
+from . import DeferredRouter
 
-router = APIRouter()
+router = DeferredRouter()
 
-def generate_cv_html(candidate: models.Candidate, db: Session) -> str:
+def generate_cv_html(
+    candidate: models.Candidate,
+    employment: List[models.Employment],
+    education: List[models.Education],
+    verifier_name: str = "Unknown"
+) -> str:
+    """Render the verified CV from already loaded rows; does no database access"""
     status_config = {
         models.ClaimStatus.VERIFIED: {
             "icon": "✓",
@@ -36,14 +46,6 @@ def generate_cv_html(candidate: models.Candidate, db: Session) -> str:
         }
     }
     
-    employment = db.query(models.Employment).filter(
-        models.Employment.candidate_id == candidate.id
-    ).order_by(models.Employment.order).all()
-    
-    education = db.query(models.Education).filter(
-        models.Education.candidate_id == candidate.id
-    ).order_by(models.Education.order).all()
-    
     html = f"""
     <!DOCTYPE html>
     <html lang="en">
@@ -292,8 +294,6 @@ def generate_cv_html(candidate: models.Candidate, db: Session) -> str:
         </div>
     """
     
-    verified_by = db.query(models.User).filter(models.User.id == candidate.verifier_id).first()
-    verifier_name = verified_by.full_name if verified_by else "Unknown"
     verification_date = candidate.verified_at.strftime("%B %d, %Y") if candidate.verified_at else "Not completed"
     
     html += f"""
@@ -312,54 +312,91 @@ def generate_cv_html(candidate: models.Candidate, db: Session) -> str:
     return html
 
 @router.post("/generate/{candidate_id}", response_model=schemas.ReportResponse)
-def generate_report(
+async def generate_report(
     candidate_id: int,
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
-    candidate = db.query(models.Candidate).filter(models.Candidate.id == candidate_id).first()
+    candidate = await db.get(models.Candidate, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
     if candidate.verification_status != models.VerificationStatus.COMPLETED:
         raise HTTPException(status_code=400, detail="Candidate verification not completed yet")
     
-    html_content = generate_cv_html(candidate, db)
+    employment = (await db.scalars(
+        select(models.Employment)
+        .where(models.Employment.candidate_id == candidate.id)
+        .order_by(models.Employment.order)
+    )).all()
+    
+    education = (await db.scalars(
+        select(models.Education)
+        .where(models.Education.candidate_id == candidate.id)
+        .order_by(models.Education.order)
+    )).all()
+    
+    verifier_name = await db.scalar(select(models.User.full_name).where(models.User.id == candidate.verifier_id))
+    
+    html_content = generate_cv_html(candidate, employment, education, verifier_name or "Unknown")
     
     report = models.Report(
         candidate_id=candidate_id,
         html_content=html_content,
+        content_hash=content_hash(html_content),
         generated_by=current_user.id
     )
     db.add(report)
-    db.commit()
-    db.refresh(report)
+    await db.commit()
+    await db.refresh(report)
+    REPORTS_GENERATED.inc()
     
     return report
 
+def _report_response(report: models.Report) -> HTMLResponse:
+    digest = report.content_hash or content_hash(report.html_content)
+    return HTMLResponse(content=report.html_content, headers={"ETag": strong_etag(digest)})
+
 @router.get("/{report_id}/html", response_class=HTMLResponse)
-def get_report_html(
+async def get_report_html(
     report_id: int,
+    if_none_match: Optional[str] = Header(None),
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_read_db)
 ):
-    report = db.query(models.Report).filter(models.Report.id == report_id).first()
+    # Reports are immutable, so a revalidation only needs the stored hash, not the HTML
+    if if_none_match:
+        digest = await db.scalar(select(models.Report.content_hash).where(models.Report.id == report_id))
+        if digest and etag_matches(if_none_match, strong_etag(digest)):
+            return not_modified(strong_etag(digest))
+    
+    report = await db.get(models.Report, report_id)
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
     
-    return report.html_content
+    return _report_response(report)
 
 @router.get("/candidate/{candidate_id}/latest", response_class=HTMLResponse)
-def get_latest_report(
+async def get_latest_report(
     candidate_id: int,
+    if_none_match: Optional[str] = Header(None),
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_read_db)
 ):
-    report = db.query(models.Report).filter(
-        models.Report.candidate_id == candidate_id
-    ).order_by(models.Report.generated_at.desc()).first()
+    result = await db.execute(
+        select(models.Report.id, models.Report.content_hash)
+        .where(models.Report.candidate_id == candidate_id)
+        .order_by(models.Report.generated_at.desc())
+        .limit(1)
+    )
+    latest = result.first()
     
-    if not report:
+    if not latest:
         raise HTTPException(status_code=404, detail="No report found for this candidate")
     
-    return report.html_content
\ No newline at end of file
+    if latest.content_hash and etag_matches(if_none_match, strong_etag(latest.content_hash)):
+        return not_modified(strong_etag(latest.content_hash))
+    
+    report = await db.get(models.Report, latest.id)
+    
+    return _report_response(report)
\ No newline at end of file
@@ -1,31 +1,94 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import Depends, HTTPException, Query, Response
+from sqlalchemy import func, select, update as sql_update
+from sqlalchemy.orm import selectinload
 from typing import List
 from datetime import datetime
 
-from ..database import get_db
+from ..database import get_db, get_read_db, DbSession
 from .. import models, schemas, auth
+from ..entity_index import entity_index, record_verified_claim, unrecord_verified_claim
+from ..scheduler import BatchState, FairShareQueue, schedule_order
+from ..connectors import create_connectors, response_cache
+from ..metrics import CLAIMS_VERIFIED
+from . import DeferredRouter
 
-router = APIRouter()
+router = DeferredRouter()
+
+SCHEDULER_CLAIM_ATTEMPTS = 5
+
+def _candidate_detail_loaders():
+    # Built on use: loader options configure every mapper, which would otherwise happen at import
+    return selectinload(models.Candidate.employment_history), selectinload(models.Candidate.education_history)
+
+async def _count(db: DbSession, model, *criteria) -> int:
+    return await db.scalar(select(func.count()).select_from(model).where(*criteria))
+
+async def _active_batches(db: DbSession) -> List[BatchState]:
+    """Scheduling state of every batch that still has pending candidates"""
+    Batch, Candidate = models.CandidateBatch, models.Candidate
+    has_pending = (
+        select(Candidate.id)
+        .where(Candidate.batch_id == Batch.id, Candidate.verification_status == models.VerificationStatus.PENDING)
+        .exists()
+    )
+    result = await db.execute(
+        select(Batch.id, Batch.recruiter_id, Batch.served_effort, Batch.scheduling_weight, Batch.sla_deadline, Batch.uploaded_at)
+        .where(Batch.status != models.VerificationStatus.COMPLETED, has_pending)
+    )
+    return [BatchState(*row) for row in result.all()]
+
+async def _charge_batch(db: DbSession, batch_id: int, effort: int) -> None:
+    # Incremented in SQL, other verifiers claim from the same batch concurrently
+    await db.execute(
+        sql_update(models.CandidateBatch)
+        .where(models.CandidateBatch.id == batch_id)
+        .values(served_effort=func.coalesce(models.CandidateBatch.served_effort, 0) + effort)
+    )
+
+async def _suggest(db: DbSession, kind: schemas.EntityKind, name: str, limit: int) -> List[schemas.EntitySuggestion]:
+    if entity_index.refresh_due():
+        await db.run_sync(entity_index.refresh)
+    return [
+        schemas.EntitySuggestion(
+            entity_id=entity.id,
+            kind=entity.kind,
+            name=entity.display_name,
+            similarity=round(similarity, 3),
+            verified_count=entity.verified_count,
+            last_verified_at=entity.last_verified_at,
+            sources=entity.sources,
+        )
+        for entity, similarity in entity_index.search(kind.value, name, limit)
+    ]
 
 @router.get("/pending", response_model=List[schemas.CandidateDetail])
-def get_pending_candidates(
+async def get_pending_candidates(
     current_user: models.User = Depends(auth.require_role([models.UserRole.VERIFIER, models.UserRole.ADMIN])),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_read_db)
 ):
-    candidates = db.query(models.Candidate).filter(
-        models.Candidate.verification_status == models.VerificationStatus.PENDING
-    ).order_by(models.Candidate.created_at).all()
+    """Pending candidates in the order the scheduler would hand them out"""
+    result = await db.execute(
+        select(models.Candidate)
+        .where(models.Candidate.verification_status == models.VerificationStatus.PENDING)
+        .order_by(models.Candidate.effort_estimate, models.Candidate.id)
+        .options(*_candidate_detail_loaders())
+    )
+    candidates = result.scalars().all()
+    
+    pending = {}
+    for candidate in candidates:
+        pending.setdefault(candidate.batch_id, []).append((candidate.id, candidate.effort_estimate or 0))
+    position = {candidate_id: i for i, candidate_id in enumerate(schedule_order(await _active_batches(db), pending))}
     
-    return candidates
+    return sorted(candidates, key=lambda candidate: position.get(candidate.id, len(position)))
 
 @router.post("/claim/{candidate_id}")
-def claim_candidate(
+async def claim_candidate(
     candidate_id: int,
     current_user: models.User = Depends(auth.require_role([models.UserRole.VERIFIER, models.UserRole.ADMIN])),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
-    candidate = db.query(models.Candidate).filter(models.Candidate.id == candidate_id).first()
+    candidate = await db.get(models.Candidate, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
@@ -34,94 +97,214 @@ def claim_candidate(
     
     candidate.verification_status = models.VerificationStatus.IN_PROGRESS
     candidate.verifier_id = current_user.id
-    db.commit()
+    await _charge_batch(db, candidate.batch_id, candidate.effort_estimate or 0)
+    await db.commit()
     
     return {"message": "Candidate claimed successfully"}
 
+@router.post("/next", response_model=schemas.CandidateDetail)
+async def claim_next_candidate(
+    current_user: models.User = Depends(auth.require_role([models.UserRole.VERIFIER, models.UserRole.ADMIN])),
+    db: DbSession = Depends(get_db)
+):
+    """Claim the candidate the scheduler picks next; 204 when nothing is pending"""
+    Candidate = models.Candidate
+    queue = FairShareQueue(await _active_batches(db))
+    
+    for _ in range(SCHEDULER_CLAIM_ATTEMPTS):
+        batch = queue.next_batch()
+        if batch is None:
+            break
+        
+        result = await db.execute(
+            select(Candidate.id, Candidate.effort_estimate)
+            .where(Candidate.batch_id == batch.batch_id, Candidate.verification_status == models.VerificationStatus.PENDING)
+            .order_by(Candidate.effort_estimate, Candidate.id)
+            .limit(1)
+        )
+        row = result.first()
+        if row is None:
+            queue.remove(batch)
+            continue
+        
+        # Only succeeds if no other verifier claimed the candidate since it was read
+        claimed = await db.execute(
+            sql_update(Candidate)
+            .where(Candidate.id == row.id, Candidate.verification_status == models.VerificationStatus.PENDING)
+            .values(verification_status=models.VerificationStatus.IN_PROGRESS, verifier_id=current_user.id)
+        )
+        if claimed.rowcount != 1:
+            continue
+        
+        await _charge_batch(db, batch.batch_id, row.effort_estimate or 0)
+        await db.commit()
+        
+        result = await db.execute(select(Candidate).where(Candidate.id == row.id).options(*_candidate_detail_loaders()))
+        return result.scalars().first()
+    
+    return Response(status_code=204)
+
 @router.get("/my-queue", response_model=List[schemas.CandidateDetail])
-def get_my_queue(
+async def get_my_queue(
     current_user: models.User = Depends(auth.require_role([models.UserRole.VERIFIER, models.UserRole.ADMIN])),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_read_db)
 ):
-    candidates = db.query(models.Candidate).filter(
-        models.Candidate.verifier_id == current_user.id,
-        models.Candidate.verification_status == models.VerificationStatus.IN_PROGRESS
-    ).order_by(models.Candidate.created_at).all()
+    result = await db.execute(
+        select(models.Candidate)
+        .where(
+            models.Candidate.verifier_id == current_user.id,
+            models.Candidate.verification_status == models.VerificationStatus.IN_PROGRESS
+        )
+        .order_by(models.Candidate.created_at)
+        .options(*_candidate_detail_loaders())
+    )
     
-    return candidates
+    return result.scalars().all()
 
 @router.put("/employment/{employment_id}")
-def update_employment_verification(
+async def update_employment_verification(
     employment_id: int,
     update: schemas.EmploymentUpdate,
     current_user: models.User = Depends(auth.require_role([models.UserRole.VERIFIER, models.UserRole.ADMIN])),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
-    employment = db.query(models.Employment).filter(models.Employment.id == employment_id).first()
+    employment = await db.get(models.Employment, employment_id)
     if not employment:
         raise HTTPException(status_code=404, detail="Employment not found")
     
-    candidate = db.query(models.Candidate).filter(models.Candidate.id == employment.candidate_id).first()
+    candidate = await db.get(models.Candidate, employment.candidate_id)
     if candidate.verifier_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your candidate")
     
+    was_verified, previous_sources = employment.claim_status == models.ClaimStatus.VERIFIED, employment.verification_sources
     employment.claim_status = update.claim_status
     employment.verification_note = update.verification_note
     employment.verification_sources = update.verification_sources
     employment.verified_at = datetime.utcnow()
+    # Claims are part of the candidate representation, so bump its version for ETag revalidation
+    candidate.updated_at = employment.verified_at
+    # The entity index counts verified claims: one that is saved again is taken out first, so it counts once with its new sources
+    if was_verified:
+        await db.run_sync(unrecord_verified_claim, schemas.EntityKind.COMPANY.value, employment.company_name, previous_sources)
+    if update.claim_status == schemas.ClaimStatus.VERIFIED:
+        await db.run_sync(
+            record_verified_claim, schemas.EntityKind.COMPANY.value, employment.company_name, update.verification_sources, employment.verified_at
+        )
     
-    db.commit()
-    db.refresh(employment)
+    await db.commit()
+    await db.refresh(employment)
+    entity_index.mark_stale()
+    CLAIMS_VERIFIED.labels("employment", update.claim_status.value).inc()
     
     return employment
 
 @router.put("/education/{education_id}")
-def update_education_verification(
+async def update_education_verification(
     education_id: int,
     update: schemas.EducationUpdate,
     current_user: models.User = Depends(auth.require_role([models.UserRole.VERIFIER, models.UserRole.ADMIN])),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
-    education = db.query(models.Education).filter(models.Education.id == education_id).first()
+    education = await db.get(models.Education, education_id)
     if not education:
         raise HTTPException(status_code=404, detail="Education not found")
     
-    candidate = db.query(models.Candidate).filter(models.Candidate.id == education.candidate_id).first()
+    candidate = await db.get(models.Candidate, education.candidate_id)
     if candidate.verifier_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your candidate")
     
+    was_verified, previous_sources = education.claim_status == models.ClaimStatus.VERIFIED, education.verification_sources
     education.claim_status = update.claim_status
     education.verification_note = update.verification_note
     education.verification_sources = update.verification_sources
     education.verified_at = datetime.utcnow()
+    # Claims are part of the candidate representation, so bump its version for ETag revalidation
+    candidate.updated_at = education.verified_at
+    # The entity index counts verified claims: one that is saved again is taken out first, so it counts once with its new sources
+    if was_verified:
+        await db.run_sync(unrecord_verified_claim, schemas.EntityKind.INSTITUTION.value, education.institution, previous_sources)
+    if update.claim_status == schemas.ClaimStatus.VERIFIED:
+        await db.run_sync(
+            record_verified_claim, schemas.EntityKind.INSTITUTION.value, education.institution, update.verification_sources, education.verified_at
+        )
     
-    db.commit()
-    db.refresh(education)
+    await db.commit()
+    await db.refresh(education)
+    entity_index.mark_stale()
+    CLAIMS_VERIFIED.labels("education", update.claim_status.value).inc()
     
     return education
 
+@router.get("/suggestions", response_model=List[schemas.EntitySuggestion])
+async def suggest_verified_entities(
+    kind: schemas.EntityKind,
+    name: str = Query(..., min_length=1),
+    limit: int = Query(5, ge=1, le=50),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.VERIFIER, models.UserRole.ADMIN])),
+    db: DbSession = Depends(get_read_db)
+):
+    return await _suggest(db, kind, name, limit)
+
+@router.get("/employment/{employment_id}/suggestions", response_model=List[schemas.EntitySuggestion])
+async def suggest_for_employment(
+    employment_id: int,
+    limit: int = Query(5, ge=1, le=50),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.VERIFIER, models.UserRole.ADMIN])),
+    db: DbSession = Depends(get_read_db)
+):
+    employment = await db.get(models.Employment, employment_id)
+    if not employment:
+        raise HTTPException(status_code=404, detail="Employment not found")
+    
+    return await _suggest(db, schemas.EntityKind.COMPANY, employment.company_name, limit)
+
+@router.get("/education/{education_id}/suggestions", response_model=List[schemas.EntitySuggestion])
+async def suggest_for_education(
+    education_id: int,
+    limit: int = Query(5, ge=1, le=50),
+    current_user: models.User = Depends(auth.require_role([models.UserRole.VERIFIER, models.UserRole.ADMIN])),
+    db: DbSession = Depends(get_read_db)
+):
+    education = await db.get(models.Education, education_id)
+    if not education:
+        raise HTTPException(status_code=404, detail="Education not found")
+    
+    return await _suggest(db, schemas.EntityKind.INSTITUTION, education.institution, limit)
+
+@router.get("/sources")
+async def get_source_status(
+    current_user: models.User = Depends(auth.require_role([models.UserRole.VERIFIER, models.UserRole.ADMIN]))
+):
+    """Configured verification sources with their circuit state, and the response cache"""
+    return {
+        "sources": [connector.describe() for connector in create_connectors()],
+        "cache": response_cache.stats(),
+    }
+
 @router.post("/complete/{candidate_id}")
-def complete_verification(
+async def complete_verification(
     candidate_id: int,
     current_user: models.User = Depends(auth.require_role([models.UserRole.VERIFIER, models.UserRole.ADMIN])),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
-    candidate = db.query(models.Candidate).filter(models.Candidate.id == candidate_id).first()
+    candidate = await db.get(models.Candidate, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
     if candidate.verifier_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not your candidate")
     
-    pending_employment = db.query(models.Employment).filter(
+    pending_employment = await _count(
+        db, models.Employment,
         models.Employment.candidate_id == candidate_id,
         models.Employment.claim_status == models.ClaimStatus.PENDING
-    ).count()
+    )
     
-    pending_education = db.query(models.Education).filter(
+    pending_education = await _count(
+        db, models.Education,
         models.Education.candidate_id == candidate_id,
         models.Education.claim_status == models.ClaimStatus.PENDING
-    ).count()
+    )
     
     if pending_employment > 0 or pending_education > 0:
         raise HTTPException(
@@ -131,49 +314,56 @@ def complete_verification(
     
     candidate.verification_status = models.VerificationStatus.COMPLETED
     candidate.verified_at = datetime.utcnow()
+    # Sessions do not autoflush, so push the status change before counting completed candidates
+    await db.flush()
     
-    batch = db.query(models.CandidateBatch).filter(models.CandidateBatch.id == candidate.batch_id).first()
-    batch.verified_count = db.query(models.Candidate).filter(
+    batch = await db.get(models.CandidateBatch, candidate.batch_id)
+    batch.verified_count = await _count(
+        db, models.Candidate,
         models.Candidate.batch_id == batch.id,
         models.Candidate.verification_status == models.VerificationStatus.COMPLETED
-    ).count()
+    )
     
     if batch.verified_count == batch.total_candidates:
         batch.status = models.VerificationStatus.COMPLETED
         batch.completed_at = datetime.utcnow()
     
-    db.commit()
+    await db.commit()
     
     return {"message": "Verification completed successfully"}
 
 @router.get("/stats")
-def get_verification_stats(
+async def get_verification_stats(
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_read_db)
 ):
     if current_user.role == models.UserRole.VERIFIER:
-        total_verified = db.query(models.Candidate).filter(
+        total_verified = await _count(
+            db, models.Candidate,
             models.Candidate.verifier_id == current_user.id,
             models.Candidate.verification_status == models.VerificationStatus.COMPLETED
-        ).count()
+        )
         
-        in_progress = db.query(models.Candidate).filter(
+        in_progress = await _count(
+            db, models.Candidate,
             models.Candidate.verifier_id == current_user.id,
             models.Candidate.verification_status == models.VerificationStatus.IN_PROGRESS
-        ).count()
+        )
         
         return {
             "total_verified": total_verified,
             "in_progress": in_progress,
-            "available": db.query(models.Candidate).filter(
+            "available": await _count(
+                db, models.Candidate,
                 models.Candidate.verification_status == models.VerificationStatus.PENDING
-            ).count()
+            )
         }
     
     elif current_user.role == models.UserRole.RECRUITER:
-        batches = db.query(models.CandidateBatch).filter(
-            models.CandidateBatch.recruiter_id == current_user.id
-        ).all()
+        result = await db.execute(
+            select(models.CandidateBatch).where(models.CandidateBatch.recruiter_id == current_user.id)
+        )
+        batches = result.scalars().all()
         
         total_candidates = sum(b.total_candidates for b in batches)
         verified_candidates = sum(b.verified_count for b in batches)
@@ -0,0 +1,135 @@
+"""
+Order in which pending candidates are handed out to verifiers.
+
+Work is shared by effort rather than by candidate count: every candidate
+gets an effort estimate from its number of claims when it is ingested, and
+each batch accumulates the effort of the candidates claimed from it. The
+next candidate comes from
+
+1. the batch with the earliest SLA deadline, if any deadline falls within
+   SCHEDULER_SLA_HORIZON_HOURS;
+2. otherwise the recruiter whose active batches have received the least
+   weighted effort so far, and among that recruiter's batches the least
+   served one (scheduling_weight scales a batch's share);
+3. within the batch, the candidate with the smallest estimate.
+
+Only batches that still have pending candidates count, so a recruiter's
+share does not depend on how much was verified for them in the past. All
+state lives in the candidate and batch rows, so the queue survives restarts
+and is shared by every worker.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+EFFORT_BASE_MINUTES = int(os.getenv("EFFORT_BASE_MINUTES", "5"))
+EFFORT_PER_EMPLOYMENT_MINUTES = int(os.getenv("EFFORT_PER_EMPLOYMENT_MINUTES", "8"))
+EFFORT_PER_EDUCATION_MINUTES = int(os.getenv("EFFORT_PER_EDUCATION_MINUTES", "4"))
+SCHEDULER_SLA_HORIZON_HOURS = float(os.getenv("SCHEDULER_SLA_HORIZON_HOURS", "24"))
+
+def estimate_effort(employment_count: int, education_count: int) -> int:
+    """Expected verification time of a candidate in minutes"""
+    return (
+        EFFORT_BASE_MINUTES
+        + EFFORT_PER_EMPLOYMENT_MINUTES * employment_count
+        + EFFORT_PER_EDUCATION_MINUTES * education_count
+    )
+
+class BatchState:
+    __slots__ = ("batch_id", "recruiter_id", "served_effort", "weight", "sla_deadline", "uploaded_at")
+    
+    def __init__(
+        self,
+        batch_id: int,
+        recruiter_id: int,
+        served_effort: int = 0,
+        weight: float = 1.0,
+        sla_deadline: Optional[datetime] = None,
+        uploaded_at: Optional[datetime] = None
+    ):
+        self.batch_id = batch_id
+        self.recruiter_id = recruiter_id
+        self.served_effort = served_effort or 0
+        self.weight = weight if weight and weight > 0 else 1.0
+        self.sla_deadline = sla_deadline
+        self.uploaded_at = uploaded_at or datetime.min
+    
+    @property
+    def attained(self) -> float:
+        return self.served_effort / self.weight
+
+class FairShareQueue:
+    """Picks the batch that should supply the next candidate; serve() and remove() keep the shares current"""
+    
+    def __init__(self, batches: Iterable[BatchState], now: Optional[datetime] = None, sla_horizon_hours: float = SCHEDULER_SLA_HORIZON_HOURS):
+        self.urgent_before = (now or datetime.utcnow()) + timedelta(hours=sla_horizon_hours)
+        self._urgent: Dict[int, BatchState] = {}
+        self._by_recruiter: Dict[int, Dict[int, BatchState]] = {}
+        self._attained: Dict[int, float] = {}
+        for batch in batches:
+            self._attained[batch.recruiter_id] = self._attained.get(batch.recruiter_id, 0.0) + batch.attained
+            if batch.sla_deadline is not None and batch.sla_deadline <= self.urgent_before:
+                self._urgent[batch.batch_id] = batch
+            else:
+                self._by_recruiter.setdefault(batch.recruiter_id, {})[batch.batch_id] = batch
+    
+    def __bool__(self) -> bool:
+        return bool(self._urgent or self._by_recruiter)
+    
+    def next_batch(self) -> Optional[BatchState]:
+        if self._urgent:
+            return min(self._urgent.values(), key=lambda batch: (batch.sla_deadline, batch.uploaded_at, batch.batch_id))
+        if not self._by_recruiter:
+            return None
+        
+        recruiter_id = min(
+            self._by_recruiter,
+            key=lambda recruiter: (
+                self._attained[recruiter],
+                min(batch.uploaded_at for batch in self._by_recruiter[recruiter].values()),
+                recruiter
+            )
+        )
+        return min(
+            self._by_recruiter[recruiter_id].values(),
+            key=lambda batch: (batch.attained, batch.uploaded_at, batch.batch_id)
+        )
+    
+    def serve(self, batch: BatchState, effort: int) -> None:
+        batch.served_effort += effort
+        self._attained[batch.recruiter_id] = self._attained.get(batch.recruiter_id, 0.0) + effort / batch.weight
+    
+    def remove(self, batch: BatchState) -> None:
+        """Drop a batch that has no pending candidates left"""
+        self._urgent.pop(batch.batch_id, None)
+        batches = self._by_recruiter.get(batch.recruiter_id)
+        if batches is not None:
+            batches.pop(batch.batch_id, None)
+            if not batches:
+                del self._by_recruiter[batch.recruiter_id]
+
+def schedule_order(
+    batches: Iterable[BatchState],
+    pending: Dict[int, Sequence[Tuple[int, int]]],
+    now: Optional[datetime] = None
+) -> List[int]:
+    """
+    Candidate ids in the order they would be handed out if nothing else arrived.
+
+    `pending` maps batch id to (candidate_id, effort) pairs already sorted by
+    effort, as the queue serves them within a batch.
+    """
+    queue = FairShareQueue([batch for batch in batches if pending.get(batch.batch_id)], now)
+    positions = {batch_id: 0 for batch_id in pending}
+    order = []
+    while queue:
+        batch = queue.next_batch()
+        candidates = pending[batch.batch_id]
+        candidate_id, effort = candidates[positions[batch.batch_id]]
+        order.append(candidate_id)
+        positions[batch.batch_id] += 1
+        queue.serve(batch, effort)
+        if positions[batch.batch_id] == len(candidates):
+            queue.remove(batch)
+    return order
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -19,6 +19,10 @@ class ClaimStatus(str, Enum):
     INCONSISTENT = "INCONSISTENT"
     PENDING = "PENDING"
 
+class EntityKind(str, Enum):
+    COMPANY = "company"
+    INSTITUTION = "institution"
+
 class UserBase(BaseModel):
     email: EmailStr
     full_name: str
@@ -66,6 +70,13 @@ class Employment(EmploymentBase):
     claim_status: ClaimStatus
     verification_note: Optional[str]
     verification_sources: Optional[List[str]]
+    start_year: Optional[int] = None
+    start_month: Optional[int] = None
+    end_year: Optional[int] = None
+    end_month: Optional[int] = None
+    machine_notes: Optional[str] = None
+    priority_score: int = 0
+    source_results: Optional[Dict[str, Any]] = None
     verified_at: Optional[datetime]
     order: int
 
@@ -94,6 +105,13 @@ class Education(EducationBase):
     claim_status: ClaimStatus
     verification_note: Optional[str]
     verification_sources: Optional[List[str]]
+    start_year: Optional[int] = None
+    start_month: Optional[int] = None
+    end_year: Optional[int] = None
+    end_month: Optional[int] = None
+    machine_notes: Optional[str] = None
+    priority_score: int = 0
+    source_results: Optional[Dict[str, Any]] = None
     verified_at: Optional[datetime]
     order: int
 
@@ -117,6 +135,11 @@ class CandidateDetail(CandidateBase):
     verifier_id: Optional[int]
     verified_at: Optional[datetime]
     created_at: datetime
+    priority_score: int = 0
+    raw_cv_hash: Optional[str] = None
+    duplicate_of_id: Optional[int] = None
+    duplicate_match: Optional[str] = None
+    effort_estimate: int = 0
     employment_history: List[Employment] = []
     education_history: List[Education] = []
 
@@ -137,10 +160,30 @@ class CandidateBatch(BaseModel):
     completed_at: Optional[datetime]
     total_candidates: int
     verified_count: int
+    source_file_hash: Optional[str] = None
+    source_filename: Optional[str] = None
+    timeline_checked_at: Optional[datetime] = None
+    sources_checked_at: Optional[datetime] = None
+    duplicate_count: int = 0
+    served_effort: int = 0
+    scheduling_weight: float = 1.0
+    sla_deadline: Optional[datetime] = None
+    source_size_bytes: Optional[int] = None
+    ingest_read_ms: Optional[float] = None
+    ingest_parse_ms: Optional[float] = None
+    ingest_candidates_ms: Optional[float] = None
+    ingest_histories_ms: Optional[float] = None
+    ingest_commit_ms: Optional[float] = None
+    ingest_total_ms: Optional[float] = None
+    ingest_rows_per_second: Optional[float] = None
 
     class Config:
         from_attributes = True
 
+class BatchScheduleUpdate(BaseModel):
+    scheduling_weight: Optional[float] = Field(None, gt=0)
+    sla_deadline: Optional[datetime] = None
+
 class CandidateBatchDetail(CandidateBatch):
     candidates: List[CandidateDetail] = []
 
@@ -148,8 +191,93 @@ class CSVUploadResponse(BaseModel):
     batch_id: int
     batch_name: str
     total_candidates: int
+    duplicate_count: int = 0
     message: str
 
+class UploadSessionCreate(BaseModel):
+    batch_name: str
+    upload_type: str = Field("csv", pattern="^(csv|xlsx|pdf)$")
+    filename: Optional[str] = None
+    total_size: int = Field(..., gt=0)
+    sha256: Optional[str] = Field(None, pattern="^[0-9a-fA-F]{64}$")
+
+class UploadSession(BaseModel):
+    id: str
+    batch_name: str
+    upload_type: str
+    filename: Optional[str] = None
+    total_size: int
+    received_bytes: int
+    chunk_size: int
+    status: str
+    batch_id: Optional[int] = None
+    expires_at: datetime
+
+class EmploymentColumns(BaseModel):
+    company: str
+    position: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    is_current: Optional[str] = None
+    description: Optional[str] = None
+
+class EducationColumns(BaseModel):
+    institution: str
+    degree: Optional[str] = None
+    field: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+
+class ColumnMappingNames(BaseModel):
+    """The column read for each candidate field, or null; one entry per employment and education slot"""
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    employment: List[EmploymentColumns] = []
+    education: List[EducationColumns] = []
+
+class ColumnMappingProfile(BaseModel):
+    id: int
+    header_fingerprint: str
+    headers: List[str]
+    mapping: ColumnMappingNames
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ColumnMappingProfileUpdate(BaseModel):
+    mapping: ColumnMappingNames
+
+class IngestStatsGroup(BaseModel):
+    upload_type: str
+    size_bucket: str
+    batches: int
+    candidates: int
+    avg_size_bytes: int
+    avg_ms: Dict[str, float]
+    avg_total_ms: float
+    max_total_ms: float
+    avg_rows_per_second: Optional[float] = None
+
+class IngestOutlier(BaseModel):
+    batch_id: int
+    upload_type: str
+    source_filename: Optional[str] = None
+    source_size_bytes: Optional[int] = None
+    total_candidates: int
+    uploaded_at: datetime
+    ms: Dict[str, Optional[float]]
+    total_ms: float
+    rows_per_second: Optional[float] = None
+
+class IngestStats(BaseModel):
+    since: datetime
+    groups: List[IngestStatsGroup] = []
+    slowest: List[IngestOutlier] = []
+
 class ReportGenerate(BaseModel):
     candidate_id: int
 
@@ -160,4 +288,13 @@ class ReportResponse(BaseModel):
     generated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class EntitySuggestion(BaseModel):
+    entity_id: int
+    kind: EntityKind
+    name: str
+    similarity: float
+    verified_count: int
+    last_verified_at: Optional[datetime] = None
+    sources: List[str] = []
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Opt-in SQL profiling per request, built on SQLAlchemy engine events.
+
+With SQL_PROFILE=true, SqlProfilingMiddleware gives every request a
+QueryProfile that counts its statements, their total time and how often each
+statement shape ran. Shapes are the SQL with parameters as placeholders and
+expanded IN lists collapsed, so the same lookup for different ids is one
+shape. The totals go out as response headers (X-DB-Queries, X-DB-Time-Ms,
+X-DB-Max-Repeats, Server-Timing), and a warning is logged when one shape ran
+more than SQL_PROFILE_REPEAT_THRESHOLD times, which is what an N+1 loop looks
+like. SQL_PROFILE_LOG=true also logs the summary of every request.
+
+The profile is carried in a context variable, so it follows the request into
+the threadpool (ThreadedSession) and into AsyncSession's greenlets. Work that
+runs outside the request, or a TestClient on another thread, is counted with
+profile_queries(), which records every statement in the process while it is
+open:
+
+    with profile_queries(max_queries=10, max_repeats=2) as profile:
+        client.get("/api/candidates/batch/1")
+
+tests/conftest.py wraps that in a pytest fixture. The listeners are
+only installed once profiling is enabled or first used.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SQL_PROFILE = os.getenv("SQL_PROFILE", "false").lower() in ("1", "true", "yes")
+SQL_PROFILE_LOG = os.getenv("SQL_PROFILE_LOG", "false").lower() in ("1", "true", "yes")
+SQL_PROFILE_REPEAT_THRESHOLD = int(os.getenv("SQL_PROFILE_REPEAT_THRESHOLD", "10"))
+
+_PLACEHOLDER = r"(?:\?|%\([^)]*\)s|%s|\$\d+|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_REPEATED_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+@lru_cache(maxsize=2048)
+def statement_shape(statement: str) -> str:
+    """The statement with expanded IN lists and multi-row VALUES collapsed to (...)"""
+    shape = _PLACEHOLDER_LIST.sub("(...)", statement)
+    shape = _REPEATED_ROWS.sub("(...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+class QueryProfile:
+    """Statements executed within one request or profile_queries() block"""
+    
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.shape_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, statement: str, seconds: float) -> None:
+        shape = statement_shape(statement)
+        with self._lock:
+            self.queries += 1
+            self.seconds += seconds
+            self.shapes[shape] += 1
+            self.shape_seconds[shape] = self.shape_seconds.get(shape, 0.0) + seconds
+    
+    @property
+    def max_repeats(self) -> int:
+        with self._lock:
+            return max(self.shapes.values(), default=0)
+    
+    def repeated(self, threshold: int = 1) -> List[Dict[str, Any]]:
+        """Shapes that ran more than `threshold` times, most frequent first"""
+        with self._lock:
+            return [
+                {"statement": shape, "count": count, "ms": round(self.shape_seconds[shape] * 1000, 2)}
+                for shape, count in self.shapes.most_common()
+                if count > threshold
+            ]
+    
+    def summary(self, top: int = 5) -> Dict[str, Any]:
+        return {
+            "queries": self.queries,
+            "db_ms": round(self.seconds * 1000, 2),
+            "distinct_statements": len(self.shapes),
+            "max_repeats": self.max_repeats,
+            "repeated": self.repeated()[:top],
+        }
+    
+    def check_budget(self, max_queries: Optional[int] = None, max_repeats: Optional[int] = None) -> None:
+        """Raise QueryBudgetExceeded when more statements, or more runs of one shape, were executed than allowed"""
+        problems = []
+        if max_queries is not None and self.queries > max_queries:
+            problems.append(f"{self.queries} queries, budget is {max_queries}")
+        if max_repeats is not None and self.max_repeats > max_repeats:
+            problems.append(f"a statement ran {self.max_repeats} times, budget is {max_repeats}")
+        if problems:
+            details = "\n".join(f"  {item['count']}x {item['statement']}" for item in self.repeated()[:5])
+            raise QueryBudgetExceeded("; ".join(problems) + (f"\nRepeated statements:\n{details}" if details else ""))
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+# Process-wide profiles of open profile_queries() blocks
+_process_profiles: List[QueryProfile] = []
+_install_lock = threading.Lock()
+_installed = False
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and (_process_profiles or _current_profile.get() is not None):
+        context._sql_profile_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_sql_profile_started", None)
+    if started is None:
+        return
+    
+    seconds = time.perf_counter() - started
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, seconds)
+    for process_profile in list(_process_profiles):
+        if process_profile is not profile:
+            process_profile.record(statement, seconds)
+
+def install() -> None:
+    """Listen to every engine, including the sync engines behind async ones"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _installed = True
+
+def current_profile() -> Optional[QueryProfile]:
+    return _current_profile.get()
+
+@contextmanager
+def profile_queries(max_queries: Optional[int] = None, max_repeats: Optional[int] = None) -> Iterator[QueryProfile]:
+    """Record every statement executed in the process while the block runs, then check the budget"""
+    install()
+    profile = QueryProfile()
+    _process_profiles.append(profile)
+    try:
+        yield profile
+    finally:
+        _process_profiles.remove(profile)
+    profile.check_budget(max_queries, max_repeats)
+
+def _log_profile(scope, profile: QueryProfile, repeat_threshold: int) -> None:
+    route = scope.get("route")
+    endpoint = f"{scope['method']} {route.path if route is not None else scope['path']}"
+    # The unit of work inserts row by row where RETURNING cannot be batched (SQLite); that is not a loop in our code
+    repeated = [item for item in profile.repeated(repeat_threshold) if not item["statement"].startswith("INSERT")]
+    if repeated:
+        logger.warning(
+            "Possible N+1 in %s: %d queries, statement ran %d times: %s",
+            endpoint, profile.queries, repeated[0]["count"], repeated[0]["statement"]
+        )
+    if SQL_PROFILE_LOG:
+        logger.info("SQL profile of %s: %s", endpoint, profile.summary())
+
+class SqlProfilingMiddleware:
+    """Profiles each HTTP request and reports the totals in its response headers"""
+    
+    def __init__(self, app, repeat_threshold: int = SQL_PROFILE_REPEAT_THRESHOLD):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        install()
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        profile = QueryProfile()
+        token = _current_profile.set(profile)
+        
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start":
+                # Statements that run while the body streams or in background tasks only show up in the log
+                db_ms = profile.seconds * 1000
+                message = {**message, "headers": [
+                    *message.get("headers", []),
+                    (b"x-db-queries", str(profile.queries).encode()),
+                    (b"x-db-time-ms", f"{db_ms:.2f}".encode()),
+                    (b"x-db-max-repeats", str(profile.max_repeats).encode()),
+                    (b"server-timing", f'db;dur={db_ms:.2f};desc="{profile.queries} queries"'.encode()),
+                ]}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _current_profile.reset(token)
+            _log_profile(scope, profile, self.repeat_threshold)
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Content-addressed blob storage for original uploads and raw parser output.
+
+Blobs are immutable and addressed by the SHA-256 hex digest of their bytes,
+so storing the same file or the same parsed CV twice keeps a single copy and
+rows only carry the 64-character digest. BLOB_STORE_BACKEND selects the
+implementation: a name from BLOB_STORE_BACKENDS or a "package.module:Class"
+path to a BlobStore subclass, which is constructed without arguments.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BLOB_STORE_BACKEND = os.getenv("BLOB_STORE_BACKEND", "local")
+BLOB_STORE_PATH = os.getenv("BLOB_STORE_PATH", "./blobs")
+
+class BlobNotFound(KeyError):
+    pass
+
+class BlobStore(ABC):
+    """Interface for blob backends. Subclasses implement the four storage primitives."""
+
+    def put(self, data: bytes, created: Optional[List[str]] = None) -> str:
+        """Store `data` unless it is stored already and return its digest, appended to `created` if this call wrote it"""
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.exists(digest):
+            self._write(digest, data)
+            if created is not None:
+                created.append(digest)
+        return digest
+
+    @abstractmethod
+    def get(self, digest: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def exists(self, digest: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, digest: str) -> None:
+        ...
+
+    @abstractmethod
+    def _write(self, digest: str, data: bytes) -> None:
+        ...
+
+class LocalFilesystemBlobStore(BlobStore):
+    """Blobs as files under `root`, fanned out by the first two digest bytes (ab/cd/abcd...)"""
+
+    def __init__(self, root: str = BLOB_STORE_PATH):
+        self.root = os.path.abspath(root)
+
+    def _path(self, digest: str) -> str:
+        if len(digest) != 64 or any(c not in "0123456789abcdef" for c in digest):
+            raise BlobNotFound(digest)
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def get(self, digest: str) -> bytes:
+        try:
+            with open(self._path(digest), "rb") as blob:
+                return blob.read()
+        except FileNotFoundError:
+            raise BlobNotFound(digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def delete(self, digest: str) -> None:
+        try:
+            os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _write(self, digest: str, data: bytes) -> None:
+        path = self._path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as blob:
+                blob.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+BLOB_STORE_BACKENDS: Dict[str, Callable[[], BlobStore]] = {
+    "local": LocalFilesystemBlobStore,
+}
+
+def create_blob_store(backend: str = BLOB_STORE_BACKEND) -> BlobStore:
+    if backend in BLOB_STORE_BACKENDS:
+        return BLOB_STORE_BACKENDS[backend]()
+    if ":" in backend:
+        module_name, class_name = backend.split(":", 1)
+        return getattr(importlib.import_module(module_name), class_name)()
+    raise ValueError(f"Unknown BLOB_STORE_BACKEND '{backend}', expected one of {sorted(BLOB_STORE_BACKENDS)} or 'module:Class'")
+
+_blob_store: Optional[BlobStore] = None
+_blob_store_lock = threading.Lock()
+
+def get_blob_store() -> BlobStore:
+    """Process-wide blob store, created on first use"""
+    global _blob_store
+    if _blob_store is None:
+        with _blob_store_lock:
+            if _blob_store is None:
+                _blob_store = create_blob_store()
+    return _blob_store
+
+def encode_json(value: Any) -> bytes:
+    # Canonical encoding so equal documents hash to the same blob
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+def put_json(value: Any, store: Optional[BlobStore] = None, created: Optional[List[str]] = None) -> str:
+    return (store or get_blob_store()).put(encode_json(value), created)
+
+def get_json(digest: str, store: Optional[BlobStore] = None) -> Any:
+    return json.loads((store or get_blob_store()).get(digest))
\ No newline at end of file
@@ -0,0 +1,249 @@
+"""
+Timeline consistency pre-checks for uploaded batches.
+
+Runs after ingest over every employment and education row of a batch at
+once, using the normalized year / month columns. Each finding adds a weight
+to the row's priority score and a sentence to its machine notes, so
+verifiers start from what the data already shows:
+
+- end date before start date (employment and education)
+- start date in the future
+- employment that overlaps an earlier role by more than the tolerance
+- more than one role marked as current
+- a long gap before a role that no other employment or education explains
+
+Rows and candidates are scored 0-100; a candidate's score is the sum of its
+row scores, capped. numpy is imported on first use.
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import select, update
+
+from . import models
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+TIMELINE_OVERLAP_TOLERANCE_MONTHS = int(os.getenv("TIMELINE_OVERLAP_TOLERANCE_MONTHS", "2"))
+TIMELINE_GAP_THRESHOLD_MONTHS = int(os.getenv("TIMELINE_GAP_THRESHOLD_MONTHS", "12"))
+
+FLAG_WEIGHTS = {
+    "end_before_start": 40,
+    "overlap": 25,
+    "starts_in_future": 20,
+    "multiple_current": 15,
+    "gap": 10,
+}
+MAX_PRIORITY_SCORE = 100
+
+def _segmented_running_max(np, groups, values):
+    """Running max of `values` restarting at each group; rows must be sorted by group and values >= -1"""
+    span = int(values.max()) + 2 if len(values) else 1
+    offset = groups.astype(np.int64) * span
+    return np.maximum.accumulate(offset + values + 1) - offset - 1
+
+def analyze_timelines(
+    candidate_ids: Sequence[int],
+    is_employment: Sequence[bool],
+    start_year: Sequence[int],
+    start_month: Sequence[int],
+    end_year: Sequence[int],
+    end_month: Sequence[int],
+    is_current: Sequence[bool],
+    now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Run every check over one flat set of rows in a single vectorized pass.
+
+    Inputs are aligned arrays with -1 for a missing year or month. Returns
+    per-row "scores" and "notes" (None for clean rows), plus per-candidate
+    "candidate_ids" / "candidate_scores".
+    """
+    import numpy as np
+
+    now = now or datetime.utcnow()
+    now_month = now.year * 12 + now.month - 1
+
+    candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+    is_employment = np.asarray(is_employment, dtype=bool)
+    start_year = np.asarray(start_year, dtype=np.int64)
+    start_month = np.asarray(start_month, dtype=np.int64)
+    end_year = np.asarray(end_year, dtype=np.int64)
+    end_month = np.asarray(end_month, dtype=np.int64)
+    is_current = np.asarray(is_current, dtype=bool)
+    rows = len(candidate_ids)
+
+    unique_candidates, candidate_index = np.unique(candidate_ids, return_inverse=True)
+
+    # Months since year 0; a missing month widens the bound to the whole year
+    has_start = start_year >= 0
+    has_end = end_year >= 0
+    start_lo = np.where(has_start, start_year * 12 + np.where(start_month > 0, start_month - 1, 0), -1)
+    end_hi = np.where(has_end, end_year * 12 + np.where(end_month > 0, end_month - 1, 11), -1)
+    effective_end = np.where(has_end, end_hi, np.where(is_current, now_month, -1))
+
+    end_before_start = has_start & has_end & (end_hi < start_lo)
+    starts_in_future = has_start & (start_lo > now_month)
+
+    current_roles = np.bincount(candidate_index, weights=is_employment & is_current, minlength=len(unique_candidates))
+    current_count = current_roles[candidate_index].astype(np.int64)
+    multiple_current = is_employment & is_current & (current_count > 1)
+
+    usable = has_start & (effective_end >= 0) & ~end_before_start
+
+    # Overlaps: employment sorted by candidate then start, compared with the furthest earlier end
+    overlap_months = np.zeros(rows, dtype=np.int64)
+    selected = np.flatnonzero(usable & is_employment)
+    if len(selected):
+        order = selected[np.lexsort((start_lo[selected], candidate_index[selected]))]
+        groups = candidate_index[order]
+        previous_end = np.concatenate(([-1], _segmented_running_max(np, groups, effective_end[order])[:-1]))
+        same_candidate = np.concatenate(([False], groups[1:] == groups[:-1]))
+        overlap_months[order] = np.where(same_candidate, previous_end - start_lo[order] + 1, 0)
+    overlap = overlap_months > TIMELINE_OVERLAP_TOLERANCE_MONTHS
+
+    # Gaps: measured on employment and education together, so studies explain a break
+    gap_months = np.zeros(rows, dtype=np.int64)
+    selected = np.flatnonzero(usable)
+    if len(selected):
+        order = selected[np.lexsort((start_lo[selected], candidate_index[selected]))]
+        groups = candidate_index[order]
+        previous_end = np.concatenate(([-1], _segmented_running_max(np, groups, effective_end[order])[:-1]))
+        same_candidate = np.concatenate(([False], groups[1:] == groups[:-1]))
+        gap_months[order] = np.where(same_candidate, start_lo[order] - previous_end - 1, 0)
+    gap = is_employment & (gap_months > TIMELINE_GAP_THRESHOLD_MONTHS)
+
+    flags = {
+        "end_before_start": end_before_start,
+        "overlap": overlap,
+        "starts_in_future": starts_in_future,
+        "multiple_current": multiple_current,
+        "gap": gap,
+    }
+    scores = np.zeros(rows, dtype=np.int64)
+    for name, mask in flags.items():
+        scores += mask * FLAG_WEIGHTS[name]
+    scores = np.minimum(scores, MAX_PRIORITY_SCORE)
+
+    # Only flagged rows need text, and those are the minority
+    notes: List[Optional[str]] = [None] * rows
+    for row in np.flatnonzero(scores).tolist():
+        findings = []
+        if end_before_start[row]:
+            findings.append("End date is before the start date")
+        if starts_in_future[row]:
+            findings.append("Start date is in the future")
+        if overlap[row]:
+            findings.append(f"Overlaps an earlier role by {overlap_months[row]} months")
+        if multiple_current[row]:
+            findings.append(f"One of {current_count[row]} roles marked as current")
+        if gap[row]:
+            findings.append(f"Unexplained gap of {gap_months[row]} months before this role")
+        notes[row] = "; ".join(findings)
+
+    candidate_scores = np.minimum(
+        np.bincount(candidate_index, weights=scores, minlength=len(unique_candidates)),
+        MAX_PRIORITY_SCORE
+    ).astype(np.int64)
+
+    return {
+        "scores": scores,
+        "notes": notes,
+        "candidate_ids": unique_candidates,
+        "candidate_scores": candidate_scores,
+    }
+
+def _load_claims(db, model, batch_id: int):
+    # Core execution skips ORM row processing, which dominates at this row count
+    return db.connection().execute(
+        select(
+            model.id, model.candidate_id, model.start_year, model.start_month,
+            model.end_year, model.end_month, model.is_current
+        )
+        .join(models.Candidate, models.Candidate.id == model.candidate_id)
+        .where(models.Candidate.batch_id == batch_id)
+    ).fetchall()
+
+def _column(np, values):
+    # None becomes NaN in a float array and then the -1 "missing" marker
+    return np.nan_to_num(np.array(values, dtype=float), nan=-1).astype(np.int64)
+
+def run_timeline_checks(batch_id: int) -> Optional[Dict[str, int]]:
+    """Analyze a whole batch and store machine notes and priority scores. Safe to re-run; None if the batch does not exist."""
+    import numpy as np
+
+    with SessionLocal() as db:
+        if db.get(models.CandidateBatch, batch_id) is None:
+            return None
+
+        employment = _load_claims(db, models.Employment, batch_id)
+        education = _load_claims(db, models.Education, batch_id)
+        claims = employment + education
+
+        columns = list(zip(*claims)) or [()] * 7
+        result = analyze_timelines(
+            candidate_ids=_column(np, columns[1]),
+            is_employment=np.arange(len(claims)) < len(employment),
+            start_year=_column(np, columns[2]),
+            start_month=_column(np, columns[3]),
+            end_year=_column(np, columns[4]),
+            end_month=_column(np, columns[5]),
+            is_current=_column(np, columns[6]) > 0
+        )
+
+        batch_candidates = select(models.Candidate.id).where(models.Candidate.batch_id == batch_id)
+        for model in (models.Employment, models.Education):
+            db.execute(
+                update(model)
+                .where(model.candidate_id.in_(batch_candidates), model.priority_score != 0)
+                .values(machine_notes=None, priority_score=0)
+                .execution_options(synchronize_session=False)
+            )
+        db.execute(
+            update(models.Candidate)
+            .where(models.Candidate.batch_id == batch_id, models.Candidate.priority_score != 0)
+            .values(priority_score=0)
+            .execution_options(synchronize_session=False)
+        )
+
+        flagged = np.flatnonzero(result["scores"]).tolist()
+        for model, rows in (
+            (models.Employment, [row for row in flagged if row < len(employment)]),
+            (models.Education, [row for row in flagged if row >= len(employment)]),
+        ):
+            if rows:
+                db.execute(update(model), [
+                    {"id": claims[row][0], "machine_notes": result["notes"][row], "priority_score": int(result["scores"][row])}
+                    for row in rows
+                ])
+
+        scored = np.flatnonzero(result["candidate_scores"]).tolist()
+        if scored:
+            db.execute(update(models.Candidate), [
+                {"id": int(result["candidate_ids"][i]), "priority_score": int(result["candidate_scores"][i])}
+                for i in scored
+            ])
+
+        db.execute(
+            update(models.CandidateBatch)
+            .where(models.CandidateBatch.id == batch_id)
+            .values(timeline_checked_at=datetime.utcnow())
+        )
+        db.commit()
+
+    return {
+        "claims_checked": len(claims),
+        "flagged_claims": len(flagged),
+        "flagged_candidates": len(scored),
+    }
+
+def run_timeline_checks_in_background(batch_id: int) -> None:
+    # Runs after the upload response was sent, so a failure can only be logged
+    try:
+        run_timeline_checks(batch_id)
+    except Exception:
+        logger.exception("Timeline checks failed for batch %s", batch_id)
\ No newline at end of file
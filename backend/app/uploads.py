@@ -0,0 +1,256 @@
+"""
+Resumable uploads for files too large to send in one request.
+
+A recruiter opens an upload session with the size of the file, sends it in
+chunks with PUT .../chunks?offset=N and an X-Chunk-SHA256 header, and
+finalizes it, which runs the same ingest as POST /upload/csv, /upload/xlsx
+or /upload/pdf. Each request streams its chunk to a file of its own under
+UPLOAD_SPOOL_PATH while the digest is computed. Only a chunk whose digest
+matches is copied into the upload's spool file, under a lock on the upload
+(spool_lock) and at the received_bytes read again under that lock, and
+received_bytes then advances in the same lock. Bytes that were accepted are
+never overwritten, so a retried or duplicate request cannot damage them;
+whatever lies past received_bytes is overwritten by the next chunk.
+
+After a dropped connection the client asks GET /uploads/{id} where to
+continue. A chunk that was already received is accepted again without
+changes as long as its bytes are the same. Chunks must arrive in order; a
+chunk past received_bytes is rejected with 409 and an Upload-Offset header.
+
+Finalizing moves the upload from open to finalizing and stamps
+finalize_started_at; the upload is marked completed with its batch id in
+the transaction that commits the batch, so a finalize sent again after any
+later failure returns that batch instead of ingesting the file twice. A
+finalize that failed before its commit reopens the upload. One whose worker
+died leaves it finalizing, and after UPLOAD_FINALIZE_TIMEOUT_SECONDS another
+finalize may take it over; should the first one still be running, it then
+fails instead of completing.
+
+Sessions live in upload_sessions so every worker can continue them, but the
+spool files and their locks are on local disk: workers on several hosts need
+UPLOAD_SPOOL_PATH on a shared volume that supports flock(). Sessions not
+touched for UPLOAD_SESSION_TTL_HOURS are purged with their spool files by
+purge_expired_uploads(), which opening a session runs in the background at
+most every UPLOAD_PURGE_INTERVAL_SECONDS.
+"""
+
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select
+
+from . import models
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_SPOOL_PATH = os.getenv("UPLOAD_SPOOL_PATH", "./upload_spool")
+# Chunk size suggested to clients; any size up to UPLOAD_MAX_CHUNK_BYTES is accepted
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+UPLOAD_MAX_CHUNK_BYTES = int(os.getenv("UPLOAD_MAX_CHUNK_BYTES", str(32 * 1024 * 1024)))
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(1024 * 1024 * 1024)))
+UPLOAD_SESSION_TTL_HOURS = float(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+UPLOAD_PURGE_INTERVAL_SECONDS = float(os.getenv("UPLOAD_PURGE_INTERVAL_SECONDS", "600"))
+UPLOAD_FINALIZE_TIMEOUT_SECONDS = float(os.getenv("UPLOAD_FINALIZE_TIMEOUT_SECONDS", "1800"))
+
+OPEN = "open"
+FINALIZING = "finalizing"
+COMPLETED = "completed"
+
+# Received chunk data is written to disk in pieces of this size
+SPOOL_WRITE_BYTES = 1024 * 1024
+
+# Files under UPLOAD_SPOOL_PATH, named after the upload id
+SPOOL_SUFFIXES = (".part", ".lock", ".chunk")
+
+class ChunkTooLarge(ValueError):
+    pass
+
+class FinalizeTakenOver(Exception):
+    """The finalize ran past UPLOAD_FINALIZE_TIMEOUT_SECONDS and another one took the upload over"""
+
+def new_upload_id() -> str:
+    return uuid.uuid4().hex
+
+def expires_at(now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.utcnow()) + timedelta(hours=UPLOAD_SESSION_TTL_HOURS)
+
+def finalize_stale_before(now: Optional[datetime] = None) -> datetime:
+    """Finalizes started before this are taken to have died with their worker"""
+    return (now or datetime.utcnow()) - timedelta(seconds=UPLOAD_FINALIZE_TIMEOUT_SECONDS)
+
+def _check_upload_id(upload_id: str) -> None:
+    if len(upload_id) != 32 or any(c not in "0123456789abcdef" for c in upload_id):
+        raise ValueError(f"Invalid upload id {upload_id!r}")
+
+def spool_path(upload_id: str, root: str = UPLOAD_SPOOL_PATH) -> str:
+    _check_upload_id(upload_id)
+    return os.path.join(os.path.abspath(root), f"{upload_id}.part")
+
+def chunk_path(upload_id: str, root: str = UPLOAD_SPOOL_PATH) -> str:
+    """A new file for one request to stream its chunk to, before it is known whether the chunk is accepted"""
+    _check_upload_id(upload_id)
+    return os.path.join(os.path.abspath(root), f"{upload_id}.{uuid.uuid4().hex}.chunk")
+
+def _lock_spool(path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lock = open(f"{path[:-len('.part')]}.lock", "a+b")
+    try:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+    except BaseException:
+        lock.close()
+        raise
+    return lock
+
+def _unlock_spool(lock) -> None:
+    try:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+    finally:
+        lock.close()
+
+@asynccontextmanager
+async def spool_lock(path: str) -> AsyncIterator[None]:
+    """Exclusive lock on the spool file at `path`, across requests and workers on the same host"""
+    lock = await run_in_threadpool(_lock_spool, path)
+    try:
+        yield
+    finally:
+        await run_in_threadpool(_unlock_spool, lock)
+
+async def receive_chunk(stream: AsyncIterator[bytes], path: str) -> Tuple[int, str]:
+    """
+    Stream a chunk from `stream` into a new file at `path` (see chunk_path), the spool file is not touched.
+    Returns its size and SHA-256 hex digest; raises ChunkTooLarge past UPLOAD_MAX_CHUNK_BYTES.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    pending = []
+    pending_size = 0
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    chunk = await run_in_threadpool(open, path, "xb")
+    try:
+        async for piece in stream:
+            size += len(piece)
+            if size > UPLOAD_MAX_CHUNK_BYTES:
+                raise ChunkTooLarge(f"Chunks may be at most {UPLOAD_MAX_CHUNK_BYTES} bytes")
+            digest.update(piece)
+            pending.append(piece)
+            pending_size += len(piece)
+            if pending_size >= SPOOL_WRITE_BYTES:
+                await run_in_threadpool(chunk.write, b"".join(pending))
+                pending, pending_size = [], 0
+        await run_in_threadpool(chunk.write, b"".join(pending))
+    finally:
+        await run_in_threadpool(chunk.close)
+    return size, digest.hexdigest()
+
+def write_chunk(path: str, chunk: str, offset: int) -> None:
+    """
+    Copy a received chunk file into the spool file at `offset`, dropping anything past its end.
+    Call it holding spool_lock() with `offset` equal to the received_bytes read under that lock.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "r+b" if os.path.exists(path) else "w+b") as spool, open(chunk, "rb") as source:
+        spool.seek(offset)
+        shutil.copyfileobj(source, spool, SPOOL_WRITE_BYTES)
+        spool.truncate(spool.tell())
+        spool.flush()
+        os.fsync(spool.fileno())
+
+def spool_digest(path: str, offset: int = 0, size: Optional[int] = None) -> str:
+    """SHA-256 hex digest of `size` bytes of the spool file from `offset`, or of the rest of the file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as spool:
+        spool.seek(offset)
+        remaining = size
+        while remaining is None or remaining > 0:
+            piece = spool.read(SPOOL_WRITE_BYTES if remaining is None else min(SPOOL_WRITE_BYTES, remaining))
+            if not piece:
+                break
+            digest.update(piece)
+            if remaining is not None:
+                remaining -= len(piece)
+    return digest.hexdigest()
+
+def read_spool(path: str, size: int, sha256: Optional[str] = None) -> bytes:
+    """The first `size` bytes of the spool file, checked against the digest of the whole file if one was given"""
+    with open(path, "rb") as spool:
+        data = spool.read(size)
+    if len(data) != size:
+        raise ValueError(f"Only {len(data)} of {size} bytes of the upload are in the spool file")
+    if sha256 is not None and hashlib.sha256(data).hexdigest() != sha256:
+        raise ValueError("The received file does not match the SHA-256 given when the upload was opened")
+    return data
+
+def remove_spool(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def remove_upload_files(upload_id: str, root: str = UPLOAD_SPOOL_PATH) -> None:
+    """Remove the spool file of an upload and its lock"""
+    path = spool_path(upload_id, root)
+    remove_spool(path)
+    remove_spool(f"{path[:-len('.part')]}.lock")
+
+def purge_expired_uploads(db, now: Optional[datetime] = None, root: str = UPLOAD_SPOOL_PATH) -> int:
+    """
+    Delete upload sessions past their expiry with their spool files, and spool files without a session
+    that were not modified for UPLOAD_SESSION_TTL_HOURS. Returns how many sessions were deleted.
+
+    Takes a synchronous Session and commits.
+    """
+    now = now or datetime.utcnow()
+    Upload = models.UploadSession
+    expired = db.scalars(select(Upload.id).where(Upload.expires_at < now)).all()
+    if expired:
+        db.execute(delete(Upload).where(Upload.id.in_(expired)))
+        db.commit()
+    for upload_id in expired:
+        remove_upload_files(upload_id, root)
+    
+    root = os.path.abspath(root)
+    if not os.path.isdir(root):
+        return len(expired)
+    cutoff = time.time() - UPLOAD_SESSION_TTL_HOURS * 3600
+    # Spool files and locks of deleted sessions, and chunks left behind by a worker that died
+    orphans = {
+        entry.name: entry.name[:32]
+        for entry in os.scandir(root)
+        if entry.name.endswith(SPOOL_SUFFIXES) and entry.stat().st_mtime < cutoff
+    }
+    if orphans:
+        known = set(db.scalars(select(Upload.id).where(Upload.id.in_(set(orphans.values())))).all())
+        for name, upload_id in orphans.items():
+            if upload_id not in known or name.endswith(".chunk"):
+                remove_spool(os.path.join(root, name))
+    return len(expired)
+
+_last_purge: Optional[float] = None
+_purge_lock = threading.Lock()
+
+def purge_expired_uploads_in_background() -> None:
+    # Runs after the response was sent, so a failure can only be logged
+    global _last_purge
+    with _purge_lock:
+        if _last_purge is not None and time.monotonic() - _last_purge < UPLOAD_PURGE_INTERVAL_SECONDS:
+            return
+        _last_purge = time.monotonic()
+    try:
+        with SessionLocal() as db:
+            purged = purge_expired_uploads(db)
+        if purged:
+            logger.info("Purged %d expired upload sessions", purged)
+    except Exception:
+        logger.exception("Purging expired upload sessions failed")
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Mapping of spreadsheet columns to candidate fields, shared by the CSV and XLSX parsers.
+
+Column names are matched case-insensitively after stripping whitespace:
+- Full Name / Name / Candidate Name
+- Email
+- Phone
+- LinkedIn / LinkedIn URL
+- Company N, Position N, Start Date N, End Date N, Current N, Description N
+- Education N, Degree N, Field N, Edu Start N, Edu End N
+
+for as many numbered employment and education slots as the file has columns
+for. A mapping is kept as the column name of every field (see
+analyze_headers), which is what column mapping profiles store and recruiters
+edit, and is compiled into a ColumnMapping of column positions once per
+file; rows are then read by position, with None for an empty cell.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+NAME_COLUMNS = ("full name", "name", "candidate name", "full_name")
+EMAIL_COLUMNS = ("email", "email address", "e-mail")
+PHONE_COLUMNS = ("phone", "phone number", "telephone", "mobile")
+LINKEDIN_COLUMNS = ("linkedin", "linkedin url", "linkedin_url", "linkedin profile")
+
+CONTACT_FIELDS = {
+    "full_name": NAME_COLUMNS,
+    "email": EMAIL_COLUMNS,
+    "phone": PHONE_COLUMNS,
+    "linkedin_url": LINKEDIN_COLUMNS,
+}
+
+# Column name templates of each field of a numbered slot, preferred first; the first field must be present
+EMPLOYMENT_COLUMNS = {
+    "company": ("company {}", "company{}"),
+    "position": ("position {}", "position{}"),
+    "start_date": ("start date {}", "start_date_{}"),
+    "end_date": ("end date {}", "end_date_{}"),
+    "is_current": ("current {}", "current_{}"),
+    "description": ("description {}", "description_{}"),
+}
+EDUCATION_COLUMNS = {
+    "institution": ("education {}", "institution {}"),
+    "degree": ("degree {}", "degree_{}"),
+    "field": ("field {}", "field_of_study_{}"),
+    "start_date": ("edu start {}", "edu_start_{}"),
+    "end_date": ("edu end {}", "edu_end_{}"),
+}
+SLOT_COLUMNS = {"employment": EMPLOYMENT_COLUMNS, "education": EDUCATION_COLUMNS}
+
+# template -> (section, field, preference)
+_SLOT_TEMPLATES = {
+    template: (section, field, preference)
+    for section, fields in SLOT_COLUMNS.items()
+    for field, templates in fields.items()
+    for preference, template in enumerate(templates)
+}
+
+def normalize_header(header: Any) -> str:
+    return str(header).strip().lower() if header is not None else ""
+
+def header_fingerprint(headers: Sequence[Any]) -> str:
+    """SHA-256 hex digest of the normalized column names in order; files with the same one map the same way"""
+    return hashlib.sha256("\x1f".join(normalize_header(header) for header in headers).encode("utf-8")).hexdigest()
+
+def _first_positions(headers: Sequence[Any]) -> Dict[str, int]:
+    positions: Dict[str, int] = {}
+    for position, header in enumerate(headers):
+        positions.setdefault(normalize_header(header), position)
+    return positions
+
+def analyze_headers(headers: Sequence[Any]) -> Dict[str, Any]:
+    """The column name of every candidate field found among `headers`, by the rules above"""
+    positions = _first_positions(headers)
+    mapping: Dict[str, Any] = {
+        field: next((name for name in names if name in positions), None)
+        for field, names in CONTACT_FIELDS.items()
+    }
+    
+    # (section, slot number) -> field -> (preference, column name) of the best column so far
+    slots: Dict[Tuple[str, int], Dict[str, Tuple[int, str]]] = {}
+    for name in positions:
+        prefix = name.rstrip("0123456789")
+        number = name[len(prefix):]
+        template = _SLOT_TEMPLATES.get(f"{prefix}{{}}") if number and number[0] != "0" else None
+        if template is None:
+            continue
+        section, field, preference = template
+        columns = slots.setdefault((section, int(number)), {})
+        # The spaced name wins when both are present
+        columns[field] = min(columns.get(field, (preference, name)), (preference, name))
+    
+    for section, fields in SLOT_COLUMNS.items():
+        anchor = next(iter(fields))
+        mapping[section] = [
+            {field: columns[field][1] if field in columns else None for field in fields}
+            for (slot_section, _), columns in sorted(slots.items())
+            if slot_section == section and anchor in columns
+        ]
+    return mapping
+
+class ColumnMapping:
+    """Positions of the candidate fields among a file's columns"""
+    
+    def __init__(self, headers: Sequence[Any], names: Optional[Dict[str, Any]] = None):
+        """
+        Compile the column names in `names`, by default those analyze_headers() finds, to positions.
+        Raises ValueError for a name that is not among `headers`.
+        """
+        self.names = names if names is not None else analyze_headers(headers)
+        positions = _first_positions(headers)
+        
+        def position(name: Optional[str]) -> Optional[int]:
+            if name is None:
+                return None
+            found = positions.get(normalize_header(name))
+            if found is None:
+                raise ValueError(f"Column {name!r} is not in the file")
+            return found
+        
+        self.full_name = position(self.names.get("full_name"))
+        self.email = position(self.names.get("email"))
+        self.phone = position(self.names.get("phone"))
+        self.linkedin_url = position(self.names.get("linkedin_url"))
+        self.employment = [
+            {field: position(columns.get(field)) for field in EMPLOYMENT_COLUMNS}
+            for columns in self.names.get("employment") or []
+        ]
+        self.education = [
+            {field: position(columns.get(field)) for field in EDUCATION_COLUMNS}
+            for columns in self.names.get("education") or []
+        ]
+    
+    def candidate(self, row: Sequence[Any]) -> Optional[Dict[str, Any]]:
+        """The candidate in `row`, or None when it has no name"""
+        def text(position: Optional[int]) -> Optional[str]:
+            if position is None or position >= len(row) or row[position] is None:
+                return None
+            return str(row[position])
+        
+        full_name = text(self.full_name)
+        if not full_name:
+            return None
+        
+        employment: List[Dict[str, Any]] = []
+        for columns in self.employment:
+            company = text(columns["company"])
+            if company is None:
+                continue
+            current = text(columns["is_current"])
+            employment.append({
+                "company": company,
+                "position": text(columns["position"]) or "Unknown",
+                "start_date": text(columns["start_date"]),
+                "end_date": text(columns["end_date"]),
+                "is_current": current is not None and current.lower() in ("true", "yes", "1", "current"),
+                "description": text(columns["description"])
+            })
+        
+        education: List[Dict[str, Any]] = []
+        for columns in self.education:
+            institution = text(columns["institution"])
+            if institution is None:
+                continue
+            education.append({
+                "institution": institution,
+                "degree": text(columns["degree"]),
+                "field": text(columns["field"]),
+                "start_date": text(columns["start_date"]),
+                "end_date": text(columns["end_date"])
+            })
+        
+        return {
+            "full_name": full_name,
+            "email": text(self.email),
+            "phone": text(self.phone),
+            "linkedin_url": text(self.linkedin_url),
+            "employment": employment,
+            "education": education
+        }
\ No newline at end of file
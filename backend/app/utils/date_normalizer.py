@@ -0,0 +1,120 @@
+"""
+Normalize free-form CV dates ("Jan 2020", "2014", "03/2019", "Present") into
+year / month integers.
+
+CVs repeat a small set of date strings across a batch, so parsing is done
+once per distinct form: normalize_dates() deduplicates a whole batch before
+parsing, and parse_date() keeps an LRU cache of forms seen across batches.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Optional
+
+DATE_CACHE_SIZE = int(os.getenv("DATE_CACHE_SIZE", "4096"))
+
+MIN_YEAR = 1900
+MAX_YEAR = 2100
+
+PRESENT_WORDS = {
+    "present", "current", "currently", "now", "today", "ongoing", "till date", "to date",
+    "heute", "bis heute", "aktuell", "dato", "bis dato", "laufend",
+}
+
+MONTHS = {
+    "jan": 1, "january": 1, "januar": 1, "jän": 1, "jänner": 1,
+    "feb": 2, "february": 2, "februar": 2,
+    "mar": 3, "march": 3, "mär": 3, "märz": 3, "maerz": 3,
+    "apr": 4, "april": 4,
+    "may": 5, "mai": 5,
+    "jun": 6, "june": 6, "juni": 6,
+    "jul": 7, "july": 7, "juli": 7,
+    "aug": 8, "august": 8,
+    "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10, "okt": 10, "oktober": 10,
+    "nov": 11, "november": 11,
+    "dec": 12, "december": 12, "dez": 12, "dezember": 12,
+}
+
+# pandas renders year-only columns that contain blanks as floats ("2014.0")
+_YEAR = re.compile(r"^(\d{4})(?:\.0)?$")
+_YEAR_MONTH = re.compile(r"^(\d{4})[-/.](\d{1,2})(?:[-/.]\d{1,2})?(?:[t ].*)?$")
+_MONTH_YEAR = re.compile(r"^(\d{1,2})[-/.](\d{4})$")
+_DAY_MONTH_YEAR = re.compile(r"^(\d{1,2})([-/.])(\d{1,2})\2(\d{4})$")
+_NAMED_MONTH_YEAR = re.compile(r"^([a-zäé]+)\.?,?\s*(?:\d{1,2},?\s+)?(\d{4})$")
+_QUARTER_YEAR = re.compile(r"^q([1-4])[\s/-]*(\d{4})$|^(\d{4})[\s/-]*q([1-4])$")
+_ANY_YEAR = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
+
+class NormalizedDate(NamedTuple):
+    year: Optional[int] = None
+    month: Optional[int] = None
+    is_present: bool = False
+
+UNKNOWN = NormalizedDate()
+PRESENT = NormalizedDate(is_present=True)
+
+def _canonical(text: str) -> str:
+    return " ".join(text.strip().lower().split())
+
+def _valid(year: int, month: Optional[int] = None) -> NormalizedDate:
+    if not MIN_YEAR <= year <= MAX_YEAR:
+        return UNKNOWN
+    if month is not None and not 1 <= month <= 12:
+        month = None
+    return NormalizedDate(year, month)
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_canonical(text: str) -> NormalizedDate:
+    if not text or text in ("nan", "none", "null", "n/a", "-"):
+        return UNKNOWN
+    if text in PRESENT_WORDS:
+        return PRESENT
+
+    match = _YEAR.match(text)
+    if match:
+        return _valid(int(match.group(1)))
+
+    match = _YEAR_MONTH.match(text)
+    if match:
+        return _valid(int(match.group(1)), int(match.group(2)))
+
+    match = _MONTH_YEAR.match(text)
+    if match:
+        return _valid(int(match.group(2)), int(match.group(1)))
+
+    match = _DAY_MONTH_YEAR.match(text)
+    if match:
+        first, separator, second, year = int(match.group(1)), match.group(2), int(match.group(3)), int(match.group(4))
+        # Dotted dates are day-first (German style); slashes are month-first unless that is impossible
+        day_first = separator == "." or first > 12
+        return _valid(year, second if day_first else first)
+
+    match = _NAMED_MONTH_YEAR.match(text)
+    if match and match.group(1) in MONTHS:
+        return _valid(int(match.group(2)), MONTHS[match.group(1)])
+
+    match = _QUARTER_YEAR.match(text)
+    if match:
+        quarter, year = (match.group(1), match.group(2)) if match.group(1) else (match.group(4), match.group(3))
+        return _valid(int(year), (int(quarter) - 1) * 3 + 1)
+
+    # Anything else that carries a plausible year ("since 2018", "Summer 2019") keeps year precision
+    match = _ANY_YEAR.search(text)
+    if match:
+        return _valid(int(match.group(1)))
+
+    return UNKNOWN
+
+def parse_date(text: Optional[str]) -> NormalizedDate:
+    """Normalize a single free-form date. Unparseable or empty input gives an all-None result."""
+    if text is None:
+        return UNKNOWN
+    return _parse_canonical(_canonical(str(text)))
+
+def normalize_dates(values: Iterable[Optional[str]]) -> Dict[Optional[str], NormalizedDate]:
+    """Normalize a batch of raw date strings, parsing each distinct form only once"""
+    return {value: parse_date(value) for value in set(values)}
+
+def cache_info():
+    return _parse_canonical.cache_info()
\ No newline at end of file
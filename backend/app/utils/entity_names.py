@@ -0,0 +1,45 @@
+"""
+Normalize company and institution names for matching across candidates.
+
+"TechCorp GmbH", "Techcorp" and "TECHCORP Inc." all normalize to "techcorp";
+trigrams() then breaks a normalized name into the grams used for fuzzy lookups.
+"""
+
+import re
+import unicodedata
+from typing import FrozenSet, Optional
+
+COMPANY = "company"
+INSTITUTION = "institution"
+
+# Legal forms carry no identity, "TechCorp GmbH" and "TechCorp" are the same employer
+COMPANY_SUFFIXES = {
+    "gmbh", "ag", "se", "kg", "kgaa", "ohg", "ug", "ev", "mbh", "co", "cokg", "inc", "incorporated", "corp",
+    "corporation", "ltd", "limited", "llc", "llp", "plc", "sa", "sas", "sarl", "srl", "spa", "bv", "nv", "ab", "as", "oy",
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+def fold_ascii(text: str) -> str:
+    """Lowercase and strip accents, so "Müller" and "Muller" compare equal"""
+    text = unicodedata.normalize("NFKD", text.replace("ß", "ss"))
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+def normalize_entity_name(kind: str, name: Optional[str]) -> str:
+    """Lowercase, strip accents and punctuation and, for companies, trailing legal forms"""
+    if not name:
+        return ""
+    words = _NON_WORD.sub(" ", fold_ascii(name).replace("&", " and ")).split()
+    if kind == COMPANY:
+        # "GmbH & Co. KG" leaves a dangling "and" once the forms around it are gone
+        while len(words) > 1 and (words[-1] in COMPANY_SUFFIXES or words[-1] == "and"):
+            words.pop()
+    return " ".join(words)
+
+def trigrams(normalized: str) -> FrozenSet[str]:
+    """Word trigrams padded the way pg_trgm does it, so short words still produce grams"""
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
\ No newline at end of file
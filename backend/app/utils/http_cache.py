@@ -0,0 +1,42 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+
+def content_hash(content: str) -> str:
+    """SHA-256 hex digest of a text payload, used as the strong validator for immutable content"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def strong_etag(digest: str) -> str:
+    return f'"{digest}"'
+
+def weak_etag(*parts) -> str:
+    """Build a weak ETag from version markers such as timestamps and counters"""
+    token = "-".join("" if part is None else str(part) for part in parts)
+    return f'W/"{token}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against an ETag.
+
+    Uses the weak comparison function from RFC 7232, which is the one
+    required for If-None-Match, so W/ prefixes are ignored on both sides.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+
+    return False
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Normalized identity keys used to recognize the same person across batches.
+
+Email, phone and LinkedIn slug identify a candidate on their own. The name
+key only groups candidates into blocks that still need confirming (see
+app.dedup), since different people share names.
+"""
+
+import os
+import re
+from typing import Any, Dict, NamedTuple, Optional
+from urllib.parse import unquote
+
+from .entity_names import fold_ascii
+
+# Country code assumed for national numbers such as "030 1234567"
+DEFAULT_COUNTRY_CODE = os.getenv("DEDUP_DEFAULT_COUNTRY_CODE", "49")
+
+GMAIL_DOMAINS = {"gmail.com", "googlemail.com"}
+
+NAME_TITLES = {"dr", "prof", "mr", "mrs", "ms", "dipl", "ing", "mba", "phd", "msc", "bsc", "jr", "sr"}
+
+_LINKEDIN_PROFILE = re.compile(r"linkedin\.com/(?:in|pub)/([^/?#\s]+)", re.IGNORECASE)
+_LINKEDIN_SLUG = re.compile(r"^[\w%-]{3,100}$")
+_NAME_WORD = re.compile(r"[a-z]+")
+
+class IdentityKeys(NamedTuple):
+    email: Optional[str]
+    phone: Optional[str]
+    linkedin: Optional[str]
+    name: Optional[str]
+
+def normalize_email(value: Any) -> Optional[str]:
+    """Lowercased address without +tags; Gmail addresses also lose their dots"""
+    if not value:
+        return None
+    email = str(value).strip().lower()
+    if email.startswith("mailto:"):
+        email = email[len("mailto:"):]
+    local, at, domain = email.rpartition("@")
+    if not at or not local or "." not in domain:
+        return None
+    local = local.split("+", 1)[0]
+    if domain in GMAIL_DOMAINS:
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}" if local else None
+
+def normalize_phone(value: Any, default_country_code: str = DEFAULT_COUNTRY_CODE) -> Optional[str]:
+    """E.164 form ("+493012345678"); national numbers with a trunk "0" get the default country code"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    # Spreadsheet exports turn phone numbers into floats
+    if text.endswith(".0"):
+        text = text[:-2]
+    # "+49 (0)30 ..." carries the trunk prefix only for domestic callers
+    text = text.replace("(0)", "")
+    digits = re.sub(r"\D", "", text)
+    if text.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif digits.startswith("0"):
+        digits = default_country_code + digits[1:]
+    # Otherwise a leading country code most likely lost its "+" on the way, e.g. "447700900123"
+    if not 8 <= len(digits) <= 15:
+        return None
+    return "+" + digits
+
+def linkedin_slug(value: Any) -> Optional[str]:
+    """Profile slug from a LinkedIn URL, or the value itself when it already is one"""
+    if not value:
+        return None
+    text = str(value).strip()
+    match = _LINKEDIN_PROFILE.search(text)
+    if match:
+        slug = match.group(1)
+    elif _LINKEDIN_SLUG.match(text):
+        slug = text
+    else:
+        return None
+    return unquote(slug).strip().lower() or None
+
+def name_block_key(value: Any) -> Optional[str]:
+    """"last first" from a full name, ignoring titles, initials and middle names"""
+    if not value:
+        return None
+    text = fold_ascii(str(value))
+    # "Doe, John" puts the family name first
+    if "," in text:
+        last, _, first = text.partition(",")
+        text = f"{first} {last}"
+    words = [word for word in _NAME_WORD.findall(text) if len(word) > 1 and word not in NAME_TITLES]
+    if len(words) < 2:
+        return None
+    return f"{words[-1]} {words[0]}"
+
+def identity_keys(candidate_data: Dict[str, Any]) -> IdentityKeys:
+    return IdentityKeys(
+        email=normalize_email(candidate_data.get("email")),
+        phone=normalize_phone(candidate_data.get("phone")),
+        linkedin=linkedin_slug(candidate_data.get("linkedin_url")),
+        name=name_block_key(candidate_data.get("full_name")),
+    )
\ No newline at end of file
@@ -1,14 +1,18 @@
-import pdfplumber
 import io
 import re
 from typing import Dict, Any, List
 
+from ..metrics import PARSE_SECONDS
+
+@PARSE_SECONDS.labels("pdf").time()
 def parse_pdf_cv(pdf_content: bytes) -> Dict[str, Any]:
     """
     Parse PDF CV and extract structured data.
     
     This is a basic parser - for production, you'd want ML-based parsing.
     """
+    # Imported on first use to keep pdfplumber and its dependencies out of worker startup
+    import pdfplumber
     
     try:
         candidate = {
@@ -0,0 +1,86 @@
+"""
+Streaming parser for Excel (XLSX) exports.
+
+openpyxl's read-only mode parses the worksheet XML while the rows are
+iterated, so candidates come out in chunks of XLSX_CHUNK_ROWS and a large
+workbook is never loaded as a whole. The first worksheet is read; its first
+non-empty row holds the column names, which are mapped like CSV columns
+(app.utils.column_mapping) or by the `columns` callable given.
+"""
+
+import io
+import os
+import time
+from datetime import date, datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Sequence, Union
+
+from ..metrics import PARSE_SECONDS
+from .column_mapping import ColumnMapping
+
+XLSX_CHUNK_ROWS = int(os.getenv("XLSX_CHUNK_ROWS", "1000"))
+
+def _cell_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return value if value.strip() else None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    # Excel stores every number as a float; years and phone numbers read better without ".0"
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def iter_xlsx_candidates(
+    source: Union[bytes, BinaryIO],
+    chunk_rows: int = XLSX_CHUNK_ROWS,
+    columns: Callable[[Sequence[Any]], ColumnMapping] = ColumnMapping
+) -> Iterator[List[Dict[str, Any]]]:
+    """Candidates of the first worksheet in lists of up to `chunk_rows`"""
+    # Imported on first use like pandas and pdfplumber
+    from openpyxl import load_workbook
+    
+    # Only the time spent in here counts as parsing, not what the caller does with each chunk
+    parse_seconds = 0.0
+    started = time.perf_counter()
+    try:
+        workbook = load_workbook(io.BytesIO(source) if isinstance(source, bytes) else source, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f"Error parsing XLSX: {str(e)}")
+    
+    try:
+        mapping = None
+        chunk: List[Dict[str, Any]] = []
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            if mapping is None:
+                if any(value is not None for value in row):
+                    mapping = columns(row)
+                continue
+            
+            candidate = mapping.candidate([_cell_value(value) for value in row])
+            if candidate is None:
+                continue
+            chunk.append(candidate)
+            if len(chunk) >= chunk_rows:
+                parse_seconds += time.perf_counter() - started
+                started = None
+                yield chunk
+                started = time.perf_counter()
+                chunk = []
+        
+        if chunk:
+            parse_seconds += time.perf_counter() - started
+            started = None
+            yield chunk
+    finally:
+        workbook.close()
+        if started is not None:
+            parse_seconds += time.perf_counter() - started
+        PARSE_SECONDS.labels("xlsx").observe(parse_seconds)
+
+def parse_xlsx_candidates(
+    source: Union[bytes, BinaryIO],
+    columns: Callable[[Sequence[Any]], ColumnMapping] = ColumnMapping
+) -> List[Dict[str, Any]]:
+    """All candidates of the first worksheet at once"""
+    return [candidate for chunk in iter_xlsx_candidates(source, columns=columns) for candidate in chunk]
\ No newline at end of file
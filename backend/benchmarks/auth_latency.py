@@ -0,0 +1,97 @@
+"""
+Latency of authenticated requests under concurrency.
+
+Every users lookup is slowed down artificially so that a dependency which
+runs the synchronous Session on the event loop shows up as head-of-line
+blocking. The "blocking" mode reinstates the old inline lookup through a
+dependency override; the "threadpool" mode uses app.auth as shipped. The
+principal cache is disabled so every request resolves the user from the DB.
+
+    python -m benchmarks.auth_latency --concurrency 50 --requests 1000 --query-delay-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import use_scratch_database, summarize, seed_users
+
+async def _run_mode(app, token, concurrency, total_requests):
+    import httpx
+
+    latencies = {"/api/auth/me": [], "/health": []}
+    remaining = iter(range(total_requests))
+
+    async def client_loop(client):
+        for i in remaining:
+            path = "/api/auth/me" if i % 2 == 0 else "/health"
+            started = time.perf_counter()
+            response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+            latencies[path].append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "throughput_rps": round(total_requests / elapsed, 1),
+        "endpoints": {path: summarize(values) for path, values in latencies.items()},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--query-delay-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    use_scratch_database()
+    os.environ["PRINCIPAL_CACHE_TTL_SECONDS"] = "0"
+
+    from fastapi import Depends, HTTPException
+    from sqlalchemy import event
+
+    from app import auth, models
+    from app.database import Base, SessionLocal, engine, get_db, DbSession
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    users = seed_users(db)
+    token = auth.create_access_token({"sub": users["verifier"].email})
+    db.close()
+
+    delay = args.query_delay_ms / 1000.0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def slow_users_lookup(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            time.sleep(delay)
+
+    async def blocking_get_current_user(
+        token: str = Depends(auth.oauth2_scheme),
+        db: DbSession = Depends(get_db)
+    ):
+        from jose import jwt
+
+        payload = jwt.decode(token, auth.SECRET_KEY, algorithms=[auth.ALGORITHM])
+        user = db.sync_session.query(models.User).filter(models.User.email == payload.get("sub")).first()
+        if user is None:
+            raise HTTPException(status_code=401)
+        return user
+
+    results = {}
+    app.dependency_overrides[auth.get_current_user] = blocking_get_current_user
+    results["blocking"] = asyncio.run(_run_mode(app, token, args.concurrency, args.requests))
+    app.dependency_overrides.clear()
+    results["threadpool"] = asyncio.run(_run_mode(app, token, args.concurrency, args.requests))
+
+    print(json.dumps({"config": vars(args), "results": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
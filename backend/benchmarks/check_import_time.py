@@ -0,0 +1,90 @@
+"""
+Fail when importing the application gets slower or pulls in heavy modules.
+
+Runs `python -X importtime` on `import app.main` in fresh interpreters. The
+web framework and ORM are imported first, so the measured time is what the
+application itself adds (routers, models, schemas and whatever they import
+at module level). Two checks:
+
+- the median cost over --runs must stay under the budget
+  (--budget-ms, default IMPORT_TIME_BUDGET_MS or 500 ms)
+- none of the parsing / tooling packages that are only needed on specific
+  code paths may be imported at startup
+
+    python -m benchmarks.check_import_time
+    python -m benchmarks.check_import_time --runs 7 --budget-ms 400
+
+Exits with status 1 when either check fails.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.common import use_scratch_database
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported before the application so their cost is excluded from the measurement
+FRAMEWORK_MODULES = ("fastapi", "sqlalchemy", "sqlalchemy.orm", "pydantic")
+
+# Packages that must be imported lazily, on the code path that needs them
+LAZY_ONLY_PACKAGES = ("pandas", "numpy", "pdfplumber", "pdfminer", "openpyxl", "alembic", "jose", "passlib", "cryptography")
+
+def _measure_once():
+    code = f"import {', '.join(FRAMEWORK_MODULES)}; import app.main"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    cumulative_us = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, self_us, total_us, name = (part.strip() for part in line.replace("import time:", "|", 1).split("|"))
+        if total_us.isdigit():
+            cumulative_us[name] = int(total_us)
+    return cumulative_us
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_TIME_BUDGET_MS", "500")))
+    args = parser.parse_args()
+
+    use_scratch_database("import_time.db")
+
+    runs = [_measure_once() for _ in range(args.runs)]
+    app_ms = statistics.median(run["app.main"] / 1000 for run in runs)
+    heavy = sorted({
+        name.split(".", 1)[0] for run in runs for name in run
+        if name.split(".", 1)[0] in LAZY_ONLY_PACKAGES
+    })
+    slowest = sorted(
+        ((name, total / 1000) for name, total in runs[-1].items() if name.startswith("app.") and name != "app.main"),
+        key=lambda item: item[1], reverse=True
+    )[:8]
+
+    print(json.dumps({
+        "app_import_ms": round(app_ms, 1),
+        "budget_ms": args.budget_ms,
+        "runs": [round(run["app.main"] / 1000, 1) for run in runs],
+        "slowest_app_modules_ms": {name: round(ms, 1) for name, ms in slowest},
+        "heavy_modules_at_startup": heavy,
+    }, indent=2))
+
+    failed = False
+    if app_ms > args.budget_ms:
+        print(f"\nImporting app.main takes {app_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if heavy:
+        print(f"\nModules that should be imported lazily are loaded at startup: {', '.join(heavy)}")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
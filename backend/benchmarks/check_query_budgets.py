@@ -0,0 +1,137 @@
+"""
+Fail when an endpoint's query count grows with the data it returns.
+
+Runs the app with SQL_PROFILE=true against a scratch database and profiles
+the endpoints that have had N+1 problems before with profile_queries(), so
+background tasks started by a request are counted too. Every endpoint is
+called twice: once with a small batch (--small candidates) and once with a
+batch --factor times larger. A fixed number of queries is expected for both;
+more queries for the larger batch, or more than the endpoint's budget, fails
+the check.
+
+    python -m benchmarks.check_query_budgets
+    DB_ASYNC=true python -m benchmarks.check_query_budgets
+
+Exits with status 1 and prints the repeated statements when a check fails.
+"""
+
+import json
+import os
+import sys
+
+from benchmarks.common import use_scratch_database, seed_users
+
+# Most queries an endpoint may issue, including its background tasks
+QUERY_BUDGETS = {
+    # The first upload of a header row also looks up and saves its column mapping profile
+    "upload csv": 14,
+    "batch list": 3,
+    "batch detail": 6,
+    "candidate detail": 5,
+    "pending queue": 7,
+    "claim next": 12,
+    "my queue": 5,
+    "complete verification": 9,
+    "generate report": 8,
+}
+
+def _csv(prefix, candidates):
+    rows = ["Full Name,Email,Company 1,Position 1,Start Date 1,End Date 1,Company 2,Position 2,Start Date 2,End Date 2,Education 1,Degree 1,Edu End 1"]
+    for i in range(candidates):
+        rows.append(
+            f"{prefix} Candidate {i},{prefix.lower()}.{i}@example.com,Company {i} GmbH,Engineer,Jan 2015,Dec 2018,"
+            f"Other {i} AG,Lead,Jan 2019,Present,University {i % 7},BSc,2014"
+        )
+    return ("\n".join(rows) + "\n").encode()
+
+def _scenario(client, headers, prefix, candidates):
+    """QueryProfile per endpoint for one batch of `candidates`"""
+    from app.sql_profiling import profile_queries
+    
+    profiles = {}
+    
+    def call(name, method, url, role, **kwargs):
+        with profile_queries() as profile:
+            response = client.request(method, url, headers=headers[role], **kwargs)
+        assert response.status_code == 200, (name, response.status_code, response.text)
+        assert "x-db-queries" in response.headers, "SqlProfilingMiddleware is not installed"
+        profiles[name] = profile
+        return response.json() if response.headers["content-type"].startswith("application/json") else None
+    
+    upload = call(
+        "upload csv", "POST", "/api/candidates/upload/csv", "recruiter",
+        files={"file": ("batch.csv", _csv(prefix, candidates), "text/csv")}, data={"batch_name": prefix}
+    )
+    batch_id = upload["batch_id"]
+    call("batch list", "GET", "/api/candidates/batches", "recruiter")
+    batch = call("batch detail", "GET", f"/api/candidates/batch/{batch_id}", "recruiter")
+    candidate_id = batch["candidates"][0]["id"]
+    call("candidate detail", "GET", f"/api/candidates/{candidate_id}", "recruiter")
+    call("pending queue", "GET", "/api/verification/pending", "verifier")
+    
+    candidate = call("claim next", "POST", "/api/verification/next", "verifier")
+    call("my queue", "GET", "/api/verification/my-queue", "verifier")
+    for kind, key in (("employment", "employment_history"), ("education", "education_history")):
+        for claim in candidate[key]:
+            response = client.put(
+                f"/api/verification/{kind}/{claim['id']}", headers=headers["verifier"],
+                json={"claim_status": "VERIFIED", "verification_note": "ok", "verification_sources": ["registry"]}
+            )
+            assert response.status_code == 200, response.text
+    call("complete verification", "POST", f"/api/verification/complete/{candidate['id']}", "verifier")
+    call("generate report", "POST", f"/api/reports/generate/{candidate['id']}", "recruiter")
+    return profiles
+
+def _counted_queries(profile, dialect):
+    # SQLite cannot match RETURNING rows to their parameters, so the ORM flushes one INSERT per
+    # row there; PostgreSQL batches them, so on PostgreSQL they count like any other statement
+    if dialect != "sqlite":
+        return profile.queries
+    return sum(count for shape, count in profile.shapes.items() if not shape.startswith("INSERT"))
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--small", type=int, default=3)
+    parser.add_argument("--factor", type=int, default=10)
+    args = parser.parse_args()
+    
+    use_scratch_database("budgets.db")
+    os.environ["SQL_PROFILE"] = "true"
+    os.environ.setdefault("BLOB_STORE_PATH", os.path.join(os.path.dirname(os.environ["DATABASE_URL"].split("///", 1)[-1]), "blobs"))
+    
+    from fastapi.testclient import TestClient
+    
+    from app import auth
+    from app.database import SessionLocal, engine
+    from app.main import app
+    from app.migrations import upgrade_database
+    
+    upgrade_database()
+    with SessionLocal() as db:
+        users = seed_users(db)
+        headers = {
+            role: {"Authorization": f"Bearer {auth.create_access_token({'sub': user.email})}"}
+            for role, user in users.items()
+        }
+    
+    with TestClient(app) as client:
+        small = _scenario(client, headers, "Small", args.small)
+        large = _scenario(client, headers, "Large", args.small * args.factor)
+    
+    failures = []
+    for name, budget in QUERY_BUDGETS.items():
+        small_queries, large_queries = (_counted_queries(profiles[name], engine.dialect.name) for profiles in (small, large))
+        ok = large_queries <= small_queries and large_queries <= budget
+        print(f"[{'ok' if ok else 'FAIL'}] {name}: {small_queries} -> {large_queries} queries (budget {budget})")
+        if not ok:
+            failures.append(name)
+            print(json.dumps(large[name].summary(), indent=2))
+    
+    if failures:
+        print(f"\n{len(failures)} endpoints exceed their query budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""
+Fail when a hot query falls back to a full table scan or sorts its rows.
+
+Builds a scratch database through the Alembic migrations (so missing
+migrations are caught, not just missing model indexes), seeds it, and
+inspects the plan of every query on the hot paths. SQLite plans are read
+from EXPLAIN QUERY PLAN; on PostgreSQL sequential scans are disabled for
+the session so any remaining "Seq Scan" means no usable index exists.
+Every ordered hot query has an index in its order, so a sort step in a
+plan means the index no longer matches the query.
+
+    python -m benchmarks.check_query_plans            # scratch SQLite database
+    DATABASE_URL=postgresql://... python -m benchmarks.check_query_plans
+
+Exits with status 1 and lists the offending plans when a check fails.
+"""
+
+import json
+import re
+import sys
+from datetime import datetime, timedelta
+
+from benchmarks.common import use_scratch_database
+
+def hot_queries():
+    from sqlalchemy import and_, func, or_, select
+
+    from app import models
+
+    Candidate, Employment, Education = models.Candidate, models.Employment, models.Education
+    Status, ClaimStatus = models.VerificationStatus, models.ClaimStatus
+
+    return {
+        # As /api/verification/pending reads it
+        "pending queue": select(Candidate).where(
+            Candidate.verification_status == Status.PENDING
+        ).order_by(Candidate.effort_estimate, Candidate.id),
+        "verifier queue": select(Candidate).where(
+            Candidate.verifier_id == 1, Candidate.verification_status == Status.IN_PROGRESS
+        ).order_by(Candidate.created_at),
+        "verifier stats": select(func.count()).select_from(Candidate).where(
+            Candidate.verifier_id == 1, Candidate.verification_status == Status.COMPLETED
+        ),
+        "available count": select(func.count()).select_from(Candidate).where(Candidate.verification_status == Status.PENDING),
+        "batch completion count": select(func.count()).select_from(Candidate).where(
+            Candidate.batch_id == 1, Candidate.verification_status == Status.COMPLETED
+        ),
+        "batch version": select(func.max(Candidate.updated_at)).where(Candidate.batch_id == 1),
+        "next candidate of a batch": select(Candidate.id, Candidate.effort_estimate).where(
+            Candidate.batch_id == 1, Candidate.verification_status == Status.PENDING
+        ).order_by(Candidate.effort_estimate, Candidate.id).limit(1),
+        "active batches": select(models.CandidateBatch.id, models.CandidateBatch.served_effort).where(
+            models.CandidateBatch.status != Status.COMPLETED,
+            select(Candidate.id).where(
+                Candidate.batch_id == models.CandidateBatch.id, Candidate.verification_status == Status.PENDING
+            ).exists()
+        ),
+        "pending employment claims": select(func.count()).select_from(Employment).where(
+            Employment.candidate_id == 1, Employment.claim_status == ClaimStatus.PENDING
+        ),
+        "pending education claims": select(func.count()).select_from(Education).where(
+            Education.candidate_id == 1, Education.claim_status == ClaimStatus.PENDING
+        ),
+        "candidate employment": select(Employment).where(Employment.candidate_id.in_([1, 2, 3])),
+        "candidate education": select(Education).where(Education.candidate_id.in_([1, 2, 3])),
+        "latest report": select(models.Report.id, models.Report.content_hash).where(
+            models.Report.candidate_id == 1
+        ).order_by(models.Report.generated_at.desc()).limit(1),
+        "employment during a year": select(Employment.candidate_id).where(
+            func.lower(Employment.company_name) == "techcorp gmbh",
+            Employment.start_year <= 2019,
+            or_(Employment.end_year >= 2019, and_(Employment.end_year.is_(None), Employment.is_current.is_(True)))
+        ),
+        "duplicates by email": select(Candidate.id, Candidate.duplicate_of_id, Candidate.email_key).where(
+            Candidate.email_key.in_(["c1@example.com", "c2@example.com"]), Candidate.batch_id != 1
+        ),
+        "duplicates by phone": select(Candidate.id, Candidate.duplicate_of_id, Candidate.phone_key).where(
+            Candidate.phone_key.in_(["+4930100001", "+4930100002"]), Candidate.batch_id != 1
+        ),
+        "duplicates by linkedin": select(Candidate.id, Candidate.duplicate_of_id, Candidate.linkedin_key).where(
+            Candidate.linkedin_key.in_(["candidate-1", "candidate-2"]), Candidate.batch_id != 1
+        ),
+        "duplicates by name block": select(Candidate.id, Candidate.duplicate_of_id, Candidate.name_key).where(
+            Candidate.name_key.in_(["1 candidate", "2 candidate"]), Candidate.batch_id != 1
+        ),
+        "duplicate cluster": select(Candidate).where(or_(Candidate.id == 1, Candidate.duplicate_of_id == 1)),
+        "recruiter batches": select(models.CandidateBatch).where(
+            models.CandidateBatch.recruiter_id == 1
+        ).order_by(models.CandidateBatch.uploaded_at.desc()),
+    }
+
+def _seed(db, candidates=2000):
+    from app import models
+
+    recruiters = [
+        models.User(email=f"r{i}@bench.example.com", hashed_password="!", full_name="R", role=models.UserRole.RECRUITER)
+        for i in range(5)
+    ]
+    db.add_all(recruiters)
+    db.flush()
+    batches = [
+        models.CandidateBatch(
+            batch_name=f"b{i}", recruiter_id=recruiters[i % 5].id, upload_type="csv",
+            status=models.VerificationStatus.PENDING if i % 8 == 0 else models.VerificationStatus.COMPLETED
+        )
+        for i in range(40)
+    ]
+    db.add_all(batches)
+    db.flush()
+    statuses = list(models.VerificationStatus)
+    started = datetime(2024, 1, 1)
+    for i in range(candidates):
+        candidate = models.Candidate(
+            batch_id=batches[i % 40].id,
+            full_name=f"Candidate {i}",
+            email_key=f"c{i}@example.com",
+            phone_key=f"+49301{i:05d}",
+            linkedin_key=f"candidate-{i}",
+            name_key=f"{i} candidate",
+            verification_status=statuses[i % 3],
+            verifier_id=recruiters[i % 5].id if i % 3 else None,
+            created_at=started + timedelta(minutes=i),
+            updated_at=started + timedelta(minutes=i),
+            employment_history=[models.Employment(
+                company_name="TechCorp GmbH", position="Engineer", start_year=2015 + i % 8, end_year=2018 + i % 8, order=0
+            )],
+            education_history=[models.Education(institution="Technical University of Berlin", order=0)]
+        )
+        db.add(candidate)
+        if i % 50 == 49:
+            db.flush()
+            candidate.duplicate_of_id, candidate.duplicate_match = candidate.id - 1, "email"
+        if i % 10 == 0:
+            db.flush()
+            db.add(models.Report(candidate_id=candidate.id, html_content="<html></html>", content_hash="0" * 64))
+    db.commit()
+
+def _plan_sqlite(conn, sql):
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    details = [row[-1] for row in rows]
+    full_scans = [d for d in details if re.match(r"SCAN \w+$", d) or re.match(r"SCAN \w+ AS \w+$", d)]
+    sorts = [d for d in details if d.startswith("USE TEMP B-TREE FOR ORDER BY")]
+    return details, full_scans + sorts
+
+def _plan_postgresql(conn, sql):
+    conn.exec_driver_sql("SET enable_seqscan = off")
+    plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    plan = plan if isinstance(plan, list) else json.loads(plan)
+    nodes, stack = [], [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        nodes.append(f"{node['Node Type']} {node.get('Relation Name', '')}".strip())
+        stack.extend(node.get("Plans", []))
+    return nodes, [n for n in nodes if n.startswith(("Seq Scan", "Sort", "Incremental Sort"))]
+
+def main():
+    use_scratch_database("plans.db")
+
+    from app.database import SessionLocal, engine
+    from app.migrations import upgrade_database
+
+    upgrade_database()
+    with SessionLocal() as db:
+        _seed(db)
+
+    failures = {}
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("ANALYZE")
+        for name, statement in hot_queries().items():
+            sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+            if engine.dialect.name == "postgresql":
+                plan, problems = _plan_postgresql(conn, sql)
+            else:
+                plan, problems = _plan_sqlite(conn, sql)
+            status = "FAIL" if problems else "ok"
+            print(f"[{status}] {name}: {' | '.join(plan)}")
+            if problems:
+                failures[name] = problems
+
+    if failures:
+        print(f"\n{len(failures)} hot queries fall back to full scans or sorts: {', '.join(failures)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
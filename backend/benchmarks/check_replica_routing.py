@@ -0,0 +1,145 @@
+"""
+Check read-replica routing end to end.
+
+By default a scratch SQLite primary is migrated and seeded, then copied to a
+second SQLite file that serves as the replica. Point DATABASE_URL and
+DATABASE_REPLICA_URLS at two PostgreSQL instances (with replication set up)
+to run the same checks against them. Statements are counted per engine to
+see which database served each read:
+
+    python -m benchmarks.check_replica_routing
+    DB_ASYNC=true python -m benchmarks.check_replica_routing
+    DATABASE_URL=postgresql://.../cv DATABASE_REPLICA_URLS=postgresql://...:5433/cv python -m benchmarks.check_replica_routing
+
+Exits with status 1 when any check fails.
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+from collections import Counter
+
+from benchmarks.common import use_scratch_database, seed_users
+
+CSV_UPLOAD = (
+    b"Full Name,Email,Company 1,Position 1,Start Date 1,End Date 1\n"
+    b"Replica Check,replica.check@example.com,TechCorp GmbH,Engineer,Jan 2020,Present\n"
+)
+
+def _sqlite_path(url: str) -> str:
+    return url.split("///", 1)[1]
+
+def _configure_databases() -> None:
+    primary_url = use_scratch_database("primary.db")
+    if "DATABASE_REPLICA_URLS" not in os.environ:
+        replica_path = os.path.join(os.path.dirname(_sqlite_path(primary_url)), "replica.db")
+        os.environ["DATABASE_REPLICA_URLS"] = f"sqlite:///{replica_path}"
+    os.environ.setdefault("REPLICA_STICKY_SECONDS", "1")
+
+def _count_statements(counter: Counter, label: str, *engines) -> None:
+    from sqlalchemy import event
+    
+    for db_engine in engines:
+        if db_engine is None:
+            continue
+        sync_engine = getattr(db_engine, "sync_engine", db_engine)
+        event.listen(sync_engine, "before_cursor_execute", lambda *args: counter.update([label]))
+
+async def _run_checks(app, tokens, counter, sticky_seconds):
+    import httpx
+    
+    from app.database import Replica, engine_settings, replica_router
+    
+    failures = []
+    
+    def check(name, ok):
+        print(f"[{'ok' if ok else 'FAIL'}] {name}")
+        if not ok:
+            failures.append(name)
+    
+    async def served_by(client, role):
+        before = counter.copy()
+        response = await client.get("/api/candidates/batches", headers={"Authorization": f"Bearer {tokens[role]}"})
+        response.raise_for_status()
+        # Counter subtraction keeps only the engines that ran statements for this request
+        return set(counter - before), response.json()
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://replica-check") as client:
+        recruiter = {"Authorization": f"Bearer {tokens['recruiter']}"}
+        
+        # Warm the principal cache so auth lookups do not blur the per-engine counts
+        for role in tokens:
+            (await client.get("/api/auth/me", headers={"Authorization": f"Bearer {tokens[role]}"})).raise_for_status()
+        
+        engines, _ = await served_by(client, "recruiter")
+        check("reads without a recent write go to a replica", engines == {"replica"})
+        
+        response = await client.post(
+            "/api/candidates/upload/csv", headers=recruiter,
+            files={"file": ("replica.csv", CSV_UPLOAD, "text/csv")}, data={"batch_name": "replica check"}
+        )
+        response.raise_for_status()
+        batch_id = response.json()["batch_id"]
+        
+        engines, batches = await served_by(client, "recruiter")
+        check("reads right after a write stay on the primary", engines == {"primary"})
+        check("the writer sees its own upload", any(batch["id"] == batch_id for batch in batches))
+        
+        engines, _ = await served_by(client, "admin")
+        check("other users keep reading from a replica", engines == {"replica"})
+        
+        await asyncio.sleep(sticky_seconds + 0.2)
+        engines, _ = await served_by(client, "recruiter")
+        check("the writer returns to a replica after the sticky window", engines == {"replica"})
+        
+        healthy_replicas = list(replica_router.replicas)
+        unreachable = Replica("sqlite:////nonexistent-replica-dir/replica.db", engine_settings)
+        replica_router.replicas[:] = [unreachable]
+        try:
+            engines, _ = await served_by(client, "admin")
+            check("reads fall back to the primary when no replica is reachable", engines == {"primary"})
+            check("the unreachable replica is put on cooldown", not unreachable.healthy)
+        finally:
+            replica_router.replicas[:] = healthy_replicas
+    
+    return failures
+
+def main():
+    _configure_databases()
+    
+    from app import auth
+    from app.database import REPLICA_STICKY_SECONDS, SessionLocal, async_engine, engine, replica_router
+    from app.main import app
+    from app.migrations import upgrade_database
+    
+    upgrade_database()
+    with SessionLocal() as db:
+        users = seed_users(db)
+        tokens = {role: auth.create_access_token({"sub": user.email}) for role, user in users.items()}
+    
+    if engine.dialect.name == "sqlite":
+        # A file copy stands in for replication: the replica is a snapshot of the seeded primary
+        for replica in replica_router.replicas:
+            source, target = sqlite3.connect(engine.url.database), sqlite3.connect(replica.engine.url.database)
+            source.backup(target)
+            source.close()
+            target.close()
+    else:
+        # Give streaming replication a moment to ship the seed data
+        time.sleep(1)
+    
+    counter: Counter = Counter()
+    _count_statements(counter, "primary", engine, async_engine)
+    for replica in replica_router.replicas:
+        _count_statements(counter, "replica", replica.engine, replica.async_engine)
+    
+    failures = asyncio.run(_run_checks(app, tokens, counter, REPLICA_STICKY_SECONDS))
+    if failures:
+        print(f"\n{len(failures)} replica routing checks failed")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite database unless DATABASE_URL is
+already set, so call use_scratch_database() before importing anything from app.
+"""
+
+import os
+import tempfile
+from typing import Dict, Iterable, List
+
+def use_scratch_database(name: str = "bench.db") -> str:
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='cvbench-'), name)}"
+    return os.environ["DATABASE_URL"]
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def summarize(latencies: Iterable[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds from a list of durations in seconds"""
+    values = sorted(latency * 1000 for latency in latencies)
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+def seed_users(db) -> Dict[str, "object"]:
+    """Create one user per role with a placeholder password hash, returning them by role value"""
+    from app import models
+
+    users = {}
+    for role in models.UserRole:
+        user = models.User(
+            email=f"{role.value}@bench.example.com",
+            hashed_password="!",
+            full_name=f"Bench {role.value.title()}",
+            role=role,
+            is_active=True
+        )
+        db.add(user)
+        users[role.value] = user
+    db.commit()
+    return users
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Request throughput with the synchronous (threadpool) and async session modes.
+
+Each mode runs in its own process because DB_ASYNC is read at import time.
+The workload is a read-heavy mix of candidate detail, batch list and stats
+requests from many concurrent in-process clients against a seeded database.
+
+    python -m benchmarks.db_throughput --clients 500 --requests-per-client 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import use_scratch_database, summarize, seed_users
+
+def _seed(candidates):
+    from app import auth, models
+    from app.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    users = seed_users(db)
+    batch = models.CandidateBatch(
+        batch_name="bench", recruiter_id=users["recruiter"].id, upload_type="csv", total_candidates=candidates
+    )
+    db.add(batch)
+    db.flush()
+    db.add_all(
+        models.Candidate(
+            batch_id=batch.id,
+            full_name=f"Candidate {i}",
+            employment_history=[models.Employment(company_name="TechCorp GmbH", position="Engineer", order=0)],
+            education_history=[models.Education(institution="Technical University of Berlin", order=0)]
+        )
+        for i in range(candidates)
+    )
+    db.commit()
+    tokens = {role: auth.create_access_token({"sub": user.email}) for role, user in users.items()}
+    db.close()
+    return tokens
+
+async def _drive(app, tokens, clients, requests_per_client, candidates):
+    import httpx
+
+    latencies = []
+    errors = 0
+
+    async def client_loop(client, client_id):
+        nonlocal errors
+        for i in range(requests_per_client):
+            kind = (client_id + i) % 3
+            if kind == 0:
+                path, token = f"/api/candidates/{(client_id * 7 + i) % candidates + 1}", tokens["verifier"]
+            elif kind == 1:
+                path, token = "/api/candidates/batches", tokens["recruiter"]
+            else:
+                path, token = "/api/verification/stats", tokens["verifier"]
+            started = time.perf_counter()
+            response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, n) for n in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency": summarize(latencies),
+    }
+
+def _run_worker(args):
+    use_scratch_database()
+    tokens = _seed(args.candidates)
+
+    from app.main import app
+
+    result = asyncio.run(_drive(app, tokens, args.clients, args.requests_per_client, args.candidates))
+    print(json.dumps(result))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests-per-client", type=int, default=10)
+    parser.add_argument("--candidates", type=int, default=1000)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _run_worker(args)
+        return
+
+    results = {}
+    for mode, flag in (("sync", "false"), ("async", "true")):
+        env = dict(os.environ, DB_ASYNC=flag)
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.db_throughput", "--worker",
+             "--clients", str(args.clients),
+             "--requests-per-client", str(args.requests_per_client),
+             "--candidates", str(args.candidates)],
+            env=env, check=True, capture_output=True, text=True
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    config = {key: value for key, value in vars(args).items() if key != "worker"}
+    print(json.dumps({"config": config, "results": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""
+Duplicate lookup cost at ingest against a large candidate table.
+
+Bulk-seeds --candidates earlier candidates (one job each) with identity
+keys, then builds uploads of --upload candidates where --duplicate-share of
+them reappear under a different email spelling, a reformatted phone
+number, a LinkedIn URL or only their name plus employer, and times
+app.dedup.link_duplicates on each. Also reports how many of the planted
+duplicates were found and how many fresh candidates were wrongly linked.
+
+    python -m benchmarks.dedup_lookup --candidates 1000000 --upload 1000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import summarize, use_scratch_database
+
+FIRST_NAMES = ["Anna", "Ben", "Clara", "David", "Emma", "Felix", "Greta", "Hannah", "Jonas", "Lena", "Lukas", "Marie", "Noah", "Paul", "Sophie"]
+
+def _surname(i):
+    # Letters only, since name keys ignore digits; many people share a surname, as in real uploads
+    letters = ""
+    i //= 7
+    while True:
+        i, rest = divmod(i, 26)
+        letters += "bcdfghklmnprstvwz"[rest % 17] + "aeiou"[rest % 5]
+        if not i:
+            return letters.title()
+
+def _person(i):
+    return {
+        "full_name": f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {_surname(i)}",
+        "email": f"person{i}@example.com",
+        "phone": f"+49 30 {10000000 + i}",
+        "linkedin_url": f"linkedin.com/in/person-{i}",
+        "company": f"Company {i % 5000}",
+        "start_year": 2000 + i % 20,
+    }
+
+def _seed(db, candidates):
+    from sqlalchemy import insert
+    
+    from app import models
+    from app.utils.identity_keys import identity_keys
+    
+    recruiter = models.User(email="r@bench.example.com", hashed_password="!", full_name="R", role=models.UserRole.RECRUITER)
+    db.add(recruiter)
+    db.flush()
+    batch = models.CandidateBatch(batch_name="seed", recruiter_id=recruiter.id, upload_type="csv", total_candidates=candidates)
+    db.add(batch)
+    db.flush()
+    
+    chunk = 50000
+    for start in range(1, candidates + 1, chunk):
+        people = [(i, _person(i)) for i in range(start, min(start + chunk, candidates + 1))]
+        rows = []
+        for i, person in people:
+            keys = identity_keys(person)
+            rows.append({
+                "id": i, "batch_id": batch.id, "full_name": person["full_name"], "email": person["email"],
+                "phone": person["phone"], "linkedin_url": person["linkedin_url"],
+                "email_key": keys.email, "phone_key": keys.phone, "linkedin_key": keys.linkedin, "name_key": keys.name,
+            })
+        db.execute(insert(models.Candidate), rows)
+        db.execute(insert(models.Employment), [
+            {"candidate_id": i, "company_name": person["company"], "position": "Engineer", "start_year": person["start_year"], "order": 0}
+            for i, person in people
+        ])
+    db.commit()
+    return recruiter
+
+def _upload(rng, candidates, size, duplicate_share, next_id):
+    """Candidate dicts for one upload plus the seeded id each planted duplicate should link to"""
+    upload, expected = [], []
+    for _ in range(size):
+        if rng.random() < duplicate_share:
+            i = rng.randint(1, candidates)
+            person = _person(i)
+            variant = rng.randrange(4)
+            candidate = {"full_name": person["full_name"], "company": person["company"], "start_year": person["start_year"]}
+            if variant == 0:
+                candidate["email"] = person["email"].upper().replace("@", "+cv@")
+            elif variant == 1:
+                candidate["phone"] = "0" + person["phone"][4:].replace(" ", "/")
+            elif variant == 2:
+                candidate["linkedin_url"] = "https://www." + person["linkedin_url"] + "/"
+            upload.append(candidate)
+            expected.append(i)
+        else:
+            person = _person(next_id)
+            next_id += 1
+            upload.append(person)
+            expected.append(None)
+    return upload, expected, next_id
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=1000000)
+    parser.add_argument("--upload", type=int, default=1000)
+    parser.add_argument("--uploads", type=int, default=10)
+    parser.add_argument("--duplicate-share", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    use_scratch_database("dedup.db")
+    
+    from app import models
+    from app.database import Base, SessionLocal, engine
+    from app.dedup import link_duplicates
+    from app.utils.identity_keys import identity_keys
+    
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        recruiter = _seed(db, args.candidates)
+        recruiter_id = recruiter.id
+    seed_seconds = time.perf_counter() - started
+    
+    rng = random.Random(args.seed)
+    next_id = args.candidates + 1
+    latencies, found, planted, false_links = [], 0, 0, 0
+    for _ in range(args.uploads):
+        upload, expected, next_id = _upload(rng, args.candidates, args.upload, args.duplicate_share, next_id)
+        with SessionLocal() as db:
+            batch = models.CandidateBatch(batch_name="upload", recruiter_id=recruiter_id, upload_type="csv")
+            db.add(batch)
+            db.flush()
+            candidates = []
+            for data in upload:
+                keys = identity_keys(data)
+                candidates.append(models.Candidate(
+                    batch_id=batch.id, full_name=data["full_name"],
+                    email_key=keys.email, phone_key=keys.phone, linkedin_key=keys.linkedin, name_key=keys.name,
+                    employment_history=[models.Employment(
+                        company_name=data["company"], position="Engineer", start_year=data["start_year"], order=0
+                    )]
+                ))
+            db.add_all(candidates)
+            db.flush()
+            
+            started = time.perf_counter()
+            link_duplicates(db, batch.id, candidates)
+            latencies.append(time.perf_counter() - started)
+            
+            for candidate, expected_root in zip(candidates, expected):
+                if expected_root is None:
+                    false_links += candidate.duplicate_of_id is not None
+                else:
+                    planted += 1
+                    found += candidate.duplicate_of_id == expected_root
+            db.rollback()
+    
+    print(json.dumps({
+        "config": vars(args),
+        "seed_seconds": round(seed_seconds, 1),
+        "link_duplicates_per_upload": summarize(latencies),
+        "per_candidate_ms": round(sum(latencies) * 1000 / (args.uploads * args.upload), 3),
+        "duplicates_found": f"{found}/{planted}",
+        "false_links": false_links,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Lookup latency of the verified-entity index.
+
+Bulk-seeds --entities companies and a tenth as many institutions into
+verified_entities, then measures the cold index build, an incremental
+refresh after --verifications new verified claims, and suggestion latency
+for names with a typo, a missing legal form or different casing. Also
+reports how often the intended entity came back as the top suggestion.
+
+    python -m benchmarks.entity_suggestions --entities 50000 --queries 2000
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import summarize, use_scratch_database
+
+ONSETS = ["b", "br", "c", "ch", "d", "f", "g", "gr", "h", "k", "l", "m", "n", "p", "r", "s", "st", "t", "tr", "v", "w", "z"]
+VOWELS = ["a", "e", "i", "o", "u", "ei", "au", "ie"]
+CODAS = ["", "", "n", "r", "s", "x", "l", "ck", "ng", "m"]
+LEGAL_FORMS = ["GmbH", "AG", "Inc.", "Ltd", "SE", "GmbH & Co. KG", ""]
+CITIES = ["Berlin", "Munich", "Hamburg", "Vienna", "Zurich", "London", "Paris", "Boston", "Madrid", "Prague"]
+
+def _company(rng):
+    return " ".join([
+        "".join(rng.choice(ONSETS) + rng.choice(VOWELS) + rng.choice(CODAS) for _ in range(rng.randint(2, 3))).title(),
+        rng.choice(["", "", "Solutions", "Systems", "Consulting", "Digital"]),
+        rng.choice(LEGAL_FORMS),
+    ]).replace("  ", " ").strip()
+
+def _institution(rng):
+    return f"{rng.choice(['University', 'Technical University', 'University of Applied Sciences'])} {rng.choice(CITIES)} {rng.randint(1, 999)}"
+
+def _variant(rng, name):
+    """What a CV might say instead of the name the entity was verified under"""
+    words = name.split()
+    choice = rng.random()
+    if choice < 0.4:
+        word = rng.randrange(len(words))
+        position = rng.randrange(len(words[word]))
+        words[word] = words[word][:position] + rng.choice("aeiorstn") + words[word][position + 1:]
+    elif choice < 0.7 and len(words) > 1:
+        words = words[:-1]
+    return " ".join(words).upper() if rng.random() < 0.3 else " ".join(words)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--verifications", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    use_scratch_database("entities.db")
+    
+    from sqlalchemy import insert
+    
+    from app import models
+    from app.database import Base, SessionLocal, engine
+    from app.entity_index import EntityIndex, record_verified_claim
+    from app.utils.entity_names import COMPANY, INSTITUTION, normalize_entity_name
+    
+    rng = random.Random(args.seed)
+    Base.metadata.create_all(bind=engine)
+    # Seeded as if verified a day ago, so the incremental refresh only picks up the new verifications
+    seeded_at = datetime.utcnow() - timedelta(days=1)
+    entities = {}
+    for kind, count, make in ((COMPANY, args.entities, _company), (INSTITUTION, args.entities // 10, _institution)):
+        target = len(entities) + count
+        while len(entities) < target:
+            name = make(rng)
+            entities.setdefault((kind, normalize_entity_name(kind, name)), name)
+    with SessionLocal() as db:
+        db.execute(insert(models.VerifiedEntity), [
+            {
+                "kind": kind, "normalized_name": normalized, "display_name": name, "verified_count": rng.randint(1, 20),
+                "sources": {"registry": rng.randint(1, 5), "linkedin": rng.randint(0, 5)}, "last_verified_at": seeded_at, "updated_at": seeded_at,
+            }
+            for (kind, normalized), name in entities.items()
+        ])
+        db.commit()
+    
+    index = EntityIndex()
+    with SessionLocal() as db:
+        started = time.perf_counter()
+        index.refresh(db)
+        cold_seconds = time.perf_counter() - started
+    
+    with SessionLocal() as db:
+        for _ in range(args.verifications):
+            kind = COMPANY if rng.random() < 0.9 else INSTITUTION
+            name = _company(rng) if kind == COMPANY else _institution(rng)
+            record_verified_claim(db, kind, name, ["registry"], datetime.utcnow())
+        db.commit()
+    with SessionLocal() as db:
+        started = time.perf_counter()
+        applied = index.refresh(db)
+        incremental_seconds = time.perf_counter() - started
+    
+    targets = rng.sample(sorted(entities.items()), min(args.queries, len(entities)))
+    latencies = []
+    top_hits = 0
+    for (kind, normalized), name in targets:
+        query = _variant(rng, name)
+        started = time.perf_counter()
+        results = index.search(kind, query)
+        latencies.append(time.perf_counter() - started)
+        if results and normalize_entity_name(kind, results[0][0].display_name) == normalized:
+            top_hits += 1
+    
+    print(json.dumps({
+        "config": vars(args),
+        "index": index.stats(),
+        "cold_refresh_seconds": round(cold_seconds, 3),
+        "incremental_refresh": {"rows": applied, "ms": round(incremental_seconds * 1000, 2)},
+        "search": summarize(latencies),
+        "top1_hit_rate": round(top_hits / len(targets), 3),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,639 @@
+"""
+Fill a database with synthetic recruiters, batches, candidates and their
+verification history at production scale, and write matching upload
+fixtures.
+
+Everything is derived from --seed (and --as-of, which defaults to today), so
+the same arguments always produce the same data:
+
+- batch uploads spread over --days, with lognormal batch sizes, a share of
+  single-CV PDF uploads and a few recruiters uploading most batches;
+- 1-6 jobs and 0-3 degrees per candidate, employers and institutions drawn
+  from Zipf-distributed pools, date strings in the formats real CVs use;
+- batches older than --backlog-days fully verified, newer ones partly
+  claimed or still pending, claim outcomes and verifier notes to match;
+- a share of candidates that reappear from earlier batches (duplicates),
+  reports for a share of verified candidates, and the verified-entity index
+  built from the verified claims.
+
+Rows go in with Core executemany inserts in chunks of --chunk-size
+candidates, one transaction per chunk, with explicit ids, so the generator
+appends to an existing database without the ORM unit of work. Raw CVs are
+not written to the blob store; timeline and source checks can be run over
+the batches afterwards.
+
+    python -m benchmarks.generate_data --candidates 1000000
+    python -m benchmarks.generate_data --database-url sqlite:///./scale.db --candidates 1000000 --seed 7
+    python -m benchmarks.generate_data --candidates 0 --csv-files 5 --csv-rows 200 --pdf-files 20 --out fixtures/
+
+All synthetic users can log in with --password.
+"""
+
+import argparse
+import csv
+import io
+import math
+import os
+import random
+import time
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Optional
+
+FIRST_NAMES = (
+    "Anna", "Lukas", "Sophie", "Leon", "Marie", "Jonas", "Laura", "Felix", "Julia", "Paul", "Lea", "Elias",
+    "Hannah", "Noah", "Mia", "Ben", "Emma", "Finn", "Lena", "Maximilian", "Sarah", "David", "Clara", "Tim",
+    "Katharina", "Jan", "Lisa", "Tobias", "Nina", "Simon", "Aylin", "Mehmet", "Elif", "Can", "Olga", "Piotr",
+    "Agnieszka", "Marco", "Giulia", "Luca", "Sofia", "Carlos", "Lucia", "Pierre", "Camille", "James", "Emily",
+    "Michael", "Jessica", "Raj", "Priya", "Wei", "Mei", "Hiroshi", "Yuki", "Ahmed", "Fatima", "Ivan", "Ana",
+    "João",
+)
+LAST_NAMES = (
+    "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Schulz", "Hoffmann",
+    "Schäfer", "Koch", "Bauer", "Richter", "Klein", "Wolf", "Schröder", "Neumann", "Schwarz", "Zimmermann",
+    "Braun", "Krüger", "Hofmann", "Hartmann", "Lange", "Schmitt", "Werner", "Schmitz", "Krause", "Meier",
+    "Lehmann", "Köhler", "Herrmann", "König", "Walter", "Mayer", "Huber", "Kaiser", "Fuchs", "Peters",
+    "Yilmaz", "Kaya", "Demir", "Nowak", "Kowalski", "Wiśniewski", "Rossi", "Russo", "Bianchi", "García",
+    "Fernández", "López", "Martin", "Bernard", "Dubois", "Smith", "Johnson", "Brown", "Taylor", "Wilson",
+    "Patel", "Sharma", "Singh", "Wang", "Li", "Zhang", "Tanaka", "Sato", "Suzuki", "Hassan", "Ali", "Ivanov",
+    "Petrov", "Silva", "Santos", "Costa", "Jansen", "de Vries", "Nielsen", "Andersson",
+)
+EMAIL_DOMAINS = ("gmail.com", "web.de", "gmx.de", "outlook.com", "yahoo.com", "t-online.de", "icloud.com", "posteo.de")
+
+COMPANY_STEMS = (
+    "Tech", "Data", "Cloud", "Net", "Soft", "Digital", "Logi", "Fin", "Med", "Bio", "Auto", "Energy", "Smart",
+    "Cyber", "Quantum", "Nova", "Alpha", "Blue", "Green", "Urban", "Terra", "Aero", "Micro", "Info", "Health",
+    "Retail", "Media", "Trade", "Consult", "Solar", "Mobility", "Secure", "Pay", "Food", "Build", "Insur",
+)
+COMPANY_SUFFIXES = ("Corp", "Systems", "Labs", "Works", "Solutions", "Group", "Partners", "Services", "Hub", "Dynamics", "Vision", "Logic", "Point")
+LEGAL_FORMS = ("GmbH", "GmbH", "GmbH", "AG", "SE", "GmbH & Co. KG", "Inc.", "Ltd", "B.V.", "")
+CITIES = (
+    "Berlin", "Hamburg", "Munich", "Cologne", "Frankfurt", "Stuttgart", "Düsseldorf", "Leipzig", "Dresden",
+    "Hanover", "Nuremberg", "Bremen", "Heidelberg", "Aachen", "Karlsruhe", "Mannheim", "Freiburg", "Münster",
+    "Vienna", "Zurich", "Amsterdam", "Warsaw", "Milan", "Madrid", "Paris", "London", "Istanbul", "Prague",
+)
+POSITIONS = (
+    ("Junior Software Engineer", "Software Engineer", "Senior Software Engineer", "Lead Engineer", "Engineering Manager"),
+    ("Junior Data Analyst", "Data Analyst", "Data Scientist", "Senior Data Scientist", "Head of Data"),
+    ("Sales Associate", "Account Executive", "Senior Account Executive", "Sales Manager", "Head of Sales"),
+    ("Marketing Assistant", "Marketing Specialist", "Marketing Manager", "Senior Marketing Manager", "Head of Marketing"),
+    ("HR Assistant", "HR Generalist", "HR Business Partner", "Senior HR Business Partner", "Head of People"),
+    ("Junior Consultant", "Consultant", "Senior Consultant", "Manager", "Partner"),
+    ("Accountant", "Financial Analyst", "Senior Financial Analyst", "Finance Manager", "CFO"),
+    ("Support Agent", "Customer Success Manager", "Senior Customer Success Manager", "Team Lead Support", "Head of Customer Success"),
+)
+DEGREES = (
+    ("Bachelor of Science", 0.38), ("Master of Science", 0.27), ("Bachelor of Arts", 0.12), ("Master of Arts", 0.07),
+    ("Diplom", 0.06), ("MBA", 0.05), ("PhD", 0.03), ("Apprenticeship Diploma", 0.02),
+)
+FIELDS = (
+    "Computer Science", "Business Administration", "Economics", "Mechanical Engineering", "Electrical Engineering",
+    "Psychology", "Mathematics", "Physics", "Law", "Marketing", "Information Systems", "Industrial Engineering",
+    "Media Studies", "Chemistry", "Medicine",
+)
+VERIFICATION_SOURCES = ("company_registry", "employment_records", "degree_registry", "phone_call", "email_confirmation", "linkedin")
+
+EMPLOYMENT_COUNTS = ((1, 0.12), (2, 0.26), (3, 0.28), (4, 0.18), (5, 0.11), (6, 0.05))
+EDUCATION_COUNTS = ((0, 0.07), (1, 0.58), (2, 0.3), (3, 0.05))
+CLAIM_OUTCOMES = (("VERIFIED", 0.82), ("UNCERTAIN", 0.12), ("INCONSISTENT", 0.06))
+# Date styles of one upload: exporters write every date of a file the same way
+DATE_STYLES = ("named", "named", "named", "numeric", "iso", "year")
+PDF_DEGREE_KEYWORDS = ("bachelor", "master", "phd", "doctorate", "diploma", "bsc", "msc", "ba", "ma", "mba")
+MONTH_NAMES = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+class Weighted:
+    """Draws from fixed weights with one random() and a bisect"""
+    
+    def __init__(self, values, weights):
+        self.values = list(values)
+        self.cumulative = list(accumulate(weights))
+        self.total = self.cumulative[-1]
+    
+    @classmethod
+    def zipf(cls, values, exponent: float = 1.1):
+        return cls(values, [1 / (rank ** exponent) for rank in range(1, len(values) + 1)])
+    
+    def draw(self, rng: random.Random):
+        return self.values[bisect_right(self.cumulative, rng.random() * self.total)]
+
+def _pair_draw(pairs):
+    return Weighted([value for value, _ in pairs], [weight for _, weight in pairs])
+
+def _company_pool(rng: random.Random, size: int) -> List[str]:
+    names, seen, attempts = [], set(), 0
+    while len(names) < size:
+        attempts += 1
+        name = f"{rng.choice(COMPANY_STEMS)}{rng.choice(COMPANY_SUFFIXES).lower() if rng.random() < 0.4 else ' ' + rng.choice(COMPANY_SUFFIXES)}"
+        if rng.random() < 0.3:
+            name = f"{name} {rng.choice(CITIES)}"
+        name = f"{name} {rng.choice(LEGAL_FORMS)}".strip()
+        if attempts > size * 20:
+            # Past this point new combinations are rare, so number them
+            name = f"{name} {len(names)}"
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+def _institution_pool() -> List[str]:
+    institutions = []
+    for city in CITIES:
+        institutions.append(f"University of {city}")
+        institutions.append(f"Technical University of {city}")
+        institutions.append(f"{city} University of Applied Sciences")
+    institutions.extend(("Humboldt University of Berlin", "LMU Munich", "RWTH Aachen University", "ETH Zurich", "WHU Otto Beisheim School of Management", "Open University"))
+    return institutions
+
+class PersonFactory:
+    """Candidates in the shape the upload parsers produce"""
+    
+    def __init__(self, rng: random.Random, as_of: datetime, companies: int):
+        self.rng = rng
+        self.as_of = as_of
+        self.companies = Weighted.zipf(_company_pool(random.Random(rng.random()), companies))
+        self.institutions = Weighted.zipf(_institution_pool(), 0.8)
+        self.first_names = Weighted.zipf(FIRST_NAMES, 0.6)
+        self.last_names = Weighted.zipf(LAST_NAMES, 0.7)
+        self.employment_counts = _pair_draw(EMPLOYMENT_COUNTS)
+        self.education_counts = _pair_draw(EDUCATION_COUNTS)
+        self.degrees = _pair_draw(DEGREES)
+        self.serial = 0
+    
+    def _date(self, year: int, month: int, style: str) -> str:
+        if style == "named":
+            return f"{MONTH_NAMES[month - 1]} {year}"
+        if style == "numeric":
+            return f"{month:02d}/{year}"
+        if style == "iso":
+            return f"{year}-{month:02d}"
+        return str(year)
+    
+    def person(self, style: Optional[str] = None) -> Dict[str, Any]:
+        rng = self.rng
+        self.serial += 1
+        style = style or rng.choice(DATE_STYLES)
+        first, last = self.first_names.draw(rng), self.last_names.draw(rng)
+        handle = f"{first}.{last}".lower().replace(" ", "")
+        person = {
+            "full_name": f"{first} {last}",
+            "email": f"{handle}{self.serial}@{rng.choice(EMAIL_DOMAINS)}",
+            "phone": f"+49 {rng.randint(150, 179)} {rng.randint(1000000, 9999999)}" if rng.random() < 0.85 else None,
+            "linkedin_url": f"linkedin.com/in/{handle.replace('.', '-')}-{self.serial}" if rng.random() < 0.7 else None,
+            "employment": [],
+            "education": [],
+        }
+        
+        # Careers are built backwards from today (or a recent gap), most recent job first in time order
+        jobs = self.employment_counts.draw(rng)
+        track = rng.choice(POSITIONS)
+        end = self.as_of - timedelta(days=0 if rng.random() < 0.65 else rng.randint(30, 900))
+        current = end >= self.as_of - timedelta(days=1)
+        history = []
+        for index in range(jobs):
+            months = max(3, int(rng.lognormvariate(math.log(30), 0.6)))
+            start = end - timedelta(days=months * 30)
+            level = max(0, min(len(track) - 1, jobs - index - 1 + rng.randint(-1, 0)))
+            history.append({
+                "company": self.companies.draw(rng),
+                "position": track[level],
+                "start_date": self._date(start.year, start.month, style),
+                "end_date": "Present" if current and index == 0 else self._date(end.year, end.month, style),
+                "is_current": current and index == 0,
+                "description": None,
+            })
+            end = start - timedelta(days=rng.randint(0, 120))
+        person["employment"] = history[::-1]
+        
+        graduated = end.year
+        for index in range(self.education_counts.draw(rng)):
+            degree = self.degrees.draw(rng)
+            years = 2 if degree.startswith(("Master", "MBA")) else 4 if degree == "PhD" else 3
+            person["education"].append({
+                "institution": self.institutions.draw(rng),
+                "degree": degree,
+                "field": rng.choice(FIELDS),
+                "start_date": str(graduated - years),
+                "end_date": str(graduated),
+            })
+            graduated -= years + rng.randint(0, 2)
+        person["education"].reverse()
+        return person
+
+def _uploads(rng: random.Random, args, as_of: datetime) -> Iterator[Dict[str, Any]]:
+    """Batches in upload order until --candidates are placed"""
+    recruiters = Weighted.zipf(range(args.recruiters), 1.1)
+    placed = 0
+    turn = 0
+    while placed < args.candidates:
+        if rng.random() < args.pdf_share:
+            size, upload_type = 1, "pdf"
+        else:
+            size, upload_type = max(2, min(args.max_batch_size, int(rng.lognormvariate(math.log(args.median_batch_size), 1.1)))), "csv"
+        size = min(size, args.candidates - placed)
+        # Upload times follow the order batches are generated in, so ids grow with time like in production
+        position = (placed + size / 2) / args.candidates
+        uploaded_at = as_of - timedelta(days=args.days * (1 - position), seconds=rng.randint(0, 3600))
+        turn += 1
+        yield {"size": size, "upload_type": upload_type, "recruiter": recruiters.draw(rng), "uploaded_at": uploaded_at, "turn": turn}
+        placed += size
+
+class Generator:
+    def __init__(self, args, as_of: datetime):
+        self.args = args
+        self.as_of = as_of
+        self.rng = random.Random(args.seed)
+        self.people = PersonFactory(random.Random(self.rng.random()), as_of, args.companies)
+        self.outcomes = _pair_draw(CLAIM_OUTCOMES)
+        self.recent: List[tuple] = []
+        self.entities: Dict[tuple, list] = {}
+        self.normalized: Dict[tuple, str] = {}
+        self.counts = Counter()
+    
+    def _reviewed_claim(self, reviewed_at: datetime) -> Dict[str, Any]:
+        rng = self.rng
+        status = self.outcomes.draw(rng)
+        sources = rng.sample(VERIFICATION_SOURCES, rng.randint(1, 2))
+        note = None
+        if status == "UNCERTAIN":
+            note = rng.choice(("Employer did not respond", "Registry lists a different legal entity", "Dates could not be confirmed"))
+        elif status == "INCONSISTENT":
+            note = rng.choice(("Start date differs by more than a year", "No record of this degree", "Title not confirmed by employer"))
+        return {"claim_status": status, "verification_note": note, "verification_sources": sources, "verified_at": reviewed_at}
+    
+    def _remember_entity(self, kind: str, name: str, claim: Dict[str, Any]) -> None:
+        from app.utils.entity_names import normalize_entity_name
+        
+        normalized = self.normalized.get((kind, name))
+        if normalized is None:
+            normalized = self.normalized[(kind, name)] = normalize_entity_name(kind, name)
+        if not normalized:
+            return
+        entry = self.entities.get((kind, normalized))
+        if entry is None:
+            entry = self.entities[(kind, normalized)] = [name, 0, Counter(), claim["verified_at"]]
+        entry[1] += 1
+        entry[2].update(claim["verification_sources"])
+        entry[3] = max(entry[3], claim["verified_at"])
+    
+    def batches(self, ids: Dict[str, int], users: Dict[str, List[int]]) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+        """Rows of every table, a chunk of about --chunk-size candidates at a time"""
+        from app.scheduler import estimate_effort
+        from app.utils.date_normalizer import parse_date
+        from app.utils.http_cache import content_hash
+        from app.utils.identity_keys import identity_keys
+        
+        args, rng = self.args, self.rng
+        rows = {"batches": [], "candidates": [], "employment": [], "education": [], "reports": []}
+        pending_rows = 0
+        
+        for upload in _uploads(random.Random(rng.random()), args, self.as_of):
+            batch_id = ids["batch"] = ids["batch"] + 1
+            uploaded_at = upload["uploaded_at"]
+            age_days = (self.as_of - uploaded_at).total_seconds() / 86400
+            done_share = 1.0 if age_days >= args.backlog_days else max(0.0, (age_days - 1) / args.backlog_days)
+            style = rng.choice(DATE_STYLES)
+            recruiter_id = users["recruiter"][upload["recruiter"]]
+            
+            verified = served = duplicates = 0
+            completed_at = None
+            for _ in range(upload["size"]):
+                candidate_id = ids["candidate"] = ids["candidate"] + 1
+                duplicate_of = None
+                if self.recent and rng.random() < args.duplicate_share:
+                    original = rng.choice(self.recent)
+                    person = self.people.person(style)
+                    person.update(full_name=original[1], email=original[2], phone=original[3], linkedin_url=original[4])
+                    duplicate_of = original[5] or original[0]
+                    duplicates += 1
+                else:
+                    person = self.people.person(style)
+                
+                roll = rng.random()
+                status = "COMPLETED" if roll < done_share else "IN_PROGRESS" if roll < done_share + (1 - done_share) * args.in_progress_share else "PENDING"
+                verifier_id = users["verifier"][rng.randrange(len(users["verifier"]))] if status != "PENDING" else None
+                claimed_at = uploaded_at + timedelta(hours=min(age_days * 24, rng.expovariate(1 / 30)))
+                verified_at = min(self.as_of, claimed_at + timedelta(minutes=rng.randint(10, 240))) if status == "COMPLETED" else None
+                effort = estimate_effort(len(person["employment"]), len(person["education"]))
+                if status != "PENDING":
+                    served += effort
+                if status == "COMPLETED":
+                    verified += 1
+                    completed_at = max(completed_at or verified_at, verified_at)
+                
+                keys = identity_keys(person)
+                rows["candidates"].append({
+                    "id": candidate_id, "batch_id": batch_id, "full_name": person["full_name"], "email": person["email"],
+                    "phone": person["phone"], "linkedin_url": person["linkedin_url"], "raw_cv_hash": None,
+                    "verifier_id": verifier_id, "verification_status": status, "verified_at": verified_at,
+                    "priority_score": 0, "effort_estimate": effort, "email_key": keys.email, "phone_key": keys.phone,
+                    "linkedin_key": keys.linkedin, "name_key": keys.name, "duplicate_of_id": duplicate_of,
+                    "duplicate_match": "email" if duplicate_of else None, "created_at": uploaded_at, "updated_at": verified_at or claimed_at if status != "PENDING" else uploaded_at,
+                })
+                if duplicate_of is None and len(self.recent) < 50000:
+                    self.recent.append((candidate_id, person["full_name"], person["email"], person["phone"], person["linkedin_url"], None))
+                elif duplicate_of is None:
+                    self.recent[rng.randrange(len(self.recent))] = (candidate_id, person["full_name"], person["email"], person["phone"], person["linkedin_url"], None)
+                
+                for kind, section, table in (("company", "employment", "employment"), ("institution", "education", "education")):
+                    for order, entry in enumerate(person[section]):
+                        reviewed = status == "COMPLETED" or (status == "IN_PROGRESS" and rng.random() < 0.5)
+                        claim = self._reviewed_claim(claimed_at + timedelta(minutes=rng.randint(1, 60))) if reviewed else {
+                            "claim_status": "PENDING", "verification_note": None, "verification_sources": None, "verified_at": None
+                        }
+                        if claim["verified_at"] is not None:
+                            claim["verified_at"] = min(claim["verified_at"], self.as_of)
+                        start, end = parse_date(entry["start_date"]), parse_date(entry["end_date"])
+                        row = {
+                            "id": ids[table] + 1, "candidate_id": candidate_id, "start_date": entry["start_date"], "end_date": entry["end_date"],
+                            "start_year": start.year, "start_month": start.month, "end_year": end.year, "end_month": end.month,
+                            "is_current": bool(entry.get("is_current")) or end.is_present, "machine_notes": None, "priority_score": 0,
+                            "source_results": None, "order": order, **claim,
+                        }
+                        ids[table] += 1
+                        if table == "employment":
+                            row.update(company_name=entry["company"], position=entry["position"], description=entry["description"])
+                        else:
+                            row.update(institution=entry["institution"], degree=entry["degree"], field_of_study=entry["field"])
+                        rows[table].append(row)
+                        if claim["claim_status"] == "VERIFIED":
+                            self._remember_entity(kind, entry["company"] if table == "employment" else entry["institution"], claim)
+                
+                if status == "COMPLETED" and rng.random() < args.report_share:
+                    html = (
+                        f"<html><body><h1>Verified CV: {person['full_name']}</h1>"
+                        f"<p>{len(person['employment'])} employment and {len(person['education'])} education claims reviewed.</p></body></html>"
+                    )
+                    ids["report"] += 1
+                    rows["reports"].append({
+                        "id": ids["report"], "candidate_id": candidate_id, "html_content": html, "content_hash": content_hash(html),
+                        "generated_at": verified_at + timedelta(minutes=rng.randint(5, 600)), "generated_by": recruiter_id,
+                    })
+            
+            size = upload["size"]
+            batch_status = "COMPLETED" if verified == size else "PENDING" if served == 0 else "IN_PROGRESS"
+            rows["batches"].append({
+                "id": batch_id, "batch_name": f"{'CV' if upload['upload_type'] == 'pdf' else 'Upload'} {uploaded_at:%Y-%m-%d} #{upload['turn']}",
+                "recruiter_id": recruiter_id, "upload_type": upload["upload_type"], "status": batch_status,
+                "uploaded_at": uploaded_at, "completed_at": completed_at if batch_status == "COMPLETED" else None,
+                "total_candidates": size, "verified_count": verified, "source_file_hash": None,
+                "source_filename": f"candidates_{upload['turn']}.{upload['upload_type']}", "timeline_checked_at": None,
+                "sources_checked_at": None, "duplicate_count": duplicates, "served_effort": served,
+                "scheduling_weight": 2.0 if rng.random() < 0.05 else 1.0,
+                "sla_deadline": uploaded_at + timedelta(days=3) if rng.random() < args.sla_share else None,
+            })
+            self.counts.update(batches=1, candidates=size, completed=verified)
+            
+            pending_rows += size
+            if pending_rows >= args.chunk_size:
+                yield rows
+                rows = {name: [] for name in rows}
+                pending_rows = 0
+        
+        if pending_rows:
+            yield rows
+    
+    def entity_rows(self, first_id: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": first_id + index, "kind": kind, "normalized_name": normalized, "display_name": display,
+                "verified_count": count, "sources": dict(sources), "last_verified_at": last, "updated_at": last,
+            }
+            for index, ((kind, normalized), (display, count, sources, last)) in enumerate(sorted(self.entities.items()))
+        ]
+
+def upload_rows(people: PersonFactory, rows: int, style: Optional[str] = None) -> Iterator[List[str]]:
+    """Header and `rows` candidates in the column layout of test_candidates.csv"""
+    header = ["Full Name", "Email", "Phone", "LinkedIn"]
+    for i in range(1, 6):
+        header += [f"Company {i}", f"Position {i}", f"Start Date {i}", f"End Date {i}", f"Current {i}", f"Description {i}"]
+    for i in range(1, 4):
+        header += [f"Education {i}", f"Degree {i}", f"Field {i}", f"Edu Start {i}", f"Edu End {i}"]
+    yield header
+    
+    style = style or people.rng.choice(DATE_STYLES)
+    for _ in range(rows):
+        person = people.person(style)
+        row = [person["full_name"], person["email"], person["phone"] or "", person["linkedin_url"] or ""]
+        jobs = person["employment"][::-1][:5]
+        for i in range(5):
+            job = jobs[i] if i < len(jobs) else None
+            row += [job["company"], job["position"], job["start_date"], job["end_date"], "true" if job["is_current"] else "", ""] if job else [""] * 6
+        for i in range(3):
+            school = person["education"][i] if i < len(person["education"]) else None
+            row += [school["institution"], school["degree"], school["field"], school["start_date"], school["end_date"]] if school else [""] * 5
+        yield row
+
+def csv_upload(people: PersonFactory, rows: int, style: Optional[str] = None) -> str:
+    """A CSV upload of `rows` candidates in the column layout of test_candidates.csv"""
+    output = io.StringIO()
+    csv.writer(output).writerows(upload_rows(people, rows, style))
+    return output.getvalue()
+
+def xlsx_upload(people: PersonFactory, rows: int, style: Optional[str] = None) -> bytes:
+    """The same upload as an Excel workbook, written row by row; empty cells are left blank"""
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Candidates")
+    for row in upload_rows(people, rows, style):
+        sheet.append([value if value != "" else None for value in row])
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+def _write_csv_fixtures(people: PersonFactory, args) -> List[str]:
+    paths = []
+    for file_index in range(1, args.csv_files + 1):
+        path = os.path.join(args.out, f"candidates_{file_index:03d}.csv")
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            handle.write(csv_upload(people, args.csv_rows))
+        paths.append(path)
+    return paths
+
+def cv_pdf(people: PersonFactory, person: Optional[Dict[str, Any]] = None, description_lines: int = 1) -> bytes:
+    """A one-column PDF CV in the layout app.utils.pdf_parser reads"""
+    # reportlab is in requirements.txt for report rendering
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    
+    person = person or people.person("named")
+    for school in person["education"]:
+        # The PDF parser takes any line containing "ba" or "ma" for a degree, so Mannheim or Madrid would start a new entry
+        while any(keyword in school["institution"].lower() for keyword in PDF_DEGREE_KEYWORDS):
+            school["institution"] = people.institutions.draw(people.rng)
+    lines = [person["full_name"], person["email"]]
+    if person["phone"]:
+        lines.append(person["phone"])
+    if person["linkedin_url"]:
+        lines.append(person["linkedin_url"])
+    # Section headings on their own line and "Position | Company Start - End" is what app.utils.pdf_parser reads
+    lines += ["", "Experience"]
+    for job in reversed(person["employment"]):
+        lines.append(f"{job['position']} | {job['company']} {job['start_date']} - {job['end_date']}")
+        lines += [f"Responsible for {job['position'].lower()} work across several teams."] * description_lines
+    if person["education"]:
+        lines += ["", "Education"]
+        for school in reversed(person["education"]):
+            lines += [f"{school['degree']} in {school['field']}", school["institution"], f"{school['start_date']} - {school['end_date']}"]
+    lines += ["", "Skills", "Python, SQL, Communication"]
+    
+    output = io.BytesIO()
+    pdf = canvas.Canvas(output, pagesize=A4, invariant=1)
+    y = A4[1] - 60
+    for line in lines:
+        if y < 60:
+            pdf.showPage()
+            y = A4[1] - 60
+        pdf.drawString(60, y, line)
+        y -= 16
+    pdf.save()
+    return output.getvalue()
+
+def _write_pdf_fixtures(people: PersonFactory, args) -> List[str]:
+    paths = []
+    for file_index in range(1, args.pdf_files + 1):
+        path = os.path.join(args.out, f"cv_{file_index:03d}.pdf")
+        with open(path, "wb") as handle:
+            handle.write(cv_pdf(people))
+        paths.append(path)
+    return paths
+
+def _next_ids(conn, models) -> Dict[str, int]:
+    from sqlalchemy import func, select
+    
+    tables = {
+        "user": models.User, "batch": models.CandidateBatch, "candidate": models.Candidate, "employment": models.Employment,
+        "education": models.Education, "report": models.Report, "entity": models.VerifiedEntity,
+    }
+    return {name: conn.execute(select(func.coalesce(func.max(model.id), 0))).scalar() for name, model in tables.items()}
+
+def _create_users(conn, models, ids, args, as_of) -> Dict[str, List[int]]:
+    from sqlalchemy import insert, select
+    
+    from app.auth import get_password_hash
+    
+    prefix = f"synthetic{args.seed}"
+    if conn.execute(select(models.User.id).where(models.User.email.like(f"%@{prefix}.example.com")).limit(1)).first():
+        raise SystemExit(f"Users of seed {args.seed} already exist; use another --seed or a fresh database")
+    
+    hashed = get_password_hash(args.password)
+    users, rows = {"recruiter": [], "verifier": [], "admin": []}, []
+    for role, count in (("recruiter", args.recruiters), ("verifier", args.verifiers), ("admin", args.admins)):
+        for index in range(1, count + 1):
+            ids["user"] += 1
+            users[role].append(ids["user"])
+            rows.append({
+                "id": ids["user"], "email": f"{role}{index}@{prefix}.example.com", "hashed_password": hashed,
+                "full_name": f"Synthetic {role.title()} {index}", "role": role.upper(),
+                "company": f"Agency {(index - 1) % 25 + 1}" if role == "recruiter" else None,
+                "is_active": True, "created_at": as_of - timedelta(days=args.days + 30),
+            })
+    conn.execute(insert(models.User.__table__), rows)
+    return users
+
+def _reset_sequences(conn, models) -> None:
+    from sqlalchemy import text
+    
+    # Rows were inserted with explicit ids, so move the SERIAL sequences past them
+    for model in (models.User, models.CandidateBatch, models.Candidate, models.Employment, models.Education, models.Report, models.VerifiedEntity):
+        table = model.__tablename__
+        conn.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL")
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--recruiters", type=int, default=200)
+    parser.add_argument("--verifiers", type=int, default=60)
+    parser.add_argument("--admins", type=int, default=3)
+    parser.add_argument("--companies", type=int, default=20000, help="size of the employer pool")
+    parser.add_argument("--median-batch-size", type=float, default=40)
+    parser.add_argument("--max-batch-size", type=int, default=5000)
+    parser.add_argument("--pdf-share", type=float, default=0.3, help="share of uploads that are a single PDF CV")
+    parser.add_argument("--days", type=float, default=365, help="uploads are spread over this many days before --as-of")
+    parser.add_argument("--backlog-days", type=float, default=10, help="batches older than this are fully verified")
+    parser.add_argument("--in-progress-share", type=float, default=0.15, help="share of unverified candidates already claimed")
+    parser.add_argument("--duplicate-share", type=float, default=0.03)
+    parser.add_argument("--report-share", type=float, default=0.4, help="share of verified candidates with a report")
+    parser.add_argument("--sla-share", type=float, default=0.2, help="share of batches with an SLA deadline")
+    parser.add_argument("--as-of", help="YYYY-MM-DD the data ends at, defaults to today")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="candidates per insert transaction")
+    parser.add_argument("--no-migrate", action="store_true", help="skip alembic upgrade head")
+    parser.add_argument("--out", default="fixtures", help="directory for --csv-files and --pdf-files")
+    parser.add_argument("--csv-files", type=int, default=0)
+    parser.add_argument("--csv-rows", type=int, default=100)
+    parser.add_argument("--pdf-files", type=int, default=0)
+    args = parser.parse_args()
+    
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    as_of = datetime.strptime(args.as_of, "%Y-%m-%d") if args.as_of else datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    summary: Dict[str, Any] = {"seed": args.seed, "as_of": as_of.date().isoformat()}
+    
+    if args.csv_files or args.pdf_files:
+        os.makedirs(args.out, exist_ok=True)
+        fixtures = PersonFactory(random.Random(f"fixtures-{args.seed}"), as_of, min(args.companies, 2000))
+        summary["csv_files"] = _write_csv_fixtures(fixtures, args)
+        summary["pdf_files"] = _write_pdf_fixtures(fixtures, args)
+    
+    if args.candidates > 0:
+        from sqlalchemy import insert, text
+        
+        from app import models
+        from app.database import engine
+        from app.migrations import upgrade_database
+        
+        if not args.no_migrate:
+            upgrade_database()
+        
+        started = time.perf_counter()
+        generator = Generator(args, as_of)
+        tables = {
+            "batches": models.CandidateBatch.__table__, "candidates": models.Candidate.__table__,
+            "employment": models.Employment.__table__, "education": models.Education.__table__, "reports": models.Report.__table__,
+        }
+        inserted = Counter()
+        with engine.connect() as conn:
+            if engine.dialect.name == "sqlite":
+                # Generated data can be regenerated, so skip the fsync per transaction
+                conn.exec_driver_sql("PRAGMA synchronous=OFF")
+                conn.commit()
+            with conn.begin():
+                ids = _next_ids(conn, models)
+                users = _create_users(conn, models, ids, args, as_of)
+            for rows in generator.batches(ids, users):
+                with conn.begin():
+                    for name, table in tables.items():
+                        if rows[name]:
+                            conn.execute(insert(table), rows[name])
+                            inserted[name] += len(rows[name])
+                print(f"{inserted['candidates']:>10} candidates  {time.perf_counter() - started:7.1f} s", flush=True)
+            with conn.begin():
+                entity_rows = generator.entity_rows(ids["entity"] + 1)
+                # Entities verified in an earlier run keep their row; only new names are added
+                existing = {tuple(row) for row in conn.execute(text("SELECT kind, normalized_name FROM verified_entities"))}
+                entity_rows = [row for row in entity_rows if (row["kind"], row["normalized_name"]) not in existing]
+                if entity_rows:
+                    conn.execute(insert(models.VerifiedEntity.__table__), entity_rows)
+                inserted["verified_entities"] = len(entity_rows)
+                if engine.dialect.name == "postgresql":
+                    _reset_sequences(conn, models)
+        
+        seconds = time.perf_counter() - started
+        summary.update(
+            users=sum(len(ids) for ids in users.values()),
+            rows=dict(inserted),
+            completed_candidates=generator.counts["completed"],
+            seconds=round(seconds, 1),
+            candidates_per_second=round(inserted["candidates"] / seconds),
+        )
+    
+    import json
+    print(json.dumps(summary, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,412 @@
+"""
+Mixed-workload load test of the API, with per-endpoint latency percentiles.
+
+Fills a scratch database with benchmarks.generate_data (--preload
+candidates, so there is a backlog to verify and reports to fetch), starts the
+app with uvicorn on a local port and runs virtual users against it over HTTP
+for --duration seconds:
+
+- recruiters upload small CSV batches and poll their batch list, batch
+  detail and stats;
+- verifiers claim the next candidate, check suggestions, verify every claim
+  and complete the candidate;
+- report clients generate reports of verified candidates and fetch them,
+  revalidating with the ETag they saw last.
+
+Every virtual user waits an exponentially distributed think time (--think-ms)
+between actions, so the user counts and the think time set the offered load.
+Requests started in the first --warmup seconds are not counted. The result
+has throughput, errors and p50/p95/p99 latency per endpoint, keyed by route
+template; --output saves it as JSON and --baseline compares the run with a
+saved one. An endpoint regresses when its p95 grows by more than --tolerance
+(and by more than --min-delta-ms) or its error rate grows; the run as a whole
+also regresses when its throughput drops by more than --tolerance. Endpoints
+with fewer than --min-count requests are shown but not judged. Any
+regression exits with status 1.
+
+    python -m benchmarks.load_test --duration 60 --output baseline.json
+    python -m benchmarks.load_test --duration 60 --baseline baseline.json
+    DB_ASYNC=true python -m benchmarks.load_test --workers 4 --verifiers 40
+
+The server it starts uses DB_ENGINE_PROFILE=development (WAL, see
+app.database.ENGINE_PROFILES) unless DB_ENGINE_PROFILE is set. On the
+rollback-journal default profile the default mix is limited by SQLite
+locking: writers fail with "database is locked" and stall for seconds, so
+that profile measures lock contention rather than the app. The profile and
+the engine settings it resolves to are recorded in the result's config, and
+runs are only comparable with a baseline of the same profile.
+
+With --base-url the server is not started and nothing is seeded: point
+DATABASE_URL at the server's database, filled by benchmarks.generate_data
+with the same --seed, and use the server's SECRET_KEY so the tokens are
+accepted.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import use_scratch_database, summarize
+
+class Recorder:
+    """Latencies and status codes per endpoint label, for requests started after the warmup"""
+    
+    def __init__(self, client, warmup_until: float):
+        self.client = client
+        self.warmup_until = warmup_until
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+    
+    async def request(self, label: str, method: str, url: str, token: str, headers: Optional[dict] = None, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers={"Authorization": f"Bearer {token}", **(headers or {})}, **kwargs)
+        except Exception as exc:
+            response, status = None, type(exc).__name__
+        else:
+            status = response.status_code
+        if started >= self.warmup_until:
+            self.latencies[label].append(time.perf_counter() - started)
+            self.statuses[label][status] += 1
+        return response
+    
+    def result(self, elapsed: float) -> Dict[str, Any]:
+        endpoints = {}
+        for label in sorted(self.latencies):
+            statuses = self.statuses[label]
+            errors = sum(count for status, count in statuses.items() if not (isinstance(status, int) and (200 <= status < 300 or status == 304)))
+            endpoints[label] = {
+                "throughput_rps": round(len(self.latencies[label]) / elapsed, 2),
+                "errors": errors,
+                "statuses": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+                **summarize(self.latencies[label]),
+            }
+        every = [latency for latencies in self.latencies.values() for latency in latencies]
+        return {
+            "totals": {
+                "throughput_rps": round(len(every) / elapsed, 2),
+                "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+                **summarize(every),
+            },
+            "endpoints": endpoints,
+        }
+
+def _ok(response) -> bool:
+    return response is not None and 200 <= response.status_code < 300
+
+async def _think(rng: random.Random, think_ms: float) -> None:
+    await asyncio.sleep(rng.expovariate(1000 / think_ms) if think_ms > 0 else 0)
+
+async def recruiter(recorder: Recorder, rng: random.Random, token: str, args, stop_at: float) -> None:
+    from benchmarks.generate_data import PersonFactory, csv_upload
+    
+    people = PersonFactory(random.Random(rng.random()), datetime.utcnow(), 2000)
+    response = await recorder.request("GET /api/candidates/batches", "GET", "/api/candidates/batches", token)
+    batches = [batch["id"] for batch in response.json()[:20]] if _ok(response) else []
+    uploads = 0
+    
+    while time.perf_counter() < stop_at:
+        action = rng.random()
+        if action < args.upload_share or not batches:
+            uploads += 1
+            body = csv_upload(people, rng.randint(args.upload_rows // 2, args.upload_rows * 3 // 2)).encode()
+            response = await recorder.request(
+                "POST /api/candidates/upload/csv", "POST", "/api/candidates/upload/csv", token,
+                files={"file": ("candidates.csv", body, "text/csv")}, data={"batch_name": f"Load test upload {uploads}"}
+            )
+            if _ok(response):
+                batches.insert(0, response.json()["batch_id"])
+        elif action < 0.5:
+            await recorder.request("GET /api/candidates/batches", "GET", "/api/candidates/batches", token)
+        elif action < 0.8:
+            batch_id = batches[min(len(batches) - 1, int(rng.expovariate(0.5)))]
+            await recorder.request("GET /api/candidates/batch/{batch_id}", "GET", f"/api/candidates/batch/{batch_id}", token)
+        else:
+            await recorder.request("GET /api/verification/stats", "GET", "/api/verification/stats", token)
+        await _think(rng, args.think_ms)
+
+async def verifier(recorder: Recorder, rng: random.Random, token: str, args, stop_at: float, completed: List[int]) -> None:
+    outcomes = ("VERIFIED",) * 16 + ("UNCERTAIN",) * 3 + ("INCONSISTENT",)
+    
+    while time.perf_counter() < stop_at:
+        response = await recorder.request("POST /api/verification/next", "POST", "/api/verification/next", token)
+        if response is not None and response.status_code == 204:
+            # Nothing to claim: look at the queue like a verifier waiting for work would
+            await recorder.request("GET /api/verification/pending", "GET", "/api/verification/pending", token)
+        if not _ok(response) or response.status_code == 204:
+            await _think(rng, args.think_ms)
+            continue
+        
+        candidate = response.json()
+        if rng.random() < 0.3:
+            await recorder.request("GET /api/verification/my-queue", "GET", "/api/verification/my-queue", token)
+        for kind, key in (("employment", "employment_history"), ("education", "education_history")):
+            for index, claim in enumerate(candidate[key]):
+                await _think(rng, args.think_ms)
+                if index == 0 and rng.random() < 0.5:
+                    await recorder.request(
+                        f"GET /api/verification/{kind}/{{{kind}_id}}/suggestions", "GET", f"/api/verification/{kind}/{claim['id']}/suggestions", token
+                    )
+                await recorder.request(
+                    f"PUT /api/verification/{kind}/{{{kind}_id}}", "PUT", f"/api/verification/{kind}/{claim['id']}", token,
+                    json={"claim_status": rng.choice(outcomes), "verification_note": "Load test", "verification_sources": ["company_registry"]}
+                )
+        
+        response = await recorder.request(
+            "POST /api/verification/complete/{candidate_id}", "POST", f"/api/verification/complete/{candidate['id']}", token
+        )
+        if _ok(response):
+            completed.append(candidate["id"])
+        if rng.random() < 0.2:
+            await recorder.request("GET /api/verification/stats", "GET", "/api/verification/stats", token)
+        await _think(rng, args.think_ms)
+
+async def report_client(recorder: Recorder, rng: random.Random, token: str, args, stop_at: float, completed: List[int], reports: Dict[int, dict]) -> None:
+    while time.perf_counter() < stop_at:
+        if not completed:
+            await _think(rng, args.think_ms)
+            continue
+        
+        # Recently verified candidates are the ones whose reports get read
+        candidate_id = completed[max(0, len(completed) - 1 - int(rng.expovariate(1 / 50)))]
+        known = reports.get(candidate_id)
+        if known is None or rng.random() < args.generate_share:
+            response = await recorder.request(
+                "POST /api/reports/generate/{candidate_id}", "POST", f"/api/reports/generate/{candidate_id}", token
+            )
+            if _ok(response):
+                reports[candidate_id] = {"id": response.json()["id"], "etag": None}
+        elif rng.random() < 0.5:
+            response = await recorder.request(
+                "GET /api/reports/candidate/{candidate_id}/latest", "GET", f"/api/reports/candidate/{candidate_id}/latest", token,
+                headers={"If-None-Match": known["etag"]} if known["etag"] else None
+            )
+            if _ok(response):
+                known["etag"] = response.headers.get("etag")
+        else:
+            response = await recorder.request(
+                "GET /api/reports/{report_id}/html", "GET", f"/api/reports/{known['id']}/html", token,
+                headers={"If-None-Match": known["etag"]} if known["etag"] else None
+            )
+            if _ok(response):
+                known["etag"] = response.headers.get("etag")
+        await _think(rng, args.think_ms)
+
+async def _run(base_url: str, tokens: Dict[str, List[str]], completed: List[int], reports: Dict[int, dict], args) -> Dict[str, Any]:
+    import httpx
+    
+    users = args.recruiters + args.verifiers + args.report_clients
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        started = time.perf_counter()
+        recorder = Recorder(client, started + args.warmup)
+        stop_at = started + args.duration
+        
+        def user_rng(role, index):
+            return random.Random(f"{args.seed}-{role}-{index}")
+        
+        await asyncio.gather(
+            *(recruiter(recorder, user_rng("recruiter", i), tokens["recruiter"][i % len(tokens["recruiter"])], args, stop_at)
+              for i in range(args.recruiters)),
+            *(verifier(recorder, user_rng("verifier", i), tokens["verifier"][i % len(tokens["verifier"])], args, stop_at, completed)
+              for i in range(args.verifiers)),
+            *(report_client(recorder, user_rng("reports", i), tokens["recruiter"][-1 - i % len(tokens["recruiter"])], args, stop_at, completed, reports)
+              for i in range(args.report_clients)),
+        )
+        # Users finish the request they were in when the time ran out
+        elapsed = time.perf_counter() - recorder.warmup_until
+    
+    return recorder.result(elapsed)
+
+def _seed(args) -> None:
+    command = [
+        sys.executable, "-m", "benchmarks.generate_data",
+        "--candidates", str(args.preload), "--seed", str(args.seed),
+        "--recruiters", str(max(args.recruiters, args.report_clients, 1)), "--verifiers", str(max(args.verifiers, 1)), "--admins", "1",
+        "--days", "30", "--backlog-days", "10",
+    ]
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def _load_state(args):
+    """Tokens of the seeded users, and the verified candidates and reports to start from"""
+    from sqlalchemy import func, select
+    
+    from app import auth, models
+    from app.database import SessionLocal
+    
+    with SessionLocal() as db:
+        users = db.execute(
+            select(models.User.email, models.User.role)
+            .where(models.User.email.like(f"%@synthetic{args.seed}.example.com"))
+            .order_by(models.User.id)
+        ).all()
+        completed = db.scalars(
+            select(models.Candidate.id)
+            .where(models.Candidate.verification_status == models.VerificationStatus.COMPLETED)
+            .order_by(models.Candidate.id.desc())
+            .limit(5000)
+        ).all()[::-1]
+        latest = db.execute(
+            select(models.Report.candidate_id, func.max(models.Report.id))
+            .where(models.Report.candidate_id.in_(completed))
+            .group_by(models.Report.candidate_id)
+        ).all()
+    
+    tokens = defaultdict(list)
+    for email, role in users:
+        tokens[role.value].append(auth.create_access_token({"sub": email}))
+    if not tokens["recruiter"] or not tokens["verifier"]:
+        raise SystemExit(f"No users of seed {args.seed}; fill the database with benchmarks.generate_data --seed {args.seed} first")
+    return tokens, list(completed), {candidate_id: {"id": report_id, "etag": None} for candidate_id, report_id in latest}
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _start_server(args) -> tuple:
+    import httpx
+    
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        env=os.environ.copy()
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"The server exited with status {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return server, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("The server did not come up within 60 s")
+
+def _error_rate(endpoint: Dict[str, Any]) -> float:
+    return endpoint["errors"] / max(1, endpoint["count"])
+
+def _compare_row(name: str, before: Dict[str, Any], after: Dict[str, Any], args, throughput: bool) -> Dict[str, Any]:
+    reasons = []
+    if min(before["count"], after["count"]) >= args.min_count:
+        if after["p95_ms"] > before["p95_ms"] * (1 + args.tolerance) and after["p95_ms"] - before["p95_ms"] > args.min_delta_ms:
+            reasons.append("p95")
+        if throughput and after["throughput_rps"] < before["throughput_rps"] * (1 - args.tolerance):
+            reasons.append("throughput")
+        if _error_rate(after) > _error_rate(before) + 0.01:
+            reasons.append("errors")
+    return {
+        "endpoint": name,
+        "regressed": bool(reasons),
+        "reason": ", ".join(reasons) if reasons or min(before["count"], after["count"]) >= args.min_count else "too few requests to judge",
+        "p95_ms": [before["p95_ms"], after["p95_ms"]],
+        "p99_ms": [before["p99_ms"], after["p99_ms"]],
+        "throughput_rps": [before["throughput_rps"], after["throughput_rps"]],
+        "errors": [before["errors"], after["errors"]],
+    }
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], args) -> List[Dict[str, Any]]:
+    """Rows comparing a run with a saved one; `regressed` marks what got worse"""
+    # Per endpoint, throughput mostly follows the random action mix, so it is only judged for the whole run
+    rows = [_compare_row("all requests", baseline["totals"], result["totals"], args, throughput=True)]
+    for label, before in baseline["endpoints"].items():
+        after = result["endpoints"].get(label)
+        if after is None:
+            rows.append({"endpoint": label, "regressed": before["count"] >= args.min_count, "reason": "not exercised in this run"})
+        else:
+            rows.append(_compare_row(label, before, after, args, throughput=False))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=60, help="seconds, including the warmup")
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--recruiters", type=int, default=5)
+    parser.add_argument("--verifiers", type=int, default=20)
+    parser.add_argument("--report-clients", type=int, default=10)
+    parser.add_argument("--think-ms", type=float, default=200, help="mean pause between a user's actions")
+    parser.add_argument("--upload-share", type=float, default=0.1, help="share of recruiter actions that upload a batch")
+    parser.add_argument("--upload-rows", type=int, default=20, help="mean candidates per uploaded CSV")
+    parser.add_argument("--generate-share", type=float, default=0.2, help="share of report requests that generate a new report")
+    parser.add_argument("--preload", type=int, default=20000, help="candidates generated before the run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--base-url", help="test a running server instead of starting one")
+    parser.add_argument("--output", help="write the result JSON here")
+    parser.add_argument("--baseline", help="result JSON of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative p95 / throughput change counted as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="p95 changes below this are noise")
+    parser.add_argument("--min-count", type=int, default=50, help="endpoints with fewer requests in either run are not judged")
+    args = parser.parse_args()
+    
+    server = None
+    if args.base_url:
+        base_url = args.base_url.rstrip("/")
+        tokens, completed, reports = _load_state(args)
+    else:
+        use_scratch_database("load.db")
+        os.environ.setdefault("DB_ENGINE_PROFILE", "development")
+        os.environ.setdefault("BLOB_STORE_PATH", os.path.join(os.path.dirname(os.environ["DATABASE_URL"].split("///", 1)[-1]), "blobs"))
+        _seed(args)
+        tokens, completed, reports = _load_state(args)
+        server, base_url = _start_server(args)
+    
+    try:
+        result = asyncio.run(_run(base_url, tokens, completed, reports, args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+    config["db_async"] = os.getenv("DB_ASYNC", "false")
+    if not args.base_url:
+        from app.database import resolve_engine_profile
+        
+        config["db_engine_profile"] = os.getenv("DB_ENGINE_PROFILE", "default")
+        config["db_engine_settings"] = resolve_engine_profile(config["db_engine_profile"])
+    result = {"config": config, **result}
+    
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(result, handle, indent=2)
+    print(json.dumps(result, indent=2))
+    
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        profiles = (baseline.get("config", {}).get("db_engine_profile"), config.get("db_engine_profile"))
+        if profiles[0] != profiles[1]:
+            print(f"Warning: the baseline ran with DB_ENGINE_PROFILE={profiles[0]}, this run with {profiles[1]}")
+        rows = compare(result, baseline, args)
+        for row in rows:
+            if "p95_ms" not in row:
+                print(f"[{'REGRESSED' if row['regressed'] else 'ok'}] {row['endpoint']}: {row['reason']}")
+                continue
+            print(
+                f"[{'REGRESSED' if row['regressed'] else 'ok'}] {row['endpoint']}: "
+                f"p95 {row['p95_ms'][0]} -> {row['p95_ms'][1]} ms, p99 {row['p99_ms'][0]} -> {row['p99_ms'][1]} ms, "
+                f"{row['throughput_rps'][0]} -> {row['throughput_rps'][1]} req/s, errors {row['errors'][0]} -> {row['errors'][1]}"
+                + (f" ({row['reason']})" if row["reason"] else "")
+            )
+        regressed = [row for row in rows if row["regressed"]]
+        if regressed:
+            print(f"\n{len(regressed)} regressions against {args.baseline}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
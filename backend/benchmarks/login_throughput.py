@@ -0,0 +1,103 @@
+"""
+Login throughput at different bcrypt cost factors.
+
+Fires a burst of concurrent /api/auth/login/json requests for distinct
+accounts while a background client polls /health, and reports successful
+logins per second, how many requests were shed with 503 by the password
+pool's admission control, and the latency of both endpoints. Rate limits
+are disabled so only the hashing pool is measured.
+
+    python -m benchmarks.login_throughput --rounds 10 11 12 --logins 200 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import use_scratch_database, summarize
+
+async def _burst(app, emails, password, concurrency):
+    import httpx
+
+    login_latencies, health_latencies, statuses = [], [], {}
+    pending = iter(emails)
+    done = asyncio.Event()
+
+    async def login_loop(client):
+        for email in pending:
+            started = time.perf_counter()
+            response = await client.post("/api/auth/login/json", json={"email": email, "password": password})
+            login_latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    async def health_loop(client):
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get("/health")
+            health_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0.005)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        poller = asyncio.create_task(health_loop(client))
+        started = time.perf_counter()
+        await asyncio.gather(*(login_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await poller
+
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "successful_logins_per_s": round(statuses.get(200, 0) / elapsed, 1),
+        "status_counts": statuses,
+        "login": summarize(login_latencies),
+        "health": summarize(health_latencies),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    use_scratch_database()
+
+    from passlib.context import CryptContext
+
+    from app import auth, models
+    from app.database import Base, SessionLocal, engine
+    from app.main import app
+    from app.rate_limit import login_ip_limiter, login_account_limiter
+
+    login_ip_limiter.rate = 0
+    login_account_limiter.rate = 0
+    Base.metadata.create_all(bind=engine)
+
+    password = "bench-password"
+    emails = [f"verifier{i}@bench.example.com" for i in range(args.logins)]
+    db = SessionLocal()
+    db.add_all(
+        models.User(email=email, hashed_password="!", full_name=email, role=models.UserRole.VERIFIER, is_active=True)
+        for email in emails
+    )
+    db.commit()
+
+    results = {}
+    for rounds in args.rounds:
+        auth.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        password_hash = auth.get_password_hash(password)
+        db.query(models.User).update({models.User.hashed_password: password_hash})
+        db.commit()
+        results[f"rounds_{rounds}"] = asyncio.run(_burst(app, emails, password, args.concurrency))
+    db.close()
+
+    print(json.dumps({
+        "config": vars(args),
+        "password_pool": {"workers": auth.PASSWORD_HASH_WORKERS, "queue": auth.PASSWORD_HASH_QUEUE},
+        "results": results,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
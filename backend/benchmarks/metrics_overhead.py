@@ -0,0 +1,87 @@
+"""
+Per-request cost of app.metrics.MetricsMiddleware and of rendering /metrics.
+
+Calls a trivial ASGI endpoint --requests times directly (no server, no HTTP
+parsing) with and without the middleware, spread over every route of the
+app so the label lookups see a realistic number of series, and reports the
+difference per request. Then renders the registry with those series in it.
+
+    python -m benchmarks.metrics_overhead --requests 200000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import use_scratch_database
+
+class _Route:
+    def __init__(self, path):
+        self.path = path
+
+def _endpoint(routes):
+    """Stands in for the router: records the matched route and sends a small JSON body"""
+    body = b'{"status":"healthy"}'
+    start = {"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]}
+    end = {"type": "http.response.body", "body": body}
+
+    async def app(scope, receive, send):
+        scope["route"] = routes[scope["index"] % len(routes)]
+        await send(start)
+        await send(end)
+
+    return app
+
+async def _drive(app, requests):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for index in range(requests):
+        await app({"type": "http", "method": "GET", "path": "/", "index": index}, receive, send)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    use_scratch_database()
+
+    from app import metrics
+    from app.main import app as main_app
+
+    routes = [_Route(route.path) for route in main_app.routes]
+    endpoint = _endpoint(routes)
+    instrumented = metrics.MetricsMiddleware(endpoint)
+
+    # Best of several rounds, alternating, so both variants see the same machine noise
+    bare, timed = [], []
+    for _ in range(args.rounds):
+        bare.append(asyncio.run(_drive(endpoint, args.requests)))
+        timed.append(asyncio.run(_drive(instrumented, args.requests)))
+
+    renders = []
+    for _ in range(20):
+        started = time.perf_counter()
+        text = metrics.render()
+        renders.append(time.perf_counter() - started)
+
+    print(json.dumps({
+        "config": vars(args),
+        "routes": len(routes),
+        "bare_us_per_request": round(min(bare) / args.requests * 1e6, 2),
+        "instrumented_us_per_request": round(min(timed) / args.requests * 1e6, 2),
+        "overhead_us_per_request": round((min(timed) - min(bare)) / args.requests * 1e6, 2),
+        "render_ms": round(min(renders) * 1000, 2),
+        "render_bytes": len(text.encode("utf-8")),
+        "series_lines": sum(1 for line in text.splitlines() if not line.startswith("#")),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,310 @@
+"""
+Micro-benchmarks of the upload parsers and the report renderer.
+
+Runs parse_csv_candidates, parse_pdf_cv, extract_section,
+parse_employment_section and generate_cv_html on the checked-in inputs in
+benchmarks/inputs (CSV uploads of 10, 100 and 1,000 candidates; short,
+typical and long PDF CVs and the text pdfplumber extracts from them) and
+reports operations per second and peak memory of one call under
+tracemalloc. A measurement runs --rounds rounds of at least --min-time
+seconds over all benchmarks in turn, each one right after a round of a
+fixed reference workload, and takes the median of their speed ratios; it is
+repeated --repeat times and the median counts.
+
+Results are compared with benchmarks/baselines/micro.json: a benchmark
+fails when its ops/sec drop, or its peak memory grows, by more than
+--threshold percent, and any failure exits with status 1. Speed is compared
+relative to the reference, so a machine that is slower overall, or busy
+during the run, does not fail every benchmark. Each line also reports the noise of the run, how far its repeats
+strayed from their median; it only tells how far to trust the result and
+does not widen the threshold. When it is large, run with more repeats. The
+baseline is still best recorded where the comparison runs, with more
+repeats:
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro --filter pdf --threshold 10
+    python -m benchmarks.micro --update-baseline --repeat 7
+    python -m benchmarks.micro --write-inputs      # regenerate the inputs, then update the baseline
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import random
+import sys
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+INPUTS = os.path.join(os.path.dirname(__file__), "inputs")
+BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+CSV_SIZES = (10, 100, 1000)
+CV_SIZES = ("short", "typical", "long")
+REFERENCE = "reference"
+# The headers parse_pdf_cv looks for the employment section with
+EMPLOYMENT_HEADERS = ["experience", "work experience", "professional experience", "employment history", "work history"]
+EDUCATION_HEADERS = ["education", "academic background", "qualifications", "academic history"]
+
+def write_inputs() -> List[str]:
+    """Regenerate the input files from a fixed seed"""
+    import pdfplumber
+    
+    from benchmarks.generate_data import PersonFactory, csv_upload, cv_pdf
+    
+    os.makedirs(INPUTS, exist_ok=True)
+    people = PersonFactory(random.Random("micro-benchmarks"), datetime(2025, 1, 1), 2000)
+    paths = []
+    for size in CSV_SIZES:
+        path = os.path.join(INPUTS, f"candidates_{size}.csv")
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            handle.write(csv_upload(people, size, "named"))
+        paths.append(path)
+    
+    for size in CV_SIZES:
+        person = people.person("named")
+        if size == "short":
+            person["employment"], person["education"] = person["employment"][-1:], person["education"][-1:]
+        elif size == "long":
+            # A senior candidate: five people's careers back to back, each job described at length
+            for _ in range(4):
+                person["employment"] = people.person("named")["employment"] + person["employment"]
+            person["education"] = (people.person("named")["education"] + person["education"])[-3:]
+        content = cv_pdf(people, person, description_lines=4 if size == "long" else 1)
+        path = os.path.join(INPUTS, f"cv_{size}.pdf")
+        with open(path, "wb") as handle:
+            handle.write(content)
+        with pdfplumber.open(io.BytesIO(content)) as pdf:
+            # The same text parse_pdf_cv builds before it looks for sections
+            text = "".join(page.extract_text() + "\n" for page in pdf.pages)
+        with open(os.path.join(INPUTS, f"cv_{size}.txt"), "w", encoding="utf-8") as handle:
+            handle.write(text)
+        paths += [path, os.path.join(INPUTS, f"cv_{size}.txt")]
+    return paths
+
+def _report_rows(text: str):
+    """Transient Candidate, Employment and Education rows for generate_cv_html, with every claim status"""
+    from app import models
+    from app.utils.pdf_parser import extract_section, parse_education_section, parse_employment_section
+    
+    statuses = [models.ClaimStatus.VERIFIED] * 3 + [models.ClaimStatus.UNCERTAIN, models.ClaimStatus.INCONSISTENT]
+    lines = [line for line in text.splitlines() if line.strip()]
+    candidate = models.Candidate(
+        full_name=lines[0], email=lines[1], phone="+49 151 1234567", linkedin_url="linkedin.com/in/benchmark",
+        verification_status=models.VerificationStatus.COMPLETED, verified_at=datetime(2025, 1, 1)
+    )
+    employment = [
+        models.Employment(
+            company_name=entry["company"], position=entry["position"], start_date=entry["start_date"], end_date=entry["end_date"],
+            is_current=entry["is_current"], description=entry["description"], claim_status=statuses[index % len(statuses)],
+            verification_note=None if index % len(statuses) < 3 else "Dates could not be confirmed", order=index
+        )
+        for index, entry in enumerate(parse_employment_section(extract_section(text, EMPLOYMENT_HEADERS)))
+    ]
+    education = [
+        models.Education(
+            institution=entry["institution"], degree=entry["degree"], field_of_study=entry["field"],
+            start_date=entry["start_date"], end_date=entry["end_date"], is_current=False,
+            claim_status=statuses[index % len(statuses)], order=index
+        )
+        for index, entry in enumerate(parse_education_section(extract_section(text, EDUCATION_HEADERS)))
+    ]
+    return candidate, employment, education
+
+def reference() -> int:
+    """Fixed pure-Python string work, timed with the benchmarks so the machine's speed of the moment can be factored out"""
+    total = 0
+    for i in range(2000):
+        line = f"Position {i % 7} | Company {i} GmbH Jan {2000 + i % 20} - Present"
+        total += len(line.split("|")[1].strip().lower()) + line.count(" ")
+    return total
+
+def benchmarks() -> Dict[str, Callable[[], Any]]:
+    """Benchmark name -> zero-argument call, with every input read up front"""
+    from app.routers.reports import generate_cv_html
+    from app.utils.csv_parser import parse_csv_candidates
+    from app.utils.pdf_parser import extract_section, parse_employment_section, parse_pdf_cv
+    
+    def read(name, mode="rb"):
+        with open(os.path.join(INPUTS, name), mode) as handle:
+            return handle.read()
+    
+    cases = {}
+    for size in CSV_SIZES:
+        content = read(f"candidates_{size}.csv")
+        cases[f"parse_csv_candidates[{size}]"] = lambda content=content: parse_csv_candidates(content)
+    for size in CV_SIZES:
+        content = read(f"cv_{size}.pdf")
+        cases[f"parse_pdf_cv[{size}]"] = lambda content=content: parse_pdf_cv(content)
+    for size in CV_SIZES:
+        text = read(f"cv_{size}.txt", "r")
+        cases[f"extract_section[{size}]"] = lambda text=text: extract_section(text, EMPLOYMENT_HEADERS)
+    for size in CV_SIZES:
+        section = extract_section(read(f"cv_{size}.txt", "r"), EMPLOYMENT_HEADERS)
+        cases[f"parse_employment_section[{size}]"] = lambda section=section: parse_employment_section(section)
+    for size in CV_SIZES:
+        rows = _report_rows(read(f"cv_{size}.txt", "r"))
+        cases[f"generate_cv_html[{size}]"] = lambda rows=rows: generate_cv_html(*rows, verifier_name="Bench Verifier")
+    return cases
+
+def _calls_per_round(call: Callable[[], Any], min_time: float) -> int:
+    """Enough calls to make a round last min_time; the calibration doubles as warmup"""
+    call()
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            call()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return number
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+
+def _peak_kib(call: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        call()
+        return round((tracemalloc.get_traced_memory()[1] - before) / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+def _time_round(call: Callable[[], Any], number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        call()
+    return time.perf_counter() - started
+
+def measure(cases: Dict[str, Callable[[], Any]], rounds: int, min_time: float) -> Dict[str, Dict[str, float]]:
+    """
+    Speed of every case as the median over the rounds of its ratio to the reference round run just
+    before it, so a slow spell on the machine hits both alike and cancels out; ops_per_sec is that
+    ratio times the best round of the reference.
+    """
+    numbers = {name: _calls_per_round(call, min_time) for name, call in cases.items()}
+    ratios: Dict[str, List[float]] = {name: [] for name in cases if name != REFERENCE}
+    best_reference = float("inf")
+    gc_was_enabled = gc.isenabled()
+    # Like timeit, keep collections out of the measured rounds
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            for name in ratios:
+                reference_time = _time_round(cases[REFERENCE], numbers[REFERENCE])
+                elapsed = _time_round(cases[name], numbers[name])
+                best_reference = min(best_reference, reference_time)
+                ratios[name].append(numbers[name] / elapsed / (numbers[REFERENCE] / reference_time))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    
+    reference_ops = numbers[REFERENCE] / best_reference
+    speeds = {REFERENCE: 1.0, **{name: statistics.median(speed) for name, speed in ratios.items()}}
+    return {
+        name: {"ops_per_sec": round(speeds[name] * reference_ops, 2), "peak_kib": _peak_kib(call)}
+        for name, call in cases.items()
+    }
+
+def measure_repeated(cases: Dict[str, Callable[[], Any]], repeat: int, rounds: int, min_time: float) -> Dict[str, Dict[str, float]]:
+    """
+    Median of `repeat` measurements. Speeds are taken relative to the reference of the same
+    measurement, so a repeat on a busy machine does not skew the others; noise_pct is how far
+    the furthest repeat strayed from that median.
+    """
+    runs = [measure(cases, rounds, min_time) for _ in range(repeat)]
+    reference_ops = statistics.median(run[REFERENCE]["ops_per_sec"] for run in runs)
+    results = {}
+    for name in cases:
+        relative = [run[name]["ops_per_sec"] / run[REFERENCE]["ops_per_sec"] for run in runs]
+        median = statistics.median(relative)
+        results[name] = {
+            "ops_per_sec": round(median * reference_ops, 2),
+            "peak_kib": statistics.median(run[name]["peak_kib"] for run in runs),
+            "noise_pct": round(max(abs(speed / median - 1) for speed in relative) * 100, 1),
+        }
+    return results
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[Tuple[str, bool, str]]:
+    """(name, ok, line) per benchmark; speed is judged relative to the reference run alongside it"""
+    machine = results[REFERENCE]["ops_per_sec"] / baseline[REFERENCE]["ops_per_sec"]
+    rows = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if name == REFERENCE:
+            continue
+        if before is None:
+            rows.append((name, True, f"[new] {name}: {result['ops_per_sec']} ops/s, {result['peak_kib']} KiB peak (no baseline)"))
+            continue
+        speed = (result["ops_per_sec"] / before["ops_per_sec"] / machine - 1) * 100
+        memory = (result["peak_kib"] / before["peak_kib"] - 1) * 100 if before["peak_kib"] else 0.0
+        ok = speed >= -threshold and memory <= threshold
+        rows.append((name, ok, (
+            f"[{'ok' if ok else 'REGRESSED'}] {name}: {before['ops_per_sec']} -> {result['ops_per_sec']} ops/s "
+            f"({speed:+.1f}% relative, noise ±{result['noise_pct']:g}%), {before['peak_kib']} -> {result['peak_kib']} KiB peak ({memory:+.1f}%)"
+        )))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per round")
+    parser.add_argument("--repeat", type=int, default=3, help="measurements to take the median of")
+    parser.add_argument("--threshold", type=float, default=20.0, help="percent slowdown or memory growth that fails a benchmark")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline instead of comparing")
+    parser.add_argument("--write-inputs", action="store_true", help="regenerate benchmarks/inputs and exit")
+    args = parser.parse_args()
+    
+    if args.write_inputs:
+        print("\n".join(write_inputs()))
+        return
+    
+    cases = {name: call for name, call in benchmarks().items() if args.filter in name}
+    if not cases:
+        raise SystemExit(f"No benchmark name contains {args.filter!r}")
+    cases = {REFERENCE: reference, **cases}
+    results = measure_repeated(cases, args.repeat, args.rounds, args.min_time)
+    
+    environment = {"python": platform.python_version(), "machine": platform.machine(), "processor": platform.processor() or None}
+    print(json.dumps({"environment": environment, "results": results}, indent=2))
+    
+    if args.update_baseline:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as handle:
+                stored = json.load(handle)["benchmarks"]
+        if REFERENCE in stored:
+            # Entries kept from the earlier run (--filter) are rescaled to this run's reference speed
+            scale = results[REFERENCE]["ops_per_sec"] / stored[REFERENCE]["ops_per_sec"]
+            for entry in stored.values():
+                entry["ops_per_sec"] = round(entry["ops_per_sec"] * scale, 2)
+        stored.update(results)
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as handle:
+            json.dump({"environment": environment, "benchmarks": dict(sorted(stored.items()))}, handle, indent=2)
+            handle.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+    
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; record one with --update-baseline")
+        return
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)["benchmarks"]
+    if REFERENCE not in baseline:
+        raise SystemExit(f"{args.baseline} has no {REFERENCE} entry; record it again with --update-baseline")
+    rows = compare(results, baseline, args.threshold)
+    for _, _, line in rows:
+        print(line)
+    failed = [name for name, ok, _ in rows if not ok]
+    if failed:
+        print(f"\n{len(failed)} benchmarks regressed by more than {args.threshold:g}%")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+Queue wait times under FIFO and under the fair-share scheduler.
+
+Discrete-event simulation of --verifiers verifiers working through uploads
+from a few recruiters who send large batches and many who send small ones,
+some with an SLA deadline. Each policy sees the same arrivals and the same
+actual verification times (the effort estimate with lognormal noise). FIFO
+hands out the oldest pending candidate; the scheduler picks the batch with
+app.scheduler.FairShareQueue rebuilt from the active batches on every
+claim, as POST /api/verification/next does. No database is involved.
+
+Reports per recruiter group the wait from upload to claim, the time until
+a batch is completely verified, and the share of deadlines met. Total
+throughput is the same under both policies; the scheduler moves waiting
+time from small uploads to the tail of the large ones.
+
+    python -m benchmarks.scheduler_simulation --days 5 --verifiers 16
+"""
+
+import argparse
+import heapq
+import json
+import random
+from datetime import datetime, timedelta
+
+from app.scheduler import BatchState, FairShareQueue, estimate_effort
+from benchmarks.common import percentile
+
+START = datetime(2024, 1, 1)
+
+def _workload(rng, args):
+    """Batches as (arrival_minute, recruiter_id, group, sla_minutes, [(effort, actual_minutes)])"""
+    batches = []
+    recruiters = [("large", args.large_batch) for _ in range(args.large_recruiters)]
+    recruiters += [("small", args.small_batch) for _ in range(args.small_recruiters)]
+    for recruiter_id, (group, size) in enumerate(recruiters):
+        per_day = 1.0 if group == "large" else args.small_uploads_per_day
+        minute = rng.expovariate(per_day / 1440.0)
+        while minute < args.days * 1440:
+            count = max(1, int(rng.gauss(size, size * 0.3)))
+            candidates = []
+            for _ in range(count):
+                effort = estimate_effort(rng.randint(1, 6), rng.randint(0, 3))
+                candidates.append((effort, effort * rng.lognormvariate(0, 0.35)))
+            sla = args.sla_hours * 60 if group == "small" and rng.random() < args.sla_share else None
+            batches.append((minute, recruiter_id, group, sla, candidates))
+            minute += rng.expovariate(per_day / 1440.0)
+    batches.sort(key=lambda batch: batch[0])
+    return batches
+
+def _simulate(workload, verifiers, policy):
+    """Claim minute of every candidate and completion minute of every batch"""
+    arrivals = [(batch[0], index) for index, batch in enumerate(workload)]
+    heapq.heapify(arrivals)
+    free = [(0.0, verifier) for verifier in range(verifiers)]
+    heapq.heapify(free)
+    
+    pending = {}
+    states = {}
+    claimed = {index: [] for index in range(len(workload))}
+    finished = {index: 0.0 for index in range(len(workload))}
+    
+    while arrivals or pending:
+        now, verifier = heapq.heappop(free)
+        while arrivals and arrivals[0][0] <= now:
+            _, index = heapq.heappop(arrivals)
+            arrival, recruiter_id, _, sla, candidates = workload[index]
+            # The scheduler serves a batch's candidates smallest estimate first, FIFO in upload order
+            pending[index] = sorted(candidates, key=lambda c: c[0], reverse=True) if policy == "fair" else candidates[::-1]
+            states[index] = BatchState(
+                index, recruiter_id,
+                sla_deadline=START + timedelta(minutes=arrival + sla) if sla is not None else None,
+                uploaded_at=START + timedelta(minutes=arrival)
+            )
+        if not pending:
+            # Idle until the next upload
+            heapq.heappush(free, (arrivals[0][0], verifier))
+            continue
+        
+        if policy == "fair":
+            batch = FairShareQueue(
+                [states[index] for index in pending], START + timedelta(minutes=now)
+            ).next_batch()
+            index = batch.batch_id
+        else:
+            index = min(pending)
+        effort, actual = pending[index].pop()
+        states[index].served_effort += effort
+        claimed[index].append(now)
+        done = now + actual
+        finished[index] = max(finished[index], done)
+        if not pending[index]:
+            del pending[index]
+        heapq.heappush(free, (done, verifier))
+    
+    return claimed, finished
+
+def _report(workload, claimed, finished):
+    report = {}
+    for group in ("large", "small"):
+        indexes = [index for index, batch in enumerate(workload) if batch[2] == group]
+        waits = sorted(
+            (minute - workload[index][0]) / 60 for index in indexes for minute in claimed[index]
+        )
+        turnaround = sorted((finished[index] - workload[index][0]) / 60 for index in indexes)
+        report[group] = {
+            "batches": len(indexes),
+            "candidates": len(waits),
+            "wait_mean_h": round(sum(waits) / len(waits), 2) if waits else 0.0,
+            "wait_p95_h": round(percentile(waits, 95), 2),
+            "batch_done_p50_h": round(percentile(turnaround, 50), 2),
+            "batch_done_p95_h": round(percentile(turnaround, 95), 2),
+        }
+    with_sla = [index for index, batch in enumerate(workload) if batch[3] is not None]
+    met = sum(1 for index in with_sla if finished[index] - workload[index][0] <= workload[index][3])
+    report["sla_met"] = f"{met}/{len(with_sla)}"
+    report["makespan_h"] = round(max(finished.values()) / 60, 1) if finished else 0.0
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--verifiers", type=int, default=16)
+    parser.add_argument("--large-recruiters", type=int, default=2)
+    parser.add_argument("--large-batch", type=int, default=150)
+    parser.add_argument("--small-recruiters", type=int, default=12)
+    parser.add_argument("--small-batch", type=int, default=10)
+    parser.add_argument("--small-uploads-per-day", type=float, default=1.5)
+    parser.add_argument("--sla-share", type=float, default=0.2)
+    parser.add_argument("--sla-hours", type=float, default=12)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    workload = _workload(random.Random(args.seed), args)
+    work_minutes = sum(actual for batch in workload for _, actual in batch[4])
+    results = {}
+    for policy in ("fifo", "fair"):
+        claimed, finished = _simulate(workload, args.verifiers, policy)
+        results[policy] = _report(workload, claimed, finished)
+    
+    print(json.dumps({
+        "config": vars(args),
+        "candidates": sum(len(batch[4]) for batch in workload),
+        "utilization": round(work_minutes / (args.verifiers * args.days * 1440), 2),
+        **results,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Throughput of the external source checks on a large batch.
+
+Starts the local stand-in sources (app.connectors.standins) in a separate
+process with --latency-ms of simulated latency per request, seeds one batch
+with about --claims claims (2 jobs and 1 degree per candidate, employers
+drawn from --companies names), then times
+
+- a cold run with an empty response cache and --concurrency claims in flight;
+- a warm re-run, served from the cache;
+- a sequential baseline (one claim at a time) over --baseline-claims claims.
+
+    python -m benchmarks.source_checks --claims 10000 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.common import percentile, use_scratch_database
+
+def _free_port_block(size):
+    """First port of `size` consecutive free ports"""
+    while True:
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            start = probe.getsockname()[1]
+        if start + size >= 65536:
+            continue
+        try:
+            for port in range(start, start + size):
+                with socket.socket() as probe:
+                    probe.bind(("127.0.0.1", port))
+            return start
+        except OSError:
+            continue
+
+def _wait_for(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Stand-in on port {port} did not start")
+
+def _seed(db, candidates, companies, seed):
+    from sqlalchemy import insert
+    
+    from app import models
+    
+    rng = random.Random(seed)
+    recruiter = models.User(email="r@bench.example.com", hashed_password="!", full_name="R", role=models.UserRole.RECRUITER)
+    db.add(recruiter)
+    db.flush()
+    batch = models.CandidateBatch(batch_name="sources", recruiter_id=recruiter.id, upload_type="csv", total_candidates=candidates)
+    db.add(batch)
+    db.flush()
+    
+    db.execute(insert(models.Candidate), [
+        {"id": i, "batch_id": batch.id, "full_name": f"Candidate {i}"} for i in range(1, candidates + 1)
+    ])
+    employment, education = [], []
+    for candidate_id in range(1, candidates + 1):
+        year = rng.randint(2000, 2015)
+        education.append({
+            "candidate_id": candidate_id, "institution": f"University {rng.randint(1, 200)}", "degree": "BSc",
+            "start_year": year - 3, "end_year": year, "order": 0
+        })
+        for order in range(2):
+            start, year = year, year + rng.randint(1, 5)
+            employment.append({
+                "candidate_id": candidate_id, "company_name": f"Company {rng.randint(1, companies)} GmbH",
+                "position": "Engineer", "start_year": start, "end_year": year, "order": order
+            })
+    db.execute(insert(models.Employment), employment)
+    db.execute(insert(models.Education), education)
+    db.commit()
+    return batch.id
+
+def _latencies(db):
+    from app import models
+    
+    latencies = {}
+    for model in (models.Employment, models.Education):
+        for (results,) in db.query(model.source_results):
+            for name, result in (results or {}).items():
+                if not result["cached"] and result["latency_ms"] is not None:
+                    latencies.setdefault(name, []).append(result["latency_ms"])
+    return {
+        name: {"count": len(values), "p50_ms": percentile(sorted(values), 50), "p95_ms": percentile(sorted(values), 95)}
+        for name, values in latencies.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=10000)
+    parser.add_argument("--companies", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--baseline-claims", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    use_scratch_database("sources.db")
+    port = _free_port_block(3)
+    standins = subprocess.Popen(
+        [sys.executable, "-m", "app.connectors.standins", "--port", str(port), "--latency-ms", str(args.latency_ms)],
+        stdout=subprocess.DEVNULL
+    )
+    try:
+        for offset in range(3):
+            _wait_for(port + offset)
+        sources = f"company_registry=http://127.0.0.1:{port},employment_records=http://127.0.0.1:{port + 1},degree_registry=http://127.0.0.1:{port + 2}"
+        
+        from app.connectors import create_connectors, response_cache, run_source_checks
+        from app.connectors.runner import _load_claims, check_claims
+        from app.database import Base, SessionLocal, engine
+        
+        Base.metadata.create_all(bind=engine)
+        with SessionLocal() as db:
+            batch_id = _seed(db, args.claims // 3, args.companies, args.seed)
+        
+        runs = {}
+        for name in ("cold", "warm"):
+            if name == "cold":
+                response_cache.clear()
+            started, cpu_started = time.perf_counter(), time.process_time()
+            summary = run_source_checks(batch_id, create_connectors(sources), args.concurrency)
+            seconds, cpu_seconds = time.perf_counter() - started, time.process_time() - cpu_started
+            claims_checked = summary["claims_checked"]
+            runs[name] = {
+                "seconds": round(seconds, 2),
+                "claims_per_second": round(summary["claims_checked"] / seconds),
+                "client_cpu_ms_per_claim": round(cpu_seconds * 1000 / summary["claims_checked"], 2),
+                "cache_hits": summary["cache_hits"],
+                "sources": summary["sources"],
+            }
+            if name == "cold":
+                with SessionLocal() as db:
+                    runs[name]["request_latency"] = _latencies(db)
+        
+        # One claim at a time, nothing cached, results discarded
+        with SessionLocal() as db:
+            claims = _load_claims(db, batch_id)[:args.baseline_claims]
+        response_cache.clear()
+        
+        async def sequential():
+            connectors = create_connectors(sources)
+            for connector in connectors:
+                await connector.open()
+            try:
+                await check_claims(claims, connectors, lambda rows: None, concurrency=1)
+            finally:
+                for connector in connectors:
+                    await connector.aclose()
+        
+        started = time.perf_counter()
+        asyncio.run(sequential())
+        baseline = len(claims) / (time.perf_counter() - started)
+    finally:
+        standins.terminate()
+        standins.wait()
+    # The stand-ins share the machine; on few cores their CPU time caps the client's throughput
+    standin_cpu = resource.getrusage(resource.RUSAGE_CHILDREN)
+    
+    print(json.dumps({
+        "config": vars(args),
+        "claims": claims_checked,
+        "sequential_claims_per_second": round(baseline, 1),
+        "speedup": round(runs["cold"]["claims_per_second"] / baseline, 1),
+        "standin_cpu_seconds": round(standin_cpu.ru_utime + standin_cpu.ru_stime, 2),
+        **runs,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
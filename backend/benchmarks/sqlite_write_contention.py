@@ -0,0 +1,134 @@
+"""
+Concurrent write throughput and lock contention under each engine profile.
+
+Writer threads mimic verifiers updating claims: each transaction reads the
+candidate, updates one claim and bumps the candidate's updated_at. Reader
+threads keep running the pending-queue query alongside. For every profile a
+fresh SQLite database is used, and the script reports committed
+transactions per second, commit latency and how many transactions failed
+with "database is locked".
+
+    python -m benchmarks.sqlite_write_contention --profiles default development production
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from benchmarks.common import summarize
+
+def _run_profile(profile, writers, readers, transactions, candidates):
+    from sqlalchemy import select
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import sessionmaker
+
+    from app import models
+    from app.database import Base, build_engine, resolve_engine_profile
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='cvbench-'), 'contention.db')}"
+    engine = build_engine(url, resolve_engine_profile(profile))
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    with Session() as db:
+        recruiter = models.User(email="r@bench.example.com", hashed_password="!", full_name="R", role=models.UserRole.RECRUITER)
+        db.add(recruiter)
+        db.flush()
+        batch = models.CandidateBatch(batch_name="bench", recruiter_id=recruiter.id, upload_type="csv", total_candidates=candidates)
+        db.add(batch)
+        db.flush()
+        db.add_all(
+            models.Candidate(
+                batch_id=batch.id,
+                full_name=f"Candidate {i}",
+                employment_history=[models.Employment(company_name="TechCorp GmbH", position="Engineer", order=0)]
+            )
+            for i in range(candidates)
+        )
+        db.commit()
+
+    commit_latencies, lock_errors, committed = [], [0], [0]
+    lock = threading.Lock()
+    stop_readers = threading.Event()
+
+    def writer(worker_id):
+        for i in range(transactions):
+            candidate_id = (worker_id * transactions + i) % candidates + 1
+            db = Session()
+            try:
+                candidate = db.get(models.Candidate, candidate_id)
+                employment = db.scalars(
+                    select(models.Employment).where(models.Employment.candidate_id == candidate_id)
+                ).first()
+                employment.claim_status = models.ClaimStatus.VERIFIED
+                employment.verified_at = datetime.utcnow()
+                candidate.updated_at = employment.verified_at
+                started = time.perf_counter()
+                db.commit()
+                with lock:
+                    commit_latencies.append(time.perf_counter() - started)
+                    committed[0] += 1
+            except OperationalError as e:
+                db.rollback()
+                if "locked" not in str(e):
+                    raise
+                with lock:
+                    lock_errors[0] += 1
+            finally:
+                db.close()
+
+    def reader():
+        while not stop_readers.is_set():
+            with Session() as db:
+                db.scalars(
+                    select(models.Candidate)
+                    .where(models.Candidate.verification_status == models.VerificationStatus.PENDING)
+                    .order_by(models.Candidate.created_at)
+                ).all()
+
+    reader_threads = [threading.Thread(target=reader) for _ in range(readers)]
+    writer_threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for thread in reader_threads:
+        thread.start()
+    started = time.perf_counter()
+    for thread in writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stop_readers.set()
+    for thread in reader_threads:
+        thread.join()
+    engine.dispose()
+
+    attempted = writers * transactions
+    return {
+        "attempted": attempted,
+        "committed": committed[0],
+        "lock_errors": lock_errors[0],
+        "lock_error_rate": round(lock_errors[0] / attempted, 4),
+        "commits_per_s": round(committed[0] / elapsed, 1),
+        "commit_latency": summarize(commit_latencies),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="+", default=["default", "development", "production"])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--transactions", type=int, default=50)
+    parser.add_argument("--candidates", type=int, default=500)
+    args = parser.parse_args()
+
+    results = {
+        profile: _run_profile(profile, args.writers, args.readers, args.transactions, args.candidates)
+        for profile in args.profiles
+    }
+    print(json.dumps({"config": vars(args), "results": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Throughput of the timeline pre-checks on a large batch.
+
+Seeds one batch with --candidates candidates (3 jobs and 1 degree each,
+roughly 10% of them with an injected inconsistency) through bulk inserts,
+then times the full database pass (load, analyze, write back) and the
+vectorized analysis on its own.
+
+    python -m benchmarks.timeline_checks --candidates 100000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import use_scratch_database
+
+def _seed(db, candidates, seed):
+    from sqlalchemy import insert
+
+    from app import models
+
+    rng = random.Random(seed)
+    recruiter = models.User(email="r@bench.example.com", hashed_password="!", full_name="R", role=models.UserRole.RECRUITER)
+    db.add(recruiter)
+    db.flush()
+    batch = models.CandidateBatch(batch_name="timeline", recruiter_id=recruiter.id, upload_type="csv", total_candidates=candidates)
+    db.add(batch)
+    db.flush()
+
+    db.execute(insert(models.Candidate), [
+        {"id": i, "batch_id": batch.id, "full_name": f"Candidate {i}"} for i in range(1, candidates + 1)
+    ])
+
+    employment, education = [], []
+    for candidate_id in range(1, candidates + 1):
+        # Months since year 0, so consecutive roles can follow each other without overlapping
+        month = rng.randint(1995, 2012) * 12
+        education.append({
+            "candidate_id": candidate_id, "institution": "University",
+            "start_year": month // 12 - 4, "end_year": month // 12, "order": 0
+        })
+        for order in range(3):
+            start = month + rng.randint(1, 9)
+            month = start + rng.randint(12, 48)
+            current = order == 2
+            employment.append({
+                "candidate_id": candidate_id, "company_name": f"Company {rng.randint(1, 500)}", "position": "Engineer",
+                "start_year": start // 12, "start_month": start % 12 + 1,
+                "end_year": None if current else month // 12, "end_month": None if current else month % 12 + 1,
+                "is_current": current, "order": order
+            })
+        anomaly = rng.random()
+        if anomaly < 0.03:
+            employment[-2]["end_year"] = employment[-2]["start_year"] - 1
+        elif anomaly < 0.06:
+            employment[-2]["end_year"] += 3
+        elif anomaly < 0.08:
+            employment[-2]["is_current"] = True
+        elif anomaly < 0.10:
+            employment[-1]["start_year"] += 4
+
+    db.execute(insert(models.Education), education)
+    db.execute(insert(models.Employment), employment)
+    db.commit()
+    return batch.id
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    use_scratch_database("timeline.db")
+
+    from app import models
+    from app.database import Base, SessionLocal, engine
+    from app.timeline_checks import _load_claims, analyze_timelines, run_timeline_checks
+
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        batch_id = _seed(db, args.candidates, args.seed)
+    seed_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    summary = run_timeline_checks(batch_id)
+    full_pass_seconds = time.perf_counter() - started
+
+    with SessionLocal() as db:
+        employment = _load_claims(db, models.Employment, batch_id)
+        claims = employment + _load_claims(db, models.Education, batch_id)
+    columns = list(zip(*claims))
+    missing = lambda values: [-1 if value is None else value for value in values]
+    started = time.perf_counter()
+    analyze_timelines(
+        candidate_ids=columns[1],
+        is_employment=[row < len(employment) for row in range(len(claims))],
+        start_year=missing(columns[2]),
+        start_month=missing(columns[3]),
+        end_year=missing(columns[4]),
+        end_month=missing(columns[5]),
+        is_current=[bool(value) for value in columns[6]]
+    )
+    analyze_seconds = time.perf_counter() - started
+
+    print(json.dumps({
+        "config": vars(args),
+        "seed_seconds": round(seed_seconds, 2),
+        "full_pass_seconds": round(full_pass_seconds, 2),
+        "analyze_only_seconds": round(analyze_seconds, 3),
+        "claims_per_second": round(summary["claims_checked"] / full_pass_seconds),
+        "summary": summary,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -3,12 +3,13 @@ Initialize database with sample users for testing
 Run this script once to create initial users
 """
 
-from app.database import SessionLocal, engine, Base
+from app.database import SessionLocal
 from app import models
 from app.auth import get_password_hash
+from app.migrations import upgrade_database
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+# Bring the schema up to date
+upgrade_database()
 
 db = SessionLocal()
 
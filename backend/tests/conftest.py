@@ -0,0 +1,126 @@
+"""
+Shared fixtures and the query budget plugin.
+
+The tests run the app against a scratch SQLite database, blob store and
+upload spool in a temporary directory, migrated once per session.
+
+Query budgets per endpoint are enforced with the fixture
+
+    def test_batch_detail(client, headers, query_budget):
+        with query_budget(max_queries=6, max_repeats=1):
+            client.get("/api/candidates/batch/1", headers=headers["recruiter"])
+
+or by marking the whole test, which counts every statement it executes:
+
+    @pytest.mark.query_budget(max_queries=6, max_repeats=1)
+    def test_batch_detail(client): ...
+
+Statements are counted process-wide (see app.sql_profiling.profile_queries),
+so requests made through TestClient, which runs the app on another thread,
+are included.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+# The app reads its configuration at import, so point it at scratch storage before anything imports it
+_SCRATCH = tempfile.mkdtemp(prefix="cvtest-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_SCRATCH, 'test.db')}"
+os.environ["BLOB_STORE_PATH"] = os.path.join(_SCRATCH, "blobs")
+os.environ["UPLOAD_SPOOL_PATH"] = os.path.join(_SCRATCH, "upload_spool")
+
+from app.sql_profiling import profile_queries  # noqa: E402
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries=None, max_repeats=None): fail when the test executes more SQL statements, "
+        "or runs one statement shape more often, than allowed"
+    )
+
+@pytest.fixture
+def query_budget():
+    """Context manager factory: `with query_budget(max_queries=..., max_repeats=...) as profile:`"""
+    return profile_queries
+
+@pytest.fixture
+def sql_profile():
+    """The QueryProfile of everything the test executes, for tests that assert on it themselves"""
+    with profile_queries() as profile:
+        yield profile
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    
+    # The budget is checked when the block exits without an error, so a failing test keeps its own error
+    with profile_queries(**marker.kwargs):
+        return (yield)
+
+@pytest.fixture(scope="session")
+def database():
+    from app.migrations import upgrade_database
+    
+    upgrade_database()
+    return os.environ["DATABASE_URL"]
+
+@pytest.fixture(scope="session")
+def users(database):
+    """One active user per role, by role value"""
+    from app import models
+    from app.database import SessionLocal
+    
+    with SessionLocal() as db:
+        users = {}
+        for role in models.UserRole:
+            user = models.User(
+                email=f"{role.value}@test.example.com",
+                hashed_password="!",
+                full_name=f"Test {role.value.title()}",
+                role=role,
+                is_active=True
+            )
+            db.add(user)
+            users[role.value] = user
+        db.commit()
+        for user in users.values():
+            db.refresh(user)
+        # Usable after the session is closed
+        db.expunge_all()
+        return users
+
+@pytest.fixture(scope="session")
+def headers(users):
+    """Authorization headers per role"""
+    from app import auth
+    
+    return {
+        role: {"Authorization": f"Bearer {auth.create_access_token({'sub': user.email})}"}
+        for role, user in users.items()
+    }
+
+@pytest.fixture(scope="session")
+def client(database):
+    from fastapi.testclient import TestClient
+    
+    from app.main import app
+    
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def upload_csv(client, headers):
+    """Upload a CSV as the recruiter and return the response body"""
+    def upload(content: bytes, batch_name: str = "batch"):
+        response = client.post(
+            "/api/candidates/upload/csv", headers=headers["recruiter"],
+            files={"file": ("batch.csv", content, "text/csv")}, data={"batch_name": batch_name}
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+    
+    return upload
\ No newline at end of file
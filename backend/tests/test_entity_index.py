@@ -0,0 +1,75 @@
+"""verified_entities counts each claim that is VERIFIED now, with the sources it was verified with"""
+
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app import models
+from app.entity_index import EntityIndex
+from app.utils.entity_names import normalize_entity_name
+
+@pytest.fixture
+def claimed_employment(client, headers, upload_csv):
+    """An employment claim of a new company, on a candidate the verifier has claimed"""
+    company = f"Entity {uuid.uuid4().hex[:8]} GmbH"
+    batch = upload_csv(f"Full Name,Company 1,Position 1\nEntity Candidate,{company},Engineer\n".encode(), company)
+    candidate = client.get(f"/api/candidates/batch/{batch['batch_id']}", headers=headers["recruiter"]).json()["candidates"][0]
+    response = client.post(f"/api/verification/claim/{candidate['id']}", headers=headers["verifier"])
+    assert response.status_code == 200, response.text
+    return candidate["employment_history"][0]
+
+def entity_counts(company: str):
+    from app.database import SessionLocal
+    
+    Entity = models.VerifiedEntity
+    with SessionLocal() as db:
+        entity = db.scalars(
+            select(Entity).where(Entity.kind == "company", Entity.normalized_name == normalize_entity_name("company", company))
+        ).one()
+        return entity.verified_count, entity.sources
+
+def suggested(client, headers, company: str):
+    response = client.get("/api/verification/suggestions", params={"kind": "company", "name": company}, headers=headers["verifier"])
+    assert response.status_code == 200, response.text
+    return [(entity["name"], entity["verified_count"]) for entity in response.json() if entity["name"] == company]
+
+def test_claims_leaving_verified_are_taken_back(client, headers, claimed_employment):
+    def save(status, sources):
+        response = client.put(
+            f"/api/verification/employment/{claimed_employment['id']}", headers=headers["verifier"],
+            json={"claim_status": status, "verification_note": "", "verification_sources": sources}
+        )
+        assert response.status_code == 200, response.text
+        return entity_counts(claimed_employment["company_name"])
+    
+    assert save("VERIFIED", ["registry"]) == (1, {"registry": 1})
+    # Saved again with other sources: still one claim
+    assert save("VERIFIED", ["registry", "phone_call"]) == (1, {"registry": 1, "phone_call": 1})
+    assert save("INCONSISTENT", ["registry"]) == (0, {})
+    assert save("UNCERTAIN", []) == (0, {})
+    assert suggested(client, headers, claimed_employment["company_name"]) == []
+    assert save("VERIFIED", ["phone_call"]) == (1, {"phone_call": 1})
+    assert suggested(client, headers, claimed_employment["company_name"]) == [(claimed_employment["company_name"], 1)]
+
+
+def test_entities_without_verified_claims_do_not_crowd_out_others():
+    from app.database import SessionLocal
+    
+    tag = uuid.uuid4().hex[:8]
+    # Closer to the query than the verified entity, and more of them than the search keeps before ranking
+    names = [(f"{tag} Crowd {i}", 0) for i in range(25)] + [(f"{tag} Crowd Holdings Worldwide", 1)]
+    with SessionLocal() as db:
+        db.add_all(
+            models.VerifiedEntity(
+                kind="company", normalized_name=normalize_entity_name("company", name), display_name=name,
+                verified_count=verified_count, sources={}
+            )
+            for name, verified_count in names
+        )
+        db.commit()
+        index = EntityIndex()
+        index.refresh(db)
+    
+    found = index.search("company", f"{tag} Crowd", limit=5, min_similarity=0.1)
+    assert [entity.display_name for entity, _ in found] == [f"{tag} Crowd Holdings Worldwide"]
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""Phone numbers normalize to one E.164 key however they were written"""
+
+import pytest
+
+from app.utils.identity_keys import normalize_phone
+
+@pytest.mark.parametrize("value, key", [
+    ("+49 (0)30 1234567", "+49301234567"),
+    ("0049 30 1234567", "+49301234567"),
+    ("030 1234567", "+49301234567"),
+    ("49301234567", "+49301234567"),
+    (49301234567.0, "+49301234567"),
+    # A foreign country code without its "+" keeps its own country
+    ("447700900123", "+447700900123"),
+    ("+44 7700 900123", "+447700900123"),
+    ("12025550123", "+12025550123"),
+])
+def test_normalize_phone(value, key):
+    assert normalize_phone(value) == key
+
+@pytest.mark.parametrize("value", [None, "", "12345", "+1234567890123456"])
+def test_no_key_for_invalid_numbers(value):
+    assert normalize_phone(value) is None
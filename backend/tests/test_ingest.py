@@ -0,0 +1,71 @@
+"""What an upload writes after its batch was committed cannot fail the upload; a failed upload leaves no blobs behind"""
+
+import hashlib
+import os
+import uuid
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import models
+from app.database import SessionLocal
+from app.storage import get_blob_store
+
+def candidates_csv(prefix: str) -> bytes:
+    return f"Full Name,Email,Company 1,Position 1\n{prefix} Candidate,{prefix.lower()}@example.com,Company,Engineer\n".encode()
+
+@pytest.fixture
+def failing_statement():
+    """Make every statement that starts with the given SQL fail, on the sync and the async engine"""
+    prefixes = []
+    
+    def fail(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith(tuple(prefixes)):
+            raise RuntimeError("database went away")
+    
+    event.listen(Engine, "before_cursor_execute", fail)
+    yield prefixes.append
+    event.remove(Engine, "before_cursor_execute", fail)
+
+def test_failed_timings_keep_the_upload(client, headers, failing_statement):
+    failing_statement("UPDATE candidate_batches SET source_size_bytes")
+    prefix = f"Timings{uuid.uuid4().hex[:8]}"
+    response = client.post(
+        "/api/candidates/upload/csv", headers=headers["recruiter"],
+        files={"file": ("batch.csv", candidates_csv(prefix), "text/csv")}, data={"batch_name": prefix}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["total_candidates"] == 1
+    with SessionLocal() as db:
+        batch = db.get(models.CandidateBatch, response.json()["batch_id"])
+        assert (batch.batch_name, batch.ingest_total_ms) == (prefix, None)
+
+def test_failed_column_profile_keeps_the_upload(client, headers, upload_csv, failing_statement):
+    failing_statement("INSERT INTO column_mapping_profiles")
+    prefix = f"Profile{uuid.uuid4().hex[:8]}"
+    # A header row of its own, so the upload saves a new profile
+    content = candidates_csv(prefix).replace(b"Position 1", f"Position 1,{prefix} Notes".encode()).replace(b"Engineer", b"Engineer,-")
+    batch = upload_csv(content, prefix)
+    assert batch["total_candidates"] == 1
+    with SessionLocal() as db:
+        assert db.get(models.CandidateBatch, batch["batch_id"]).batch_name == prefix
+
+def stored_blobs():
+    return {name for _, _, names in os.walk(get_blob_store().root) for name in names}
+
+def test_failed_upload_deletes_its_blobs(client, headers, upload_csv, failing_statement):
+    shared = candidates_csv(f"Shared{uuid.uuid4().hex[:8]}")
+    upload_csv(shared, "shared")
+    failing_statement("INSERT INTO employment")
+    before = stored_blobs()
+    
+    for content in (shared, candidates_csv(f"Failed{uuid.uuid4().hex[:8]}")):
+        response = client.post(
+            "/api/candidates/upload/csv", headers=headers["recruiter"],
+            files={"file": ("batch.csv", content, "text/csv")}, data={"batch_name": "failed"}
+        )
+        assert response.status_code == 400, response.text
+    # Blobs the failed uploads found already stored belong to the first upload and are kept
+    assert stored_blobs() == before
+    assert hashlib.sha256(shared).hexdigest() in before
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""Cached principals are dropped when a change to the user is committed, not before"""
+
+import uuid
+
+import pytest
+
+from app import models
+from app.principal_cache import principal_cache
+
+@pytest.fixture
+def cached_user(database):
+    from app.database import SessionLocal
+    
+    db = SessionLocal()
+    email = f"cached.{uuid.uuid4().hex[:8]}@test.example.com"
+    user = models.User(email=email, hashed_password="!", full_name="Cached", role=models.UserRole.VERIFIER, is_active=True)
+    db.add(user)
+    db.commit()
+    principal_cache.put(f"token-{email}", email, None, user)
+    yield db, user
+    db.close()
+
+def test_invalidated_at_commit(cached_user):
+    db, user = cached_user
+    token = f"token-{user.email}"
+    
+    user.role = models.UserRole.ADMIN
+    db.flush()
+    # A request resolving the token before the commit still gets the committed values
+    assert principal_cache.get(token) is not None
+    db.commit()
+    assert principal_cache.get(token) is None
+
+def test_kept_on_rollback(cached_user):
+    db, user = cached_user
+    token = f"token-{user.email}"
+    
+    user.is_active = False
+    db.flush()
+    db.rollback()
+    assert principal_cache.get(token) is not None
+    # Nothing left over from the rolled back transaction invalidates it later
+    db.commit()
+    assert principal_cache.get(token) is not None
+
+def test_old_email_invalidated(cached_user):
+    db, user = cached_user
+    token = f"token-{user.email}"
+    
+    user.email = f"renamed.{user.email}"
+    db.commit()
+    assert principal_cache.get(token) is None
@@ -0,0 +1,64 @@
+"""Query budgets of the endpoints that have had N+1 problems; every budget holds for a small and a 10x larger batch"""
+
+import uuid
+
+import pytest
+
+def candidates_csv(prefix: str, candidates: int) -> bytes:
+    rows = ["Full Name,Email,Company 1,Position 1,Start Date 1,End Date 1,Company 2,Position 2,Start Date 2,End Date 2,Education 1,Degree 1,Edu End 1"]
+    for i in range(candidates):
+        rows.append(
+            f"{prefix} Candidate {i},{prefix.lower()}.{i}@example.com,Company {i} GmbH,Engineer,Jan 2015,Dec 2018,"
+            f"Other {i} AG,Lead,Jan 2019,Present,University {i % 7},BSc,2014"
+        )
+    return ("\n".join(rows) + "\n").encode()
+
+@pytest.fixture
+def verified_candidate(client, headers, upload_csv):
+    """A candidate of a new batch whose claims are all verified and whose verification is completed"""
+    prefix = f"Report{uuid.uuid4().hex[:8]}"
+    batch = upload_csv(candidates_csv(prefix, 1), prefix)
+    detail = client.get(f"/api/candidates/batch/{batch['batch_id']}", headers=headers["recruiter"]).json()
+    candidate = detail["candidates"][0]
+    
+    response = client.post(f"/api/verification/claim/{candidate['id']}", headers=headers["verifier"])
+    assert response.status_code == 200, response.text
+    for kind, key in (("employment", "employment_history"), ("education", "education_history")):
+        for claim in candidate[key]:
+            response = client.put(
+                f"/api/verification/{kind}/{claim['id']}", headers=headers["verifier"],
+                json={"claim_status": "VERIFIED", "verification_note": "ok", "verification_sources": ["registry"]}
+            )
+            assert response.status_code == 200, response.text
+    response = client.post(f"/api/verification/complete/{candidate['id']}", headers=headers["verifier"])
+    assert response.status_code == 200, response.text
+    return candidate
+
+@pytest.mark.parametrize("candidates", [3, 30])
+def test_batch_detail(client, headers, upload_csv, query_budget, candidates):
+    prefix = f"Detail{uuid.uuid4().hex[:8]}"
+    batch = upload_csv(candidates_csv(prefix, candidates), prefix)
+    
+    with query_budget(max_queries=6, max_repeats=1):
+        response = client.get(f"/api/candidates/batch/{batch['batch_id']}", headers=headers["recruiter"])
+    
+    assert response.status_code == 200
+    assert len(response.json()["candidates"]) == candidates
+
+@pytest.mark.parametrize("candidates", [3, 30])
+def test_pending_queue(client, headers, upload_csv, query_budget, candidates):
+    prefix = f"Pending{uuid.uuid4().hex[:8]}"
+    upload_csv(candidates_csv(prefix, candidates), prefix)
+    
+    with query_budget(max_queries=7, max_repeats=1):
+        response = client.get("/api/verification/pending", headers=headers["verifier"])
+    
+    assert response.status_code == 200
+    assert sum(candidate["full_name"].startswith(prefix) for candidate in response.json()) == candidates
+
+def test_generate_report(client, headers, verified_candidate, query_budget):
+    with query_budget(max_queries=8, max_repeats=1):
+        response = client.post(f"/api/reports/generate/{verified_candidate['id']}", headers=headers["recruiter"])
+    
+    assert response.status_code == 200, response.text
+    assert verified_candidate["full_name"] in response.json()["html_content"]
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+VERIFICATION_SOURCES is validated at startup, never after an upload was stored; source results revalidate ETags;
+a source's breaker recovers whatever its requests raise
+"""
+
+import asyncio
+import uuid
+
+import httpx
+import pytest
+
+from app.connectors import sources
+from app.connectors.base import CONFIRMED, EMPLOYMENT, ERROR, Claim, HttpSourceConnector, SourceRequest, make_result
+
+@pytest.mark.parametrize("spec", ["company_registry", "nope=http://localhost:1", "app.connectors.base:Missing=http://localhost:1"])
+def test_invalid_sources_stop_startup(monkeypatch, spec):
+    from fastapi.testclient import TestClient
+    
+    from app.main import app
+    
+    monkeypatch.setattr(sources, "VERIFICATION_SOURCES", spec)
+    with pytest.raises(ValueError):
+        with TestClient(app):
+            pass
+    # Decides whether checks are scheduled after an upload was committed, so it must not raise
+    assert sources.sources_enabled()
+
+def test_valid_sources():
+    spec = "company_registry=http://localhost:8101, degree_registry=http://localhost:8103,"
+    connectors = sources.create_connectors(spec)
+    assert [connector.name for connector in connectors] == ["company_registry", "degree_registry"]
+
+class RecordingConnector(HttpSourceConnector):
+    """Confirms every employment claim without a network round trip"""
+    
+    name = "recording"
+    claim_kind = EMPLOYMENT
+    
+    async def open(self) -> None:
+        pass
+    
+    async def check(self, claim):
+        return make_result(CONFIRMED, reference=f"ref-{claim.claim_id}")
+
+def test_source_results_revalidate_etags(client, headers, upload_csv):
+    from app.connectors.runner import run_source_checks
+    
+    prefix = f"Sources{uuid.uuid4().hex[:8]}"
+    batch = upload_csv(f"Full Name,Email,Company 1,Position 1\n{prefix} Candidate,{prefix.lower()}@example.com,Company,Engineer\n".encode(), prefix)
+    batch_url = f"/api/candidates/batch/{batch['batch_id']}"
+    first = client.get(batch_url, headers=headers["recruiter"])
+    candidate_url = f"/api/candidates/{first.json()['candidates'][0]['id']}"
+    etags = {url: client.get(url, headers=headers["recruiter"]).headers["ETag"] for url in (batch_url, candidate_url)}
+    
+    run_source_checks(batch["batch_id"], connectors=[RecordingConnector("http://localhost:1")])
+    for url, etag in etags.items():
+        response = client.get(url, headers={**headers["recruiter"], "If-None-Match": etag})
+        assert response.status_code == 200, url
+        assert response.headers["ETag"] != etag
+    claim = response.json()["employment_history"][0]
+    assert claim["source_results"]["recording"]["status"] == CONFIRMED
+
+class RaisingConnector(HttpSourceConnector):
+    """Requests raise `error` while it is set and succeed once it is None"""
+    
+    name = "raising"
+    claim_kind = EMPLOYMENT
+    error = None
+    
+    async def open(self) -> None:
+        await super().open()
+        
+        async def request(*args, **kwargs):
+            if self.error is not None:
+                raise self.error
+            return httpx.Response(200, json={})
+        
+        self._client.request = request
+    
+    def build_request(self, claim):
+        return SourceRequest("GET", "/", cache_key=uuid.uuid4().hex)
+    
+    def interpret(self, claim, status_code, payload):
+        return CONFIRMED, None, None
+
+@pytest.mark.parametrize("error", [RuntimeError("not an httpx error"), asyncio.CancelledError()])
+def test_breaker_probe_released_on_any_error(error):
+    connector = RaisingConnector("http://localhost:1")
+    connector.breaker.failure_threshold, connector.breaker.reset_seconds = 1, 0
+    connector.breaker.reset()
+    claim = Claim(EMPLOYMENT, 1, "Candidate", "Company")
+    
+    async def probe_then_recover():
+        await connector.open()
+        try:
+            connector.error = RuntimeError("opens the breaker")
+            assert (await connector.check(claim))["status"] == ERROR
+            assert connector.breaker.state == "half_open"
+            
+            # The probe raises
+            connector.error = error
+            try:
+                await connector.check(claim)
+            except asyncio.CancelledError:
+                pass
+            
+            connector.error = None
+            return await connector.check(claim)
+        finally:
+            await connector.aclose()
+    
+    try:
+        assert asyncio.run(probe_then_recover())["status"] == CONFIRMED
+        assert connector.breaker.state == "closed"
+    finally:
+        connector.breaker.reset()
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""Resumable uploads: chunks sent again, out of order, overlapping or concurrently never damage the received bytes,
+and an upload is ingested once however its finalize fails or is retried"""
+
+import asyncio
+import hashlib
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from sqlalchemy import func, select, update
+
+from app import models, uploads
+from app.database import SessionLocal
+
+def candidates_csv(prefix: str) -> bytes:
+    rows = ["Full Name,Email,Company 1,Position 1"]
+    rows += [f"{prefix} Candidate {i},{prefix.lower()}.{i}@example.com,Company {i},Engineer" for i in range(4)]
+    return ("\n".join(rows) + "\n").encode()
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+@pytest.fixture
+def content():
+    return candidates_csv(f"Upload{uuid.uuid4().hex[:8]}")
+
+@pytest.fixture
+def open_upload(client, headers):
+    """Open an upload of `content` as the recruiter and return its state"""
+    def open_upload(content: bytes, **fields):
+        response = client.post(
+            "/api/candidates/uploads", headers=headers["recruiter"],
+            json={"batch_name": "upload", "total_size": len(content), **fields}
+        )
+        assert response.status_code == 201, response.text
+        return response.json()
+    
+    return open_upload
+
+@pytest.fixture
+def put_chunk(client, headers):
+    def put_chunk(upload_id: str, offset: int, data: bytes):
+        return client.put(
+            f"/api/candidates/uploads/{upload_id}/chunks", params={"offset": offset},
+            headers={**headers["recruiter"], "X-Chunk-SHA256": sha256(data)}, content=data
+        )
+    
+    return put_chunk
+
+def spool(upload_id: str) -> bytes:
+    with open(uploads.spool_path(upload_id), "rb") as spool:
+        return spool.read()
+
+def test_chunk_sent_again(open_upload, put_chunk, content):
+    upload = open_upload(content)
+    assert put_chunk(upload["id"], 0, content[:20]).status_code == 200
+    assert put_chunk(upload["id"], 20, content[20:40]).status_code == 200
+    
+    # Sent again after its response was lost, and a chunk within the received bytes
+    for offset, end in ((20, 40), (0, 20), (5, 15)):
+        response = put_chunk(upload["id"], offset, content[offset:end])
+        assert response.status_code == 200, response.text
+        assert response.json()["received_bytes"] == 40
+    assert spool(upload["id"]) == content[:40]
+    
+    response = put_chunk(upload["id"], 0, b"X" * 20)
+    assert response.status_code == 409
+    assert spool(upload["id"]) == content[:40]
+
+def test_chunk_overlapping_received_bytes(open_upload, put_chunk, content):
+    upload = open_upload(content)
+    put_chunk(upload["id"], 0, content[:20])
+    
+    response = put_chunk(upload["id"], 10, content[10:30])
+    assert response.status_code == 409
+    assert response.headers["Upload-Offset"] == "20"
+    assert spool(upload["id"]) == content[:20]
+
+def test_chunk_out_of_order(open_upload, put_chunk, content):
+    upload = open_upload(content)
+    put_chunk(upload["id"], 0, content[:10])
+    
+    response = put_chunk(upload["id"], 20, content[20:30])
+    assert response.status_code == 409
+    assert response.headers["Upload-Offset"] == "10"
+    assert spool(upload["id"]) == content[:10]
+
+def test_dropped_request_leaves_spool_alone(open_upload, put_chunk, content):
+    upload = open_upload(content)
+    put_chunk(upload["id"], 0, content[:15])
+    
+    async def dropped():
+        yield b"\x00" * 10
+        raise ConnectionResetError()
+    
+    chunk = uploads.chunk_path(upload["id"])
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(uploads.receive_chunk(dropped(), chunk))
+    os.remove(chunk)
+    assert spool(upload["id"]) == content[:15]
+    assert put_chunk(upload["id"], 15, content[15:30]).json()["received_bytes"] == 30
+    assert spool(upload["id"]) == content[:30]
+
+@pytest.mark.parametrize("same_bytes", [True, False])
+def test_concurrent_chunks_at_one_offset(open_upload, headers, content, same_bytes):
+    from app.main import app
+    
+    upload = open_upload(content)
+    bodies = [content[:30], content[:30] if same_bytes else b"Y" * 30]
+    
+    async def put_concurrently():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.put(
+                    f"/api/candidates/uploads/{upload['id']}/chunks", params={"offset": 0},
+                    headers={**headers["recruiter"], "X-Chunk-SHA256": sha256(body)}, content=body
+                )
+                for body in bodies
+            ))
+    
+    responses = asyncio.run(put_concurrently())
+    accepted = [body for body, response in zip(bodies, responses) if response.status_code == 200]
+    assert len(accepted) == (2 if same_bytes else 1)
+    assert all(response.status_code in (200, 409) for response in responses)
+    assert spool(upload["id"]) == accepted[0]
+
+def test_finalize_retry(client, headers, open_upload, put_chunk, content):
+    upload = open_upload(content)
+    put_chunk(upload["id"], 0, content)
+    finalize = f"/api/candidates/uploads/{upload['id']}/finalize"
+    
+    first = client.post(finalize, headers=headers["recruiter"])
+    assert first.status_code == 200, first.text
+    assert first.json()["total_candidates"] == 4
+    again = client.post(finalize, headers=headers["recruiter"])
+    assert again.status_code == 200
+    assert again.json()["batch_id"] == first.json()["batch_id"]
+    assert not os.path.exists(uploads.spool_path(upload["id"]))
+
+def test_failed_finalize_reopens(client, headers, open_upload, put_chunk, content):
+    upload = open_upload(content, sha256=sha256(b"something else"))
+    put_chunk(upload["id"], 0, content)
+    finalize = f"/api/candidates/uploads/{upload['id']}/finalize"
+    
+    for _ in range(2):
+        assert client.post(finalize, headers=headers["recruiter"]).status_code == 400
+        state = client.get(f"/api/candidates/uploads/{upload['id']}", headers=headers["recruiter"]).json()
+        assert (state["status"], state["received_bytes"], state["batch_id"]) == (uploads.OPEN, len(content), None)
+    assert spool(upload["id"]) == content
+
+def set_upload(upload_id: str, **values):
+    with SessionLocal() as db:
+        db.execute(update(models.UploadSession).where(models.UploadSession.id == upload_id).values(**values))
+        db.commit()
+
+def batches_named(batch_name: str) -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).where(models.CandidateBatch.batch_name == batch_name))
+
+def test_failure_after_commit_keeps_the_batch(client, headers, open_upload, put_chunk, content, monkeypatch):
+    from app.routers import candidates
+    
+    async def fail(db, columns):
+        raise RuntimeError("failed after the commit")
+    
+    monkeypatch.setattr(candidates, "save_column_profile", fail)
+    batch_name = f"committed{uuid.uuid4().hex[:8]}"
+    upload = open_upload(content, batch_name=batch_name)
+    put_chunk(upload["id"], 0, content)
+    finalize = f"/api/candidates/uploads/{upload['id']}/finalize"
+    
+    assert client.post(finalize, headers=headers["recruiter"]).status_code == 400
+    state = client.get(f"/api/candidates/uploads/{upload['id']}", headers=headers["recruiter"]).json()
+    assert state["status"] == uploads.COMPLETED
+    again = client.post(finalize, headers=headers["recruiter"])
+    assert again.status_code == 200
+    assert again.json()["batch_id"] == state["batch_id"]
+    assert batches_named(batch_name) == 1
+
+@pytest.mark.parametrize("stale", [True, False])
+def test_finalize_left_by_a_dead_worker(client, headers, open_upload, put_chunk, content, stale):
+    batch_name = f"dead{uuid.uuid4().hex[:8]}"
+    upload = open_upload(content, batch_name=batch_name)
+    put_chunk(upload["id"], 0, content)
+    started = uploads.finalize_stale_before() - timedelta(seconds=1) if stale else datetime.utcnow()
+    set_upload(upload["id"], status=uploads.FINALIZING, finalize_started_at=started)
+    
+    response = client.post(f"/api/candidates/uploads/{upload['id']}/finalize", headers=headers["recruiter"])
+    assert response.status_code == (200 if stale else 409), response.text
+    assert batches_named(batch_name) == (1 if stale else 0)
+
+def test_finalize_taken_over(client, headers, open_upload, put_chunk, content, monkeypatch):
+    batch_name = f"taken{uuid.uuid4().hex[:8]}"
+    upload = open_upload(content, batch_name=batch_name)
+    put_chunk(upload["id"], 0, content)
+    read_spool = uploads.read_spool
+    
+    def read_spool_then_lose_the_upload(*args):
+        # Another finalize takes the upload over while this one ingests it
+        set_upload(upload["id"], finalize_started_at=datetime.utcnow() + timedelta(seconds=1))
+        return read_spool(*args)
+    
+    monkeypatch.setattr(uploads, "read_spool", read_spool_then_lose_the_upload)
+    response = client.post(f"/api/candidates/uploads/{upload['id']}/finalize", headers=headers["recruiter"])
+    assert response.status_code == 409, response.text
+    assert batches_named(batch_name) == 0
+    state = client.get(f"/api/candidates/uploads/{upload['id']}", headers=headers["recruiter"]).json()
+    assert state["status"] == uploads.FINALIZING
\ No newline at end of file